@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+
+# Benchmarks of DuFuzzyLogic
+# Usage: python benchmark.py [-o results.json] [-c previous.json] [-k filter] [-r repeat]
+
+import argparse
+import json
+import platform
+import random
+import timeit
+from dufuzzylogic import *
+
+
+def measure(function, repeat):
+    """
+    Measures the time of a call to a function, in seconds; the best of several runs.
+    """
+    timer = timeit.Timer(function)
+    number = timer.autorange()[0]
+    return min(timer.repeat(repeat, number)) / number
+
+
+def benchContains(bench):
+    logic = FuzzyLogic()
+    shapes = [FuzzyShape.CONSTANT, FuzzyShape.SQUARE, FuzzyShape.LINEAR,
+              FuzzyShape.SIGMOID, FuzzyShape.GAUSSIAN, FuzzyShape.REVERSED_GAUSSIAN]
+    values = [i * 0.25 for i in range(0, 100)]
+    for shape in shapes:
+        # the constant shape is only used below, so that the set still has a transition
+        fuzzySet = logic.newSet(shape, 15, 20, shape, FuzzyShape.LINEAR if shape == FuzzyShape.CONSTANT else shape)
+        bench("contains/" + shape, lambda: [fuzzySet.contains(v) for v in values], len(values))
+        bench("containsMany/" + shape, lambda: fuzzySet.containsMany(values), len(values))
+
+
+def benchVeracity(bench):
+    operators = ["NEGATE", "AND", "OR", "XOR", "NXR", "IMPLIES", "DOES_NOT_IMPLY", "NAND", "NOR", "WEIGHTED"]
+    algorithms = {"LINEAR": FuzzyLogicAlgorithm.LINEAR, "HYPERBOLIC": FuzzyLogicAlgorithm.HYPERBOLIC}
+    for algorithmName in algorithms:
+        x = FuzzyVeracity(0.3, algorithms[algorithmName])
+        y = FuzzyVeracity(0.6, algorithms[algorithmName])
+        for operator in operators:
+            method = getattr(x, operator)
+            if operator == "NEGATE":
+                bench("veracity/" + algorithmName + "/" + operator, method)
+            elif operator == "WEIGHTED":
+                bench("veracity/" + algorithmName + "/" + operator, lambda: method(y, 0.5))
+            else:
+                bench("veracity/" + algorithmName + "/" + operator, lambda: method(y))
+
+
+def benchQuantify(bench):
+    for name in FuzzyQuantifier.FuzzyQuantifierList:
+        quantifier = FuzzyQuantifier.FuzzyQuantifierList[name]
+        bench("quantify/" + (quantifier or "None"), lambda: quantify(quantifier, 0.42))
+        bench("quantify/inverse/" + (quantifier or "None"), lambda: quantify(quantifier, 0.42, FuzzyLogicAlgorithm.LINEAR, True))
+
+
+def benchCrispify(bench):
+    algorithms = {
+        "CENTROID": FuzzyCrispAlgorithm.CENTROID, "CENTROID_LOWER": FuzzyCrispAlgorithm.CENTROID_LOWER,
+        "CENTROID_HIGHER": FuzzyCrispAlgorithm.CENTROID_HIGHER, "MEAN": FuzzyCrispAlgorithm.MEAN,
+        "MEAN_LOWER": FuzzyCrispAlgorithm.MEAN_LOWER, "MEAN_HIGHER": FuzzyCrispAlgorithm.MEAN_HIGHER,
+        "AREA_CENTROID": FuzzyCrispAlgorithm.AREA_CENTROID, "AREA_BISECTOR": FuzzyCrispAlgorithm.AREA_BISECTOR,
+        "MEAN_OF_MAXIMUM": FuzzyCrispAlgorithm.MEAN_OF_MAXIMUM
+    }
+    logic = FuzzyLogic()
+    shapes = [FuzzyShape.LINEAR, FuzzyShape.SIGMOID, FuzzyShape.GAUSSIAN, FuzzyShape.REVERSED_GAUSSIAN]
+    sets = [logic.newSet("Set " + str(i), i * 10, i * 10 + 10, shapes[i % len(shapes)]) for i in range(0, 10)]
+    quantifiers = [FuzzyQuantifier.NONE, FuzzyQuantifier.PLUS, FuzzyQuantifier.MINUS, FuzzyQuantifier.DOUBLE_PLUS]
+    generator = random.Random(0)
+
+    for numRules in [1, 10, 100, 1000]:
+        value = logic.newValue(0, "")
+        for i in range(0, numRules):
+            veracity = logic.newVeracity(generator.uniform(0.05, 0.95))
+            value.SET(sets[i % len(sets)], quantifiers[i % len(quantifiers)], veracity)
+        for algorithmName in algorithms:
+            algorithm = algorithms[algorithmName]
+            bench("crispify/" + algorithmName + "/" + str(numRules), lambda: value.crispify(False, algorithm))
+
+
+def hvacSets(logic):
+    return {
+        "wet": logic.newSet("Wet", 60, 100, FuzzyShape.GAUSSIAN, FuzzyShape.CONSTANT),
+        "dry": logic.newSet("Dry", 50, 0, FuzzyShape.CONSTANT, FuzzyShape.GAUSSIAN),
+        "hot": logic.newSet("Hot", 21, 35, FuzzyShape.GAUSSIAN, FuzzyShape.CONSTANT),
+        "warm": logic.newSet("Comfortably warm", 17, 20, FuzzyShape.GAUSSIAN),
+        "cold": logic.newSet("Cold", 17, 10, FuzzyShape.CONSTANT, FuzzyShape.GAUSSIAN),
+        "heat": logic.newSet("Heat", 0, 100, FuzzyShape.LINEAR, FuzzyShape.CONSTANT),
+        "refresh": logic.newSet("Refresh", 0, -100, FuzzyShape.CONSTANT, FuzzyShape.LINEAR)
+    }
+
+
+def hvac(logic, sets, t, h):
+    # The HVAC example of test.py
+    temperature = logic.newValue(t, "°C")
+    humidity = logic.newValue(h, "%")
+    hvacPower = logic.newValue(0, "%")
+    logic.IF(temperature.IS(sets["hot"]))
+    logic.THEN(hvacPower, sets["refresh"], None)
+    logic.IF(temperature.IS(sets["cold"]))
+    logic.THEN(hvacPower, sets["heat"], None)
+    logic.IF(temperature.IS(sets["hot"]).AND(humidity.IS(sets["wet"])))
+    logic.THEN(hvacPower, sets["refresh"], "More")
+    logic.IF(temperature.IS(sets["cold"]).AND(humidity.IS(sets["wet"])))
+    logic.THEN(hvacPower, sets["heat"], "More")
+    logic.IF(temperature.IS(sets["cold"])
+             .AND(temperature.IS_NOT(sets["cold"], "Extremely"))
+             .AND(humidity.IS(sets["dry"])))
+    logic.THEN(hvacPower, sets["heat"], "Less")
+    logic.IF(temperature.IS(sets["hot"])
+             .AND(temperature.IS_NOT(sets["hot"], "Extremely"))
+             .AND(humidity.IS(sets["dry"])))
+    logic.THEN(hvacPower, sets["refresh"], "Less")
+    logic.IF(temperature.IS(sets["warm"], "Very")
+             .OR(temperature.IS(sets["cold"]))
+             .AND(humidity.IS(sets["wet"])))
+    logic.THEN(hvacPower, sets["heat"], "Somewhat")
+    logic.IF(temperature.IS(sets["warm"]))
+    logic.THEN(hvacPower, sets["refresh"], "Not")
+    logic.THEN(hvacPower, sets["heat"], "Not")
+    return hvacPower.crispify()
+
+
+def hvacRuleBase(logic, sets):
+    # The HVAC example of test.py, as a rule base
+    rules = logic.newRuleBase()
+    temperature = rules.newInput("temperature")
+    humidity = rules.newInput("humidity")
+    hvacPower = rules.newOutput("hvacPower")
+    rules.addRule(temperature.IS(sets["hot"]), hvacPower, sets["refresh"])
+    rules.addRule(temperature.IS(sets["cold"]), hvacPower, sets["heat"])
+    rules.addRule(temperature.IS(sets["hot"]).AND(humidity.IS(sets["wet"])), hvacPower, sets["refresh"], "More")
+    rules.addRule(temperature.IS(sets["cold"]).AND(humidity.IS(sets["wet"])), hvacPower, sets["heat"], "More")
+    rules.addRule(temperature.IS(sets["cold"])
+                  .AND(temperature.IS_NOT(sets["cold"], "Extremely"))
+                  .AND(humidity.IS(sets["dry"])), hvacPower, sets["heat"], "Less")
+    rules.addRule(temperature.IS(sets["hot"])
+                  .AND(temperature.IS_NOT(sets["hot"], "Extremely"))
+                  .AND(humidity.IS(sets["dry"])), hvacPower, sets["refresh"], "Less")
+    rules.addRule(temperature.IS(sets["warm"], "Very")
+                  .OR(temperature.IS(sets["cold"]))
+                  .AND(humidity.IS(sets["wet"])), hvacPower, sets["heat"], "Somewhat")
+    isWarm = temperature.IS(sets["warm"])
+    rules.addRule(isWarm, hvacPower, sets["refresh"], "Not")
+    rules.addRule(isWarm, hvacPower, sets["heat"], "Not")
+    return rules.compile()
+
+
+def hvacFunctionRuleBase(logic, sets):
+    # The same antecedents, with Takagi-Sugeno consequents: the power is a function of the temperature
+    rules = logic.newRuleBase()
+    temperature = rules.newInput("temperature")
+    humidity = rules.newInput("humidity")
+    hvacPower = rules.newOutput("hvacPower")
+    rules.addFunctionRule(temperature.IS(sets["hot"]), hvacPower, 150, {temperature: -7})
+    rules.addFunctionRule(temperature.IS(sets["cold"]), hvacPower, 120, {temperature: -6})
+    rules.addFunctionRule(temperature.IS(sets["hot"]).AND(humidity.IS(sets["wet"])), hvacPower, -100)
+    rules.addFunctionRule(temperature.IS(sets["cold"]).AND(humidity.IS(sets["wet"])), hvacPower, 100)
+    rules.addFunctionRule(temperature.IS(sets["cold"])
+                          .AND(temperature.IS_NOT(sets["cold"], "Extremely"))
+                          .AND(humidity.IS(sets["dry"])), hvacPower, 30)
+    rules.addFunctionRule(temperature.IS(sets["hot"])
+                          .AND(temperature.IS_NOT(sets["hot"], "Extremely"))
+                          .AND(humidity.IS(sets["dry"])), hvacPower, -30)
+    rules.addFunctionRule(temperature.IS(sets["warm"]), hvacPower, 0)
+    return rules.compile()
+
+
+def redness(logic, intense, color):
+    # The color example of test.py
+    result = logic.newValue(0, "")
+    redChannel = logic.newValue(color[0], "")
+    greenChannel = logic.newValue(color[1], "")
+    blueChannel = logic.newValue(color[2], "")
+    logic.IF(redChannel.IS(intense, None).AND(
+        greenChannel.IS(intense, None).NOR(blueChannel.IS(intense, None))))
+    logic.THEN(result, intense, None)
+    return result.quantify(intense)
+
+
+def classifierRuleBase(logic, numRules):
+    # A big rule base where only a few rules fire for each input: AND chains of narrow sets
+    generator = random.Random(0)
+    bands = [logic.newSet("Band " + str(i), i * 10, i * 10 + 8) for i in range(0, 200)]
+    rules = logic.newRuleBase()
+    features = [rules.newInput("feature" + str(i)) for i in range(0, 4)]
+    score = rules.newOutput("score")
+    for i in range(0, numRules):
+        antecedent = features[0].IS(generator.choice(bands))
+        for feature in features[1:]:
+            antecedent = antecedent.AND(feature.IS(generator.choice(bands)))
+        rules.addRule(antecedent, score, generator.choice(bands))
+    return rules.compile()
+
+
+def benchExamples(bench):
+    for algorithmName, algorithm in (("LINEAR", FuzzyLogicAlgorithm.LINEAR), ("HYPERBOLIC", FuzzyLogicAlgorithm.HYPERBOLIC)):
+        logic = FuzzyLogic(algorithm)
+        sets = hvacSets(logic)
+        inputs = [(t, h) for t in range(0, 40, 4) for h in range(0, 100, 10)]
+        bench("example/hvac/" + algorithmName, lambda: [hvac(logic, sets, t, h) for t, h in inputs], len(inputs))
+
+        rules = hvacRuleBase(logic, sets)
+        rows = [{"temperature": t, "humidity": h} for t, h in inputs]
+        columns = {"temperature": [t for t, h in inputs], "humidity": [h for t, h in inputs]}
+        bench("example/hvac/ruleBase/" + algorithmName, lambda: [rules.evaluate(row) for row in rows], len(inputs))
+        bench("example/hvac/ruleBase/batch/" + algorithmName, lambda: rules.evaluateBatch(columns), len(inputs))
+
+        functionRules = hvacFunctionRuleBase(logic, sets)
+        bench("example/hvac/functionRules/" + algorithmName, lambda: [functionRules.evaluate(row) for row in rows], len(inputs))
+        bench("example/hvac/functionRules/batch/" + algorithmName, lambda: functionRules.evaluateBatch(columns),
+              len(inputs))
+
+        generated = rules.generate()
+        bench("example/hvac/generated/" + algorithmName, lambda: [generated(row) for row in rows], len(inputs))
+
+        power = rules.bake({"temperature": (0, 40, 161), "humidity": (0, 100, 101)}, 0).function("hvacPower")
+        bench("example/hvac/surface/" + algorithmName, lambda: [power(t, h) for t, h in inputs], len(inputs))
+
+        intense = logic.newSet("Intense", 0, 255)
+        colors = [(r, g, 10) for r in range(0, 256, 32) for g in range(0, 256, 32)]
+        bench("example/redness/" + algorithmName, lambda: [redness(logic, intense, c) for c in colors], len(colors))
+
+        cachedLogic = FuzzyLogic(algorithm, cacheSize=1024)
+        cachedIntense = cachedLogic.newSet("Intense", 0, 255)
+        bench("example/redness/cached/" + algorithmName, lambda: [redness(cachedLogic, cachedIntense, c) for c in colors],
+              len(colors))
+
+        rules = classifierRuleBase(logic, 5000)
+        generator = random.Random(1)
+        rows = [{"feature" + str(i): generator.uniform(0, 2000) for i in range(0, 4)} for j in range(0, 10)]
+        bench("example/classifier/ruleBase/" + algorithmName, lambda: [rules.evaluate(row) for row in rows], len(rows))
+
+
+def compare(results, previous):
+    print("\n--- Comparison ---\n")
+    for name in results:
+        if name not in previous:
+            continue
+        ratio = results[name] / previous[name]
+        print(name.ljust(50) + str(round(ratio, 3)).rjust(8) + "x")
+
+
+def runBenchmarks():
+    parser = argparse.ArgumentParser(description="Benchmarks of DuFuzzyLogic")
+    parser.add_argument("-o", "--output", default="benchmark.json", help="The JSON file where to write the results")
+    parser.add_argument("-c", "--compare", help="A JSON file of previous results to compare with")
+    parser.add_argument("-k", "--filter", default="", help="Only run the benchmarks containing this string")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="The number of runs of each benchmark")
+    args = parser.parse_args()
+
+    results = {}
+
+    def bench(name, function, count=1):
+        # count is the number of operations in a call to function; results are per operation
+        if args.filter not in name:
+            return
+        results[name] = measure(function, args.repeat) / count
+        print(name.ljust(50) + (str(round(results[name] * 1e6, 3)) + " µs").rjust(16))
+
+    print("--- DuFuzzyLogic benchmarks ---\n")
+    benchContains(bench)
+    benchVeracity(bench)
+    benchQuantify(bench)
+    benchCrispify(bench)
+    benchExamples(bench)
+
+    with open(args.output, "w") as f:
+        json.dump({
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "unit": "seconds per operation",
+            "results": results
+        }, f, indent=4, sort_keys=True)
+    print("\nResults written to " + args.output)
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            compare(results, json.load(f)["results"])
+
+
+if __name__ == "__main__":
+    runBenchmarks()
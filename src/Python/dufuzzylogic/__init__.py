@@ -1,9 +1,17 @@
+from .fz_controller import FuzzyController
 from .fz_crispalgorithm import FuzzyCrispAlgorithm
+from .fz_inference import FuzzyInference
 from .fz_logic import FuzzyLogic
 from .fz_logicalgorithm import FuzzyLogicAlgorithm
+from .fz_profiler import FuzzyProfiler
 from .fz_quantifier import FuzzyQuantifier, quantify
+from .fz_rulebase import FuzzyExpression, FuzzyInput, FuzzyOutput, FuzzyRule, FuzzyRuleBase
+from .fz_service import FuzzyService
 from .fz_set import FuzzySet
 from .fz_shape import FuzzyShape
+from .fz_surface import FuzzySurface
+from .fz_universe import FuzzyUniverse
 from .fz_value import FuzzyValue
+from .fz_variable import FuzzyVariable
 from .fz_veracity import FuzzyVeracity
 from .fz_math import *
@@ -0,0 +1,492 @@
+from .fz_shape import FuzzyShape
+from .fz_quantifier import FuzzyQuantifier, toQuantifier
+from .fz_logicalgorithm import FuzzyLogicAlgorithm
+from .fz_crispalgorithm import FuzzyCrispAlgorithm
+from .fz_math import mean, _FOUR_LN2
+import math
+import os
+
+# ========== PYTHON SOURCE GENERATOR ==========
+
+"""
+low-level undocumented module
+generates the Python source of a function evaluating a compiled {@link FuzzyRuleBase}, see {@link FuzzyRuleBase.toPython}.
+
+The constants of the sets are written as literals, the shapes and the operators are chosen when generating the source
+and inlined, and the crispification of each output is unrolled: the generated function gives the same results as
+{@link FuzzyRuleBase.evaluate}, without any attribute lookup nor dispatch.
+The crisp values of the consequents are computed by a small function generated for each set.
+"""
+
+# The quantifiers applied to a veracity, and their inverse, as templates of expressions of a variable
+_HEDGES = {
+    FuzzyQuantifier.IS_NOT: ("1", "0"),
+    FuzzyQuantifier.LESS: ("1", "0"),
+    FuzzyQuantifier.DOUBLE_MINUS: ("{0} ** " + repr(1 / 3), "{0} ** 3"),
+    FuzzyQuantifier.MINUS: ("{0} ** 0.5", "{0} ** 2"),
+    FuzzyQuantifier.PLUS: ("{0} ** 2", "{0} ** 0.5"),
+    FuzzyQuantifier.DOUBLE_PLUS: ("{0} ** 3", "{0} ** " + repr(1 / 3)),
+    FuzzyQuantifier.IS: ("0", "1"),
+    FuzzyQuantifier.MORE: ("0", "1"),
+}
+
+# The operators of each algorithm, as templates of expressions of two variables (see {@link FuzzyVeracity} for the formulas).
+# min(x, y) is written y if y < x else x, and max(x, y) y if y > x else x, which are the same.
+_MIN = "({1} if {1} < {0} else {0})"
+_MAX = "({1} if {1} > {0} else {0})"
+_OPERATORS = {
+    FuzzyLogicAlgorithm.LINEAR: {
+        "NEGATE": "1 - {0}",
+        "AND": _MIN,
+        "OR": _MAX,
+        "XOR": "{0} + {1} - 2 * " + _MIN,
+        "NXR": "1 - {0} - {1} + 2 * " + _MIN,
+        "IMPLIES": "1 - ((1 - {1}) if (1 - {1}) < {0} else {0})",
+        "DOES_NOT_IMPLY": "((1 - {1}) if (1 - {1}) < {0} else {0})",
+        "NAND": "1 - " + _MIN,
+        "NOR": "1 - " + _MAX
+    },
+    FuzzyLogicAlgorithm.HYPERBOLIC: {
+        "NEGATE": "1 - {0}",
+        "AND": "{0} * {1}",
+        "OR": "{0} + {1} - {0} * {1}",
+        "XOR": "{0} + {1} - 2 * {0} * {1}",
+        "NXR": "1 - {0} - {1} + 2 * {0} * {1}",
+        "IMPLIES": "1 - {0} + {0} * {1}",
+        "DOES_NOT_IMPLY": "{0} * (1 - {1})",
+        "NAND": "1 - {0} * {1}",
+        "NOR": "1 - {0} - {1} + {0} * {1}"
+    }
+}
+
+_HEADER = """# Generated by DuFuzzyLogic from a FuzzyRuleBase, do not edit: generate it again when the rules or the sets change.
+from math import exp, log, sqrt
+"""
+
+# The functions of the module fz_math used by the generated source, copied in the source so that it only needs math;
+# they must compute exactly the same numbers as the originals
+_KERNELS = """_FOUR_LN2 = """ + repr(_FOUR_LN2) + """
+
+
+def mean(values):
+    result = 0
+    for value in values:
+        result = result + value
+    return result / len(values)
+
+
+def _gaussian(value, minimum=0, maximum=1, center=0, fwhm=1):
+    if fwhm == 0 and value == center:
+        return maximum
+    elif fwhm == 0:
+        return 0
+    delta = value - center
+    e = -_FOUR_LN2
+    e *= delta * delta
+    e *= 1 / (fwhm * fwhm)
+    return exp(e) * (maximum - minimum) + minimum
+
+
+def _reversedGaussian(value, minimum, maximum, center, fwhm):
+    return _gaussian(value, minimum, maximum, center, - value - fwhm + 1)
+
+
+def _inverseLogistic(value, midValue=0, minimum=0, maximum=1, rate=1):
+    if value == minimum:
+        return 0
+    return midValue - log((maximum - minimum) / (value - minimum) - 1) / rate
+
+
+def _inverseGaussian(value, minimum=0, maximum=1, center=0, fwhm=1):
+    if value == 1:
+        return center, center
+    if value == 0:
+        return center + fwhm / 2, center - fwhm / 2
+    if fwhm == 0:
+        return center, center
+    result = (value - minimum) / (maximum - minimum)
+    result = log(result) * (fwhm * fwhm)
+    result = result / -_FOUR_LN2
+    result = sqrt(result)
+    return result + center, -result + center
+
+
+def _inverseReversedGaussian(value, minimum, maximum, center, fwhm):
+    return _inverseGaussian(value, minimum, maximum, center, - value - fwhm + 1)"""
+
+
+def _literal(value):
+    """
+    low-level undocumented method
+    writes a number as a Python literal, giving back the exact same number
+    """
+    if isinstance(value, int):
+        return repr(int(value))
+    value = float(value)
+    if math.isnan(value):
+        return "float('nan')"
+    if math.isinf(value):
+        return "float('inf')" if value > 0 else "(-float('inf'))"
+    return repr(value)
+
+
+def _hedge(quantifier, variable, inverse=False):
+    """
+    low-level undocumented method
+    the expression applying a quantifier to a variable, or the variable if the quantifier does not change it
+    """
+    quantifier = toQuantifier(quantifier)
+    templates = _HEDGES.get(quantifier) if isinstance(quantifier, str) else None
+    if templates is None:
+        return variable
+    return templates[1 if inverse else 0].format(variable)
+
+
+def _indent(lines, level=1):
+    return ["    " * level + line for line in lines]
+
+
+def _below(fuzzySet, x, target):
+    """
+    low-level undocumented method
+    the lines setting the target to the membership of x below the plateau, like {@link FuzzySet.membershipFunction}
+    """
+    minimum = fuzzySet.minimum
+    plateauMin = fuzzySet.plateauMin
+    shape = fuzzySet.shapeIn
+    if shape == FuzzyShape.CONSTANT:
+        return [target + " = 1"]
+    if shape == FuzzyShape.SQUARE:
+        return [target + " = 1 if " + x + " >= " + _literal(mean([plateauMin, minimum])) + " else 0"]
+    if shape == FuzzyShape.LINEAR:
+        return [target + " = 0 if " + x + " < " + _literal(minimum) + " else (" + x + " - " + _literal(minimum) +
+                ") / " + _literal(plateauMin - minimum)]
+    if shape == FuzzyShape.SIGMOID:
+        mid = (plateauMin + minimum) / 2
+        rate = 6 / (plateauMin - minimum)
+        return [target + " = 1 / (1 + exp(" + _literal(-rate) + " * (" + x + " - " + _literal(mid) + ")))"]
+    if shape == FuzzyShape.GAUSSIAN:
+        return _gaussian(x, target, plateauMin, plateauMin - minimum)
+    if shape == FuzzyShape.REVERSED_GAUSSIAN:
+        return [target + " = _reversedGaussian(" + x + ", 0, 1, " + _literal(plateauMin) + ", " +
+                _literal(plateauMin - minimum) + ")"]
+    return [target + " = 0"]
+
+
+def _above(fuzzySet, x, target):
+    """
+    low-level undocumented method
+    the lines setting the target to the membership of x above the plateau, like {@link FuzzySet.membershipFunction}
+    """
+    maximum = fuzzySet.maximum
+    plateauMax = fuzzySet.plateauMax
+    shape = fuzzySet.shapeOut
+    if shape == FuzzyShape.CONSTANT:
+        return [target + " = 1"]
+    if shape == FuzzyShape.SQUARE:
+        return [target + " = 1 if " + x + " <= " + _literal(mean([plateauMax, maximum])) + " else 0"]
+    if shape == FuzzyShape.LINEAR:
+        return [target + " = 0 if " + x + " > " + _literal(maximum) + " else 1 - ((" + x + " - " +
+                _literal(plateauMax) + ") / " + _literal(maximum - plateauMax) + ")"]
+    if shape == FuzzyShape.SIGMOID:
+        mid = (plateauMax + maximum) / 2
+        rate = 6 / (maximum - plateauMax)
+        return [target + " = 1 - 1 / (1 + exp(" + _literal(-rate) + " * (" + x + " - " + _literal(mid) + ")))"]
+    if shape == FuzzyShape.GAUSSIAN:
+        return _gaussian(x, target, plateauMax, maximum - plateauMax)
+    if shape == FuzzyShape.REVERSED_GAUSSIAN:
+        return [target + " = _reversedGaussian(" + x + ", 0, 1, " + _literal(plateauMax) + ", " +
+                _literal(maximum - plateauMax) + ")"]
+    return [target + " = 0"]
+
+
+def _gaussian(x, target, center, fwhm):
+    """
+    low-level undocumented method
+    the lines of the gaussian function of the module fz_math, between 0 and 1
+    """
+    if fwhm == 0:
+        return [target + " = 1 if " + x + " == " + _literal(center) + " else 0"]
+    return [target + " = " + x + " - " + _literal(center),
+            target + " = exp(" + _literal(-_FOUR_LN2) + " * (" + target + " * " + target + ") * " +
+            _literal(1 / (fwhm * fwhm)) + ")"]
+
+
+def _membership(fuzzySet, x, target, constants):
+    """
+    low-level undocumented method
+    the lines setting the target to the membership of x, using the table of the set if it is tabulated
+    """
+    lines = ["if " + _literal(fuzzySet.plateauMin) + " <= " + x + " <= " + _literal(fuzzySet.plateauMax) + ":",
+             "    " + target + " = 1",
+             "elif " + x + " < " + _literal(fuzzySet.plateauMin) + ":"]
+    lines += _indent(_below(fuzzySet, x, target))
+    lines.append("else:")
+    lines += _indent(_above(fuzzySet, x, target))
+
+    table = fuzzySet.table
+    if table is None or fuzzySet._interpolate is None:
+        return lines
+
+    # the same interpolation as FuzzySet.tabulate
+    name = "_TABLE" + str(len(constants))
+    constants.append(name + " = (" + ", ".join(_literal(v) for v in table) + ")")
+    last = len(table) - 1
+    return [
+        "u = (" + x + " - " + _literal(fuzzySet.minimum) + ") * " +
+        _literal(last / (fuzzySet.maximum - fuzzySet.minimum)),
+        "if 0 <= u < " + str(last) + ":",
+        "    i = int(u)",
+        "    " + target + " = " + name + "[i]",
+        "    " + target + " = " + target + " + (" + name + "[i + 1] - " + target + ") * (u - i)",
+        "elif " + x + " == " + _literal(fuzzySet.maximum) + ":",
+        "    " + target + " = " + _literal(table[last]),
+        "else:"
+    ] + _indent(lines)
+
+
+def _crispFunction(fuzzySet, crispAlgorithm, name):
+    """
+    low-level undocumented method
+    the source of the function returning the crisp value of a set for a veracity, like {@link FuzzySet.crispFunction},
+    or a literal if it is a constant
+    """
+    if crispAlgorithm in (FuzzyCrispAlgorithm.CENTROID, FuzzyCrispAlgorithm.MEAN):
+        pick = 0
+    elif crispAlgorithm in (FuzzyCrispAlgorithm.CENTROID_LOWER, FuzzyCrispAlgorithm.MEAN_LOWER):
+        pick = -1
+    else:
+        pick = 1
+
+    minimum = fuzzySet.minimum
+    maximum = fuzzySet.maximum
+    plateauMin = fuzzySet.plateauMin
+    plateauMax = fuzzySet.plateauMax
+    defaultValue = mean([plateauMin, plateauMax])
+
+    if fuzzySet.shapeIn == FuzzyShape.CONSTANT and fuzzySet.shapeOut == FuzzyShape.CONSTANT:
+        values = [minimum, plateauMin, defaultValue, plateauMax, maximum]
+        if pick == 0:
+            return None, _literal(mean(values))
+        return None, _literal(values[0] if pick < 0 else values[len(values) - 1])
+
+    shape = fuzzySet.shapeIn
+    if shape == FuzzyShape.CONSTANT:
+        low = _literal(minimum) + " if veracity == 1 else None"
+    elif shape == FuzzyShape.SQUARE:
+        low = _literal(plateauMin) + " if veracity >= 0.5 else " + _literal(minimum)
+    elif shape == FuzzyShape.LINEAR:
+        low = _literal(minimum) + " + " + _literal(plateauMin - minimum) + " * veracity"
+    elif shape == FuzzyShape.SIGMOID:
+        low = "_inverseLogistic(veracity, " + _literal((plateauMin + minimum) / 2) + ")"
+    elif shape == FuzzyShape.GAUSSIAN:
+        low = "_inverseGaussian(veracity, 0, 1, " + _literal(plateauMin) + ", " + _literal(plateauMin - minimum) + ")[0]"
+    elif shape == FuzzyShape.REVERSED_GAUSSIAN:
+        low = "_inverseReversedGaussian(veracity, 0, 1, " + _literal(plateauMin) + ", " + \
+              _literal(plateauMin - minimum) + ")[0]"
+    else:
+        low = "None"
+
+    shape = fuzzySet.shapeOut
+    if shape == FuzzyShape.CONSTANT:
+        high = _literal(maximum) + " if veracity == 1 else None"
+    elif shape == FuzzyShape.SQUARE:
+        high = _literal(plateauMax) + " if veracity >= 0.5 else " + _literal(maximum)
+    elif shape == FuzzyShape.LINEAR:
+        high = _literal(maximum) + " + 1 - (" + _literal(maximum - plateauMax) + " * veracity)"
+    elif shape == FuzzyShape.SIGMOID:
+        high = "_inverseLogistic(1 - veracity, " + _literal((plateauMax + maximum) / 2) + ", 0, 1)"
+    elif shape == FuzzyShape.GAUSSIAN:
+        high = "_inverseGaussian(1 - veracity, 0, 1, " + _literal(plateauMax) + ", " + \
+               _literal(maximum - plateauMax) + ")[1]"
+    elif shape == FuzzyShape.REVERSED_GAUSSIAN:
+        high = "_inverseReversedGaussian(1 - veracity, 0, 1, " + _literal(plateauMax) + ", " + \
+               _literal(maximum - plateauMax) + ")[1]"
+    else:
+        high = "None"
+
+    def clamp(variable):
+        return [variable + " = " + _literal(maximum) + " if " + variable + " > " + _literal(maximum) + " else " + variable,
+                variable + " = " + _literal(minimum) + " if " + variable + " < " + _literal(minimum) + " else " + variable]
+
+    if pick == 0:
+        picked = ["return mean(values)"]
+        result = ["return (low + high) / 2"]
+    elif pick < 0:
+        picked = ["return values[0]"]
+        result = ["return low if low <= high else high"]
+    else:
+        picked = ["return values[len(values) - 1]"]
+        result = ["return high if low <= high else low"]
+
+    lines = ["def " + name + "(veracity):",
+             "    low = " + low,
+             "    high = " + high,
+             "    if veracity >= 1:",
+             "        values = [" + ", ".join(_literal(v) for v in (plateauMin, defaultValue, plateauMax)) + "]",
+             "        if low is not None:",
+             "            values.append(low)",
+             "        if high is not None:",
+             "            values.append(high)",
+             "        for i in range(0, len(values)):",
+             "            value = values[i]"]
+    lines += _indent(clamp("value"), 3)
+    lines += ["            values[i] = value",
+              "        values.sort()"]
+    lines += _indent(picked, 2)
+    lines += ["    if low is None:",
+              "        if high is None:",
+              "            raise ValueError(" + repr("The set " + str(fuzzySet.name) + " has no crisp value for the veracity ") +
+              " + str(veracity))"]
+    lines += _indent(clamp("high"), 2)
+    lines += ["        return high"]
+    lines += _indent(clamp("low"))
+    lines += ["    if high is None:",
+              "        return low"]
+    lines += _indent(clamp("high"))
+    lines += _indent(result)
+    return "\n".join(lines), name + "({0})"
+
+
+def generateSource(ruleBase, name="evaluate"):
+    """
+    low-level undocumented method
+    generates the source of a module defining a function evaluating the rule base, see {@link FuzzyRuleBase.toPython}
+    """
+    if not name.isidentifier():
+        raise ValueError("Invalid function name: " + repr(name))
+    ruleBase.compile()
+    inputDefaults, numRegisters, atoms, operations, outputs, implemented, weighted, program = ruleBase._plan
+    for output in outputs:
+        if output[3] is not None:
+            raise ValueError("The area crispification algorithms can not be generated, they need a FuzzyUniverse")
+    expressions, outputSets = ruleBase._declarations
+    operators = _OPERATORS[ruleBase.algorithm]
+
+    constants = []
+    functions = []
+
+    lines = ["def " + name + "(inputs):",
+             "    get = inputs.get"]
+    for i in range(0, len(inputDefaults)):
+        inputName, default = inputDefaults[i]
+        lines.append("    x" + str(i) + " = get(" + repr(inputName) + ", " + _literal(default) + ")")
+
+    def generateProgram(start, end, level):
+        # the instructions in [start, end[, the skipped ranges being in an else branch
+        i = start
+        while i < end:
+            kind, register = program[i][0:2]
+            target = "r" + str(register)
+            i += 1
+            if kind == 0:
+                expression = expressions[register]
+                body = _membership(expression.fuzzySet, "x" + str(program[i - 1][2]), target, constants)
+                h = _hedge(expression.quantifier, target)
+                if h != target:
+                    body.append(target + " = " + h)
+                lines.extend(_indent(body, level))
+            elif kind == 1:
+                expression = expressions[register]
+                a, b = program[i - 1][3:5]
+                if expression.operator == "WEIGHTED":
+                    weight = _literal(expression.weight)
+                    template = "1 - " + weight + " * {0} + " + weight + " * {1}"
+                else:
+                    template = operators[expression.operator]
+                lines.extend(_indent([target + " = " + template.format("r" + str(a), "r" + str(b))], level))
+            else:
+                result, count = program[i - 1][3:5]
+                lines.extend(_indent(["if " + target + " == 0:",
+                                      "    r" + str(result) + " = 0",
+                                      "else:"], level))
+                generateProgram(i, i + count, level + 1)
+                i += count
+
+    generateProgram(0, len(program), 1)
+
+    crispFunctions = {}
+    results = []
+    for o in range(0, len(outputs)):
+        outputName, default, consequents, universe, numbers, functional = outputs[o]
+        variable = "o" + str(o)
+        results.append(repr(outputName) + ": " + variable)
+        if len(consequents) == 0:
+            lines.append("    " + variable + " = " + _literal(default))
+            continue
+        if functional:
+            lines += ["    crisp = 0",
+                      "    weights = 0"]
+            for register, constant, terms in consequents:
+                register = "r" + str(register)
+                value = _literal(constant)
+                for index, coefficient in terms:
+                    value += " + x" + str(index) + " * " + _literal(coefficient)
+                lines += ["    if " + register + " != 0:",
+                          "        crisp += (" + value + ") * " + register,
+                          "        weights += " + register]
+            lines.append("    " + variable + " = crisp / weights if weights != 0 else " + _literal(default))
+            continue
+        if not implemented:
+            lines.append("    " + variable + " = 0")
+            continue
+
+        lines.append("    crisp = 0")
+        if weighted:
+            lines.append("    weights = 0")
+        for c in range(0, len(consequents)):
+            register = "r" + str(consequents[c][0])
+            fuzzySet, quantifier = outputSets[o][c]
+            key = id(fuzzySet)
+            if key not in crispFunctions:
+                source, call = _crispFunction(fuzzySet, ruleBase.crispAlgorithm, "_crisp" + str(len(crispFunctions)))
+                crispFunctions[key] = call
+                if source is not None:
+                    functions.append(source)
+            crisp = crispFunctions[key].format(_hedge(quantifier, register, True))
+            if weighted:
+                # no weight, no need to crispify
+                lines += ["    if " + register + " != 0:",
+                          "        crisp += " + crisp + " * " + register,
+                          "        weights += " + register]
+            else:
+                lines.append("    crisp += " + crisp)
+        if weighted:
+            lines.append("    " + variable + " = crisp / weights if weights != 0 else crisp")
+        else:
+            lines.append("    " + variable + " = crisp / " + str(len(consequents)))
+
+    lines.append("    return {" + ", ".join(results) + "}")
+
+    return "\n\n\n".join([_HEADER + "\n".join(constants), _KERNELS] + functions + ["\n".join(lines)]) + "\n"
+
+
+def loadSource(source, name="evaluate", path="<rule base>"):
+    """
+    low-level undocumented method
+    executes a source generated by generateSource, and returns its function
+    """
+    namespace = {}
+    exec(compile(source, path, "exec"), namespace)
+    return namespace[name]
+
+
+def writeSource(path, source):
+    """
+    low-level undocumented method
+    writes a generated source to a file, replaced atomically so that other processes never read a partial file
+    """
+    temporaryPath = str(path) + "." + str(os.getpid()) + ".tmp"
+    with open(temporaryPath, "w", encoding="utf-8") as f:
+        f.write(source)
+    os.replace(temporaryPath, path)
+
+
+def readSource(path, name="evaluate"):
+    """
+    low-level undocumented method
+    loads the function of a file written by writeSource
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        source = f.read()
+    return loadSource(source, name, str(path))
@@ -0,0 +1,183 @@
+# ========== FUZZY CONTROLLER ==========
+
+
+class FuzzyController:
+
+    def __init__(self, ruleBase, inputs=None):
+        """
+        Do not use the constructor of this class, use {@link FuzzyRuleBase.newController} to create a new controller.
+        @class
+        @classdesc A controller evaluates a {@link FuzzyRuleBase} on a stream of updates of its inputs.
+        It keeps the veracities of all the tests and operators of the rules, and the crisp values of the outputs:
+        when an input is updated, only the tests of this input, the operators depending on them and the outputs
+        of the rules depending on them are computed again. The outputs are crispified only when they're read.
+        @example
+        controller = rules.newController({"temperature": 22, "humidity": 50})
+        controller.update("temperature", 23)
+        power = controller.get("power")
+        :param ruleBase: {FuzzyRuleBase} The rule base.
+        :param inputs: {dict} [inputs] The initial crisp values of the inputs, by name. Missing inputs use the value of their {@link FuzzyInput}.
+        @property {FuzzyRuleBase} ruleBase The rule base.
+        """
+        self.ruleBase = ruleBase
+        self._plan = None
+        self._values = {}
+        self._build({} if inputs is None else inputs)
+
+    def _build(self, inputs):
+        # evaluates everything and builds the dependencies of the plan
+        ruleBase = self.ruleBase
+        if ruleBase._plan is None:
+            ruleBase.compile()
+        plan = ruleBase._plan
+        inputDefaults, numRegisters, atoms, operations, outputs, implemented, weighted, program = plan
+
+        previous = self._values
+        self._plan = plan
+        self._indices = {}
+        self._values = {}
+        for i in range(0, len(inputDefaults)):
+            name, default = inputDefaults[i]
+            self._indices[name] = i
+            self._values[name] = inputs.get(name, previous.get(name, default))
+
+        # the inputs each register depends on
+        dependencies = [()] * numRegisters
+        self._inputAtoms = [[] for i in inputDefaults]
+        for atom in atoms:
+            self._inputAtoms[atom[1]].append(atom)
+            dependencies[atom[0]] = frozenset((atom[1],))
+        # the operations depending on each input, in the order of the plan
+        self._inputOperations = [[] for i in inputDefaults]
+        for i in range(0, len(operations)):
+            register, operator, a, b = operations[i]
+            dependencies[register] = dependencies[a] | dependencies[b]
+            for index in dependencies[register]:
+                self._inputOperations[index].append(i)
+        # the outputs depending on each input, the registers they read, and the inputs of their function rules
+        self._inputOutputs = [[] for i in inputDefaults]
+        self._outputRegisters = []
+        self._outputInputs = []
+        self._outputIndices = {}
+        for o in range(0, len(outputs)):
+            self._outputIndices[outputs[o][0]] = o
+            registers = frozenset(consequent[0] for consequent in outputs[o][2])
+            self._outputRegisters.append(registers)
+            functionInputs = frozenset()
+            if outputs[o][5]:
+                functionInputs = frozenset(index for consequent in outputs[o][2] for index, coefficient in consequent[2])
+            self._outputInputs.append(functionInputs)
+            for index in frozenset().union(functionInputs, *(dependencies[r] for r in registers)):
+                self._inputOutputs[index].append(o)
+
+        values = [self._values[name] for name, default in inputDefaults]
+        self._registers = [0] * numRegisters
+        for register, index, membership, h in atoms:
+            veracity = membership(values[index])
+            if h is not None:
+                veracity = h(veracity)
+            self._registers[register] = veracity
+        for register, operator, a, b in operations:
+            self._registers[register] = operator(self._registers[a], self._registers[b])
+
+        self._results = [None] * len(outputs)
+        self._dirty = [True] * len(outputs)
+
+    def update(self, name, value):
+        """
+        Changes the value of an input, and computes again the veracities depending on it.
+        :param name: {string} The name of the input.
+        :param value: {Number} The new crisp value.
+        :return: {FuzzyController} This controller.
+        """
+        return self.updateMany({name: value})
+
+    def updateMany(self, inputs):
+        """
+        Changes the values of several inputs at once; the operators depending on several of them are computed only once.
+        :param inputs: {dict} The new crisp values of the inputs, by name.
+        :return: {FuzzyController} This controller.
+        """
+        if self.ruleBase._plan is not self._plan:
+            # the rules have changed
+            self._build(inputs)
+            return self
+
+        registers = self._registers
+        changed = set()
+        updated = []
+        for name in inputs:
+            if name not in self._indices:
+                raise KeyError("Unknown input: " + str(name))
+            value = inputs[name]
+            if self._values[name] == value:
+                continue
+            self._values[name] = value
+            index = self._indices[name]
+            updated.append(index)
+            for register, i, membership, h in self._inputAtoms[index]:
+                veracity = membership(value)
+                if h is not None:
+                    veracity = h(veracity)
+                if veracity != registers[register]:
+                    registers[register] = veracity
+                    changed.add(register)
+
+        if len(changed) == 0:
+            for index in updated:
+                for o in self._inputOutputs[index]:
+                    if index in self._outputInputs[o]:
+                        self._dirty[o] = True
+            return self
+
+        if len(updated) == 1:
+            indices = self._inputOperations[updated[0]]
+        else:
+            indices = sorted(set().union(*(self._inputOperations[index] for index in updated)))
+        operations = self._plan[3]
+        for i in indices:
+            register, operator, a, b = operations[i]
+            if a in changed or b in changed:
+                veracity = operator(registers[a], registers[b])
+                if veracity != registers[register]:
+                    registers[register] = veracity
+                    changed.add(register)
+
+        for index in updated:
+            for o in self._inputOutputs[index]:
+                if not self._dirty[o] and (index in self._outputInputs[o] or
+                                           not changed.isdisjoint(self._outputRegisters[o])):
+                    self._dirty[o] = True
+
+        return self
+
+    def value(self, name):
+        """
+        Gets the current value of an input.
+        :param name: {string} The name of the input.
+        :return: {Number} The crisp value.
+        """
+        return self._values[name]
+
+    def get(self, name):
+        """
+        Gets the crisp value of an output, crispified again only if the inputs it depends on have changed.
+        :param name: {string} The name of the output.
+        :return: {Number} The crisp value.
+        """
+        if self.ruleBase._plan is not self._plan:
+            self._build({})
+        o = self._outputIndices[name]
+        if self._dirty[o]:
+            inputDefaults, numRegisters, atoms, operations, outputs, implemented, weighted, program = self._plan
+            values = [self._values[name] for name, default in inputDefaults]
+            self._results[o] = self.ruleBase._crispify(self._registers, outputs[o], implemented, weighted, values)[0]
+            self._dirty[o] = False
+        return self._results[o]
+
+    def results(self):
+        """
+        Gets the crisp values of all the outputs, like {@link FuzzyRuleBase.evaluate}.
+        :return: {dict} The crisp values of the outputs, by name.
+        """
+        return {name: self.get(name) for name in list(self._outputIndices)}
@@ -30,3 +30,11 @@ class FuzzyCrispAlgorithm():
     ## Returns the mean value from all the lowest possible values from all the sets.
     ## Unlike the centroid methods, the mean method does not take the veracity of each set into account.
     MEAN_LOWER = 8
+    ## Uses the true center of gravity: the sets are clipped (or scaled with the hyperbolic logic) by the veracity of
+    ## their rules on a discretized universe (see {@link FuzzyUniverse}), combined, and the centroid of the resulting
+    ## area is returned.
+    AREA_CENTROID = 9
+    ## Like AREA_CENTROID, but returns the value which splits the combined area in two equal parts.
+    AREA_BISECTOR = 10
+    ## Like AREA_CENTROID, but returns the mean of the values where the combined area is the highest.
+    MEAN_OF_MAXIMUM = 11
@@ -0,0 +1,86 @@
+from .fz_value import FuzzyValue
+from .fz_veracity import FuzzyVeracity
+from .fz_quantifier import FuzzyQuantifier
+from .fz_logicalgorithm import FuzzyLogicAlgorithm
+from .fz_crispalgorithm import FuzzyCrispAlgorithm
+
+# ========== FUZZY INFERENCE ==========
+
+
+class FuzzyInference:
+
+    def __init__(self, algorithm=FuzzyLogicAlgorithm.LINEAR, crispAlgorithm=FuzzyCrispAlgorithm.CENTROID):
+        """
+        Do not use the constructor of this class, use {@link FuzzyLogic.newInference} to create a new inference.
+        @class
+        @classdesc An inference holds the state of one evaluation of the rules: the veracity stored by {@link FuzzyInference.IF},
+        and the rule activations set by {@link FuzzyInference.THEN}.<br />
+        Unlike {@link FuzzyLogic.IF} and {@link FuzzyLogic.THEN}, it never changes the engine, the {@link FuzzySet}s nor the {@link FuzzyValue}s,
+        so that they can be shared between threads, each thread (or each evaluation) using its own inference.
+        The only exception is the <code>universe</code> of the values crispified with the area algorithms, which is created once
+        and kept by the shared value, to be used by all the inferences.
+        @example
+        inference = logic.newInference()
+        inference.IF( temperature.IS(hot) )
+        inference.THEN( hvacPower, refresh )
+        power = inference.crispify( hvacPower )
+        :param algorithm: {FuzzyLogicAlgorithm} [algorithm=FuzzyLogicAlgorithm.LINEAR] The algorithm to use for logic operations
+        :param crispAlgorithm: {FuzzyCrispAlgorithm} [crispAlgorithm=FuzzyCrispAlgorithm.CENTROID] The algorithm to use for crispification
+        """
+        self.algorithm = algorithm
+        self.crispAlgorithm = crispAlgorithm
+        self.veracity = FuzzyVeracity(0, algorithm)
+        self.values = {}
+
+    def IF(self, veracity):
+        """
+        This function stores the veracity in this inference, to be used with {@link FuzzyInference.THEN}.
+        :param veracity: {FuzzyVeracity} The veracity of the statement.
+        :return: {FuzzyVeracity} The value passed as argument.
+        """
+        self.veracity = veracity
+        return veracity
+
+    def THEN(self, value, fuzzySet, quantifier=FuzzyQuantifier.NONE):
+        """
+        Sets a value in a set, using the veracity resulting from the previous call to {@link FuzzyInference.IF}.
+        The value itself is not changed: the activation is recorded in this inference.
+        :param value: {FuzzyValue} The value to set.
+        :param fuzzySet: {FuzzySet} The set the value has to be included in.
+        :param quantifier: {FuzzyQuantifier} [quantifier=FuzzyQuantifier.NONE] A quantifier to apply for setting the value.
+        """
+        self.value(value).SET(fuzzySet, quantifier, self.veracity)
+
+    def value(self, value):
+        """
+        Gets the value holding the activations of this inference for the given value.
+        Use it to read the report of the crispification, if the given value has <code>reportEnabled</code>.
+        :param value: {FuzzyValue} The value.
+        :return: {FuzzyValue} A private copy of the value, owned by this inference.
+        """
+        key = id(value)
+        if key not in self.values:
+            inferred = FuzzyValue(value.value, value.unit, value.algorithm, value.crispAlgorithm)
+            inferred.reportEnabled = value.reportEnabled
+            inferred.reportSize = value.reportSize
+            inferred.universe = value.universe
+            self.values[key] = (value, inferred)
+        return self.values[key][1]
+
+    def crispify(self, value, algorithm=None):
+        """
+        Computes a crisp value depending on the rules activated in this inference.
+        :param value: {FuzzyValue} The value.
+        :param algorithm: {FuzzyCrispAlgorithm} [algorithm] Change the algorithm to use for crispification.
+        :return: {Number} The crisp (i.e. standard) value.
+        """
+        if algorithm is None:
+            algorithm = value.crispAlgorithm
+        if algorithm is None:
+            algorithm = self.crispAlgorithm
+        inferred = self.value(value)
+        crisp = inferred.crispify(False, algorithm)
+        # keep the universe created by the area algorithms on the shared value, so that the next inferences reuse it
+        if inferred.universe is not None and inferred.universe is not value.universe:
+            value.universe = inferred.universe
+        return crisp
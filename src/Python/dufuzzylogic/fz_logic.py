@@ -4,10 +4,18 @@ from .fz_value import FuzzyValue
 from .fz_veracity import FuzzyVeracity
 from .fz_logicalgorithm import FuzzyLogicAlgorithm
 from .fz_crispalgorithm import FuzzyCrispAlgorithm
+from .fz_rulebase import FuzzyRuleBase
+from .fz_rulefile import loadRuleBase
+from .fz_codegen import readSource
+from .fz_settable import writeSetTables, readSetTables
+from .fz_inference import FuzzyInference
+from .fz_universe import FuzzyUniverse
+from .fz_variable import FuzzyVariable
+from .fz_profiler import FuzzyProfiler
 
 class FuzzyLogic:
 
-    def __init__(self, algorithm=FuzzyLogicAlgorithm.LINEAR, crispAlgorithm=FuzzyCrispAlgorithm.CENTROID):
+    def __init__(self, algorithm=FuzzyLogicAlgorithm.LINEAR, crispAlgorithm=FuzzyCrispAlgorithm.CENTROID, cacheSize=0):
         """
         Creates a new Fuzzy Logic Engine.
         @class
@@ -18,10 +26,12 @@ class FuzzyLogic:
         @license GPL-3.0
         :param algorithm: {FuzzyLogicAlgorithm} [algorithm=FuzzyLogicAlgorithm.LINEAR] The algorithm to use for logic operations
         :param crispAlgorithm: {FuzzyCrispAlgorithm} [crispAlgorithm=FuzzyCrispAlgorithm.CENTROID] The algorithm to use for crispification
+        :param cacheSize: {int} [cacheSize=0] When not 0, the sets created by {@link FuzzyLogic.newSet} keep this number of results, see {@link FuzzySet.enableCache}
         """
         self.algorithm = algorithm
         self.veracity = FuzzyVeracity(0)
         self.crispAlgorithm = crispAlgorithm
+        self.cacheSize = cacheSize
 
     def newValue(self, value, unit):
         """
@@ -62,7 +72,118 @@ class FuzzyLogic:
         """
         if shapeOut is None:
             shapeOut = shapeIn
-        return FuzzySet(name, extremeValue, referenceValue, shapeIn, shapeOut, plateauMin, plateauMax, self.algorithm)
+        fuzzySet = FuzzySet(name, extremeValue, referenceValue, shapeIn, shapeOut, plateauMin, plateauMax, self.algorithm)
+        if self.cacheSize:
+            fuzzySet.enableCache(self.cacheSize)
+        return fuzzySet
+
+    def newVariable(self, name, sets=None, threshold=1e-9):
+        """
+        Creates a new {@link FuzzyVariable}, to find quickly which of its sets contain a value.
+        :param name: {string} The name of the variable.
+        :param sets: {FuzzySet[]} [sets] The sets of the variable.
+        :param threshold: {Number} [threshold=1e-9] Only the sets containing a value with a veracity above this threshold are returned by {@link FuzzyVariable.fuzzify}.
+        The default ignores the far tails of the smooth shapes (sigmoid, gaussian), which never reach 0: with a threshold of 0, a value would be contained by nearly all these sets.
+        :return: {FuzzyVariable} The variable.
+        """
+        return FuzzyVariable(name, sets, threshold)
+
+    def saveSets(self, sets, path):
+        """
+        Saves sets and their tables (see {@link FuzzySet.tabulate}) to a binary file, to be loaded with {@link FuzzyLogic.loadSets}.
+        @example
+        for s in sets:
+            s.tabulate(1024)
+        logic.saveSets(sets, "/dev/shm/sets.fzs")
+        :param sets: {FuzzySet[]} The sets. Their names must be unique.
+        :param path: {string} The path of the file. The file is replaced atomically.
+        """
+        writeSetTables(path, list(sets))
+
+    def loadSets(self, path):
+        """
+        Loads the sets saved with {@link FuzzyLogic.saveSets}.
+        The file is memory-mapped read-only, and the tables are used in place, without any copy:
+        all the processes loading the same file share its memory.
+        When the sets are sent to other processes (with {@link FuzzyRuleBase.map} for example), the tables are mapped again
+        from the file instead of being copied, so the file must be available to these processes,
+        and not saved again in the meantime (a ValueError is raised if its content has changed).
+        :param path: {string} The path of the file.
+        :return: {dict} The sets, by name.
+        """
+        sets = {}
+        for state in readSetTables(path):
+            fuzzySet = FuzzySet.__new__(FuzzySet)
+            fuzzySet.__setstate__(state)
+            sets[fuzzySet.name] = fuzzySet
+        return sets
+
+    def newRuleBase(self):
+        """
+        Creates a new {@link FuzzyRuleBase}, using the algorithms of this engine.
+        :return: {FuzzyRuleBase} The rule base.
+        """
+        return FuzzyRuleBase(self.algorithm, self.crispAlgorithm)
+
+    def loadRuleBase(self, path, cacheDirectory=None):
+        """
+        Loads a {@link FuzzyRuleBase} declared in a JSON file, or a TOML file if its extension is <code>.toml</code>.
+        The document is validated, and the rule base is compiled.
+        The algorithms of this engine are used if the document does not set them.
+        @example
+        rules = logic.loadRuleBase("hvac.json", "cache")
+        power = rules.evaluate({"temperature": 22})["power"]
+        :param path: {string} The path of the file. See the module <code>fz_rulefile</code> for the format.
+        :param cacheDirectory: {string} [cacheDirectory] A folder where to keep the loaded rule bases, keyed by the hash of the file content,
+        so that the next loads (in other processes, for example) neither parse and validate the file, nor compile the rules again.
+        Only use a folder you trust, which nobody else can write to: the cache files are unpickled, and unpickling a forged file can run any code.
+        :return: {FuzzyRuleBase} The rule base.
+        """
+        return loadRuleBase(path, cacheDirectory, self.algorithm, self.crispAlgorithm)
+
+    def loadGenerated(self, path, name="evaluate"):
+        """
+        Loads the function evaluating a {@link FuzzyRuleBase} from a file written by {@link FuzzyRuleBase.generate},
+        without building nor compiling the rule base. Only load files you trust: the file is executed.
+        :param path: {string} The path of the file.
+        :param name: {string} [name="evaluate"] The name of the function.
+        :return: {function} The function, taking a dict of the crisp values of the inputs by name, and returning a dict of the crisp values of the outputs by name.
+        """
+        return readSource(path, name)
+
+    def newInference(self):
+        """
+        Creates a new {@link FuzzyInference}, using the algorithms of this engine.
+        Use one inference per evaluation of the rules to share the engine, the sets and the values between threads.
+        :return: {FuzzyInference} The inference.
+        """
+        return FuzzyInference(self.algorithm, self.crispAlgorithm)
+
+    def newUniverse(self, minimum, maximum, resolution=1001):
+        """
+        Creates a new {@link FuzzyUniverse}, to be used by the area crispification algorithms.
+        @example
+        power = logic.newValue(0, "%")
+        power.universe = logic.newUniverse(-100, 100, 401)
+        :param minimum: {Number} The lowest value of the universe.
+        :param maximum: {Number} The highest value of the universe.
+        :param resolution: {Number} [resolution=1001] The number of points of the universe.
+        :return: {FuzzyUniverse} The universe.
+        """
+        return FuzzyUniverse(minimum, maximum, resolution)
+
+    def newProfiler(self, callback=None):
+        """
+        Creates a new {@link FuzzyProfiler}, to measure the time spent in each stage of the inferences, and how often each rule fires.
+        Nothing is measured until it is enabled.
+        @example
+        with logic.newProfiler() as profiler:
+            power = rules.evaluate({"temperature": 22})["power"]
+        print(profiler.toDict()["stages"])
+        :param callback: {function} [callback] A function called after each timed call, with the stage, the name of the set (or None), and the time in seconds.
+        :return: {FuzzyProfiler} The profiler.
+        """
+        return FuzzyProfiler(callback)
 
     def IF(self, veracity):
         """
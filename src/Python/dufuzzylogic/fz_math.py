@@ -1,38 +1,89 @@
+from array import array
+from itertools import repeat
 import math
 
 # ====== SOME MATH FUNCTIONS =========
 
 """
 Some general purpose Math functions
+All of them accept either numbers or sequences of numbers (list, array, buffer, NumPy array...) for any argument:
+with sequences, the function is applied to each element, the numbers being used for all the elements,
+and the results are returned as an array of doubles.
  @namespace
  """
 FzMath = {}
 
+__all__ = ["FzMath", "logistic", "inverseLogistic", "gaussian", "reversedGaussian", "inverseGaussian",
+           "inverseReversedGaussian", "mean"]
 
-def logistic(value, midValue=0, minimum=0, maximum=1, rate=1):
+# The types of the arguments which are never sequences, checked first as they're the most common
+_NUMBERS = (float, int)
+
+_FOUR_LN2 = 4 * math.log(2)
+
+
+def _hasSequence(arguments):
     """
-    The logistic function (sigmoid)
-    :param value: {Number} value The value
-    :param midValue: {Number} [midValue=0] The midpoint value, at which the function returns maximum/2
-    :param minimum: {Number} [minimum=0] The minimum return value
-    :param maximum: {Number} [maximum=1] The maximum return value
-    :param rate: {Number} [rate=1] The logistic growth rate or steepness of the function
-    :return: {Number} The result in the range [minimum, maximum] (excluding minimum and maximum)
+    low-level undocumented method
+    checks if any of the arguments is a sequence of numbers
+    """
+    for argument in arguments:
+        if type(argument) not in _NUMBERS and hasattr(argument, "__iter__"):
+            return True
+    return False
+
+
+def _broadcast(function, arguments):
+    """
+    low-level undocumented method
+    calls a function of numbers on each element of the sequences of the arguments, repeating the numbers
+    """
+    length = None
+    columns = []
+    for argument in arguments:
+        if type(argument) not in _NUMBERS and hasattr(argument, "__iter__"):
+            if not hasattr(argument, "__len__"):
+                argument = list(argument)
+            if length is None:
+                length = len(argument)
+            elif len(argument) != length:
+                raise ValueError("The sequences must have the same length")
+            columns.append(argument)
+        else:
+            columns.append(repeat(argument))
+    return map(function, *columns)
+
+
+def _logistic(value, midValue=0, minimum=0, maximum=1, rate=1):
+    """
+    low-level undocumented method
+    the logistic function, for numbers only
     """
     exp = -rate * (value - midValue)
-    result = 1 / (1 + math.pow(math.e, exp))
+    result = 1 / (1 + math.exp(exp))
     return result * (maximum - minimum) + minimum
 
 
-def inverseLogistic(value, midValue=0, minimum=0, maximum=1, rate=1):
+def logistic(value, midValue=0, minimum=0, maximum=1, rate=1):
     """
-    The inverse logistic function (inverse sigmoid)
-    :param value: {Number} The value
-    :param midValue: {Number} [midValue=0] The midpoint value, at which the function returns maximum/2 in the original logistic function
-    :param minimum: {Number} [minimum=0] The minimum return value of the original logistic function
-    :param maximum: {Number} [maximum=1] The maximum return value of the original logistic function
-    :param rate: {Number} [rate=1] The logistic growth rate or steepness of the original logistic function
-    :return: {Number} The result
+    The logistic function (sigmoid)
+    :param value: {Number|Number[]} value The value
+    :param midValue: {Number|Number[]} [midValue=0] The midpoint value, at which the function returns maximum/2
+    :param minimum: {Number|Number[]} [minimum=0] The minimum return value
+    :param maximum: {Number|Number[]} [maximum=1] The maximum return value
+    :param rate: {Number|Number[]} [rate=1] The logistic growth rate or steepness of the function
+    :return: {Number|array} The result in the range [minimum, maximum] (excluding minimum and maximum)
+    """
+    arguments = (value, midValue, minimum, maximum, rate)
+    if _hasSequence(arguments):
+        return array('d', _broadcast(_logistic, arguments))
+    return _logistic(value, midValue, minimum, maximum, rate)
+
+
+def _inverseLogistic(value, midValue=0, minimum=0, maximum=1, rate=1):
+    """
+    low-level undocumented method
+    the inverse logistic function, for numbers only
     """
     if value == minimum:
         return 0
@@ -40,88 +91,166 @@ def inverseLogistic(value, midValue=0, minimum=0, maximum=1, rate=1):
     return midValue - math.log((maximum - minimum) / (value - minimum) - 1) / rate
 
 
-def gaussian(value, minimum=0, maximum=1, center=0, fwhm=1):
+def inverseLogistic(value, midValue=0, minimum=0, maximum=1, rate=1):
     """
-    The gaussian function
-    :param value: {Number} The value
-    :param minimum: {Number} [minimum=0] The minimum return value
-    :param maximum: {Number} [maximum=1] The maximum return value
-    :param center: {Number} [center=0] The center of the peak
-    :param fwhm: {Number} [fwhm=1] The full width at half maximum of the curve
-    :return: {Number} The result
+    The inverse logistic function (inverse sigmoid)
+    :param value: {Number|Number[]} The value
+    :param midValue: {Number|Number[]} [midValue=0] The midpoint value, at which the function returns maximum/2 in the original logistic function
+    :param minimum: {Number|Number[]} [minimum=0] The minimum return value of the original logistic function
+    :param maximum: {Number|Number[]} [maximum=1] The maximum return value of the original logistic function
+    :param rate: {Number|Number[]} [rate=1] The logistic growth rate or steepness of the original logistic function
+    :return: {Number|array} The result
+    """
+    arguments = (value, midValue, minimum, maximum, rate)
+    if _hasSequence(arguments):
+        return array('d', _broadcast(_inverseLogistic, arguments))
+    return _inverseLogistic(value, midValue, minimum, maximum, rate)
+
+
+def _gaussian(value, minimum=0, maximum=1, center=0, fwhm=1):
+    """
+    low-level undocumented method
+    the gaussian function, for numbers only
     """
     if fwhm == 0 and value == center:
         return maximum
     elif fwhm == 0:
         return 0
 
-    exp = -4 * math.log(2)
-    exp *= math.pow((value - center), 2)
-    exp *= 1 / math.pow(fwhm, 2)
-    result = math.pow(math.e, exp)
+    delta = value - center
+    exp = -_FOUR_LN2
+    exp *= delta * delta
+    exp *= 1 / (fwhm * fwhm)
+    result = math.exp(exp)
     return result * (maximum - minimum) + minimum
 
 
+def gaussian(value, minimum=0, maximum=1, center=0, fwhm=1):
+    """
+    The gaussian function
+    :param value: {Number|Number[]} The value
+    :param minimum: {Number|Number[]} [minimum=0] The minimum return value
+    :param maximum: {Number|Number[]} [maximum=1] The maximum return value
+    :param center: {Number|Number[]} [center=0] The center of the peak
+    :param fwhm: {Number|Number[]} [fwhm=1] The full width at half maximum of the curve
+    :return: {Number|array} The result
+    """
+    arguments = (value, minimum, maximum, center, fwhm)
+    if _hasSequence(arguments):
+        return array('d', _broadcast(_gaussian, arguments))
+    return _gaussian(value, minimum, maximum, center, fwhm)
+
+
+def _reversedGaussian(value, minimum, maximum, center, fwhm):
+    """
+    low-level undocumented method
+    the reversed gaussian function, for numbers only
+    """
+    r = - value - fwhm + 1
+    return _gaussian(value, minimum, maximum, center, r)
+
+
 def reversedGaussian(value, minimum, maximum, center, fwhm):
     """
     A "reversed" gaussian function, growing faster with low value
-    :param value: {Number} value The value
-    :param minimum: {Number} [minimum=0] The minimum return value
-    :param maximum: {Number} [maximum=1] The maximum return value
-    :param center: {Number} [center=0] The center of the peak
-    :param fwhm: {Number} [fwhm=1] The full width at half maximum of the curve
-    :return: {Number} The result
+    :param value: {Number|Number[]} value The value
+    :param minimum: {Number|Number[]} [minimum=0] The minimum return value
+    :param maximum: {Number|Number[]} [maximum=1] The maximum return value
+    :param center: {Number|Number[]} [center=0] The center of the peak
+    :param fwhm: {Number|Number[]} [fwhm=1] The full width at half maximum of the curve
+    :return: {Number|array} The result
     """
-    r = - value - fwhm + 1
-    return gaussian(value, minimum, maximum, center, r)
+    arguments = (value, minimum, maximum, center, fwhm)
+    if _hasSequence(arguments):
+        return array('d', _broadcast(_reversedGaussian, arguments))
+    return _reversedGaussian(value, minimum, maximum, center, fwhm)
 
 
-def inverseGaussian(value, minimum=0, maximum=1, center=0, fwhm=1):
+def _inverseGaussian(value, minimum=0, maximum=1, center=0, fwhm=1):
     """
-    The inverse gaussian function
-    :param value: The value
-    :param minimum: {Number} [minimum=0] The minimum return value of the corresponding gaussian function
-    :param maximum: {Number} [maximum=1] The maximum return value of the corresponding gaussian function
-    :param center: {Number} [center=0] The center of the peak of the corresponding gaussian function
-    :param fwhm: {Number} [fwhm=1] The full width at half maximum of the curve of the corresponding gaussian function
-    :return: {Number[]} The two possible results, the lower is the first in the list. If both are the same, it is the maximum
+    low-level undocumented method
+    the inverse gaussian function, for numbers only
     """
     if value == 1:
-        return [center, center]
+        return center, center
     if value == 0:
-        return [center + fwhm / 2, center - fwhm / 2]
+        return center + fwhm / 2, center - fwhm / 2
     if fwhm == 0:
-        return [center, center]
+        return center, center
 
     result = (value - minimum) / (maximum - minimum)
-    result = math.log(result) * math.pow(fwhm, 2)
-    result = result / (-4 * math.log(2))
+    result = math.log(result) * (fwhm * fwhm)
+    result = result / -_FOUR_LN2
     result = math.sqrt(result)
-    return [result + center, -result + center]
+    return result + center, -result + center
+
+
+def _pairs(results):
+    """
+    low-level undocumented method
+    splits a sequence of pairs of numbers to a pair of arrays
+    """
+    first = array('d')
+    second = array('d')
+    for a, b in results:
+        first.append(a)
+        second.append(b)
+    return first, second
+
+
+def inverseGaussian(value, minimum=0, maximum=1, center=0, fwhm=1):
+    """
+    The inverse gaussian function
+    :param value: {Number|Number[]} The value
+    :param minimum: {Number|Number[]} [minimum=0] The minimum return value of the corresponding gaussian function
+    :param maximum: {Number|Number[]} [maximum=1] The maximum return value of the corresponding gaussian function
+    :param center: {Number|Number[]} [center=0] The center of the peak of the corresponding gaussian function
+    :param fwhm: {Number|Number[]} [fwhm=1] The full width at half maximum of the curve of the corresponding gaussian function
+    :return: {Number[]} The two possible results, the lower is the first in the pair. If both are the same, it is the maximum.
+    With sequences, the pair contains two arrays, the first one with the lower results.
+    """
+    arguments = (value, minimum, maximum, center, fwhm)
+    if _hasSequence(arguments):
+        return _pairs(_broadcast(_inverseGaussian, arguments))
+    return _inverseGaussian(value, minimum, maximum, center, fwhm)
+
+
+def _inverseReversedGaussian(value, minimum, maximum, center, fwhm):
+    """
+    low-level undocumented method
+    the inverse of the reversed gaussian function, for numbers only
+    """
+    r = - value - fwhm + 1
+    return _inverseGaussian(value, minimum, maximum, center, r)
 
 
 def inverseReversedGaussian(value, minimum, maximum, center, fwhm):
     """
     The inverse of the reversed gaussian function
-    :param value: {Number} The value
-    :param minimum: {Number} [minimum=0] The minimum return value of the corresponding gaussian function
-    :param maximum: {Number} [maximum=1] The maximum return value of the corresponding gaussian function
-    :param center: {Number} [center=0] The center of the peak of the corresponding gaussian function
-    :param fwhm: {Number} [fwhm=1] The full width at half maximum of the curve of the corresponding gaussian function
-    :return: {Number[]} The two possible results, the lower is the first in the list. If both are the same, it is the maximum
+    :param value: {Number|Number[]} The value
+    :param minimum: {Number|Number[]} [minimum=0] The minimum return value of the corresponding gaussian function
+    :param maximum: {Number|Number[]} [maximum=1] The maximum return value of the corresponding gaussian function
+    :param center: {Number|Number[]} [center=0] The center of the peak of the corresponding gaussian function
+    :param fwhm: {Number|Number[]} [fwhm=1] The full width at half maximum of the curve of the corresponding gaussian function
+    :return: {Number[]} The two possible results, the lower is the first in the pair. If both are the same, it is the maximum.
+    With sequences, the pair contains two arrays, the first one with the lower results.
     """
-    r = - value - fwhm + 1
-    return inverseGaussian(value, minimum, maximum, center, r)
+    arguments = (value, minimum, maximum, center, fwhm)
+    if _hasSequence(arguments):
+        return _pairs(_broadcast(_inverseReversedGaussian, arguments))
+    return _inverseReversedGaussian(value, minimum, maximum, center, fwhm)
 
 
 def mean(values):
     """
     Returns the mean of a set of values
-    :param values: {Number[]} The values
+    :param values: {Number[]} The values. Any iterable of numbers.
     :return: {Number} The mean
     """
+    if not hasattr(values, "__len__"):
+        values = list(values)
     num = len(values)
     result = 0
-    for i in range(0, num):
-        result = result + values[i]
+    for value in values:
+        result = result + value
     return result / num
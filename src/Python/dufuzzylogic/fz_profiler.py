@@ -0,0 +1,328 @@
+from .fz_set import FuzzySet
+from .fz_value import FuzzyValue
+from .fz_veracity import FuzzyVeracity
+from .fz_quantifier import FuzzyQuantifier, toQuantifier
+from .fz_rulebase import FuzzyRuleBase
+from . import fz_rulebase
+from functools import wraps
+import time
+import weakref
+
+# ========== FUZZY PROFILER ==========
+
+# The stages of an inference, and the methods timed for each of them
+FUZZIFICATION = "fuzzification"
+ANTECEDENT = "antecedent"
+IMPLICATION = "implication"
+DEFUZZIFICATION = "defuzzification"
+RULE_BASE = "ruleBase"
+
+_VERACITY_OPERATORS = ("NEGATE", "AND", "OR", "XOR", "NXR", "IMPLIES", "DOES_NOT_IMPLY", "NAND", "NOR", "WEIGHTED",
+                       "NEGATE_", "AND_", "OR_", "XOR_", "NXR_", "IMPLIES_", "DOES_NOT_IMPLY_", "NAND_", "NOR_",
+                       "WEIGHTED_")
+
+# The profiler currently enabled, there can be only one as it replaces the methods of the classes
+_enabled = None
+
+
+class FuzzyProfiler:
+
+    def __init__(self, callback=None, clock=time.perf_counter):
+        """
+        Do not use the constructor of this class, use {@link FuzzyLogic.newProfiler} to create a new profiler.
+        @class
+        @classdesc A profiler measures the time spent in each stage of the inferences: the fuzzification ({@link FuzzySet.contains}),
+        the evaluation of the antecedents (the operators of {@link FuzzyVeracity}), the implication ({@link FuzzyValue.SET})
+        and the defuzzification ({@link FuzzyValue.crispify}), and the time spent by {@link FuzzyRuleBase.evaluate} and {@link FuzzyRuleBase.evaluateBatch}.
+        It also counts the calls for each set, and the number of times each rule fired (its veracity was not 0) with its mean veracity.<br />
+        The methods are instrumented only while the profiler is enabled: when it is disabled, the classes are restored and there is no cost at all.
+        Only one profiler can be enabled at once. The times are inclusive: e.g. the crispification of a {@link FuzzyValue} tested by a set
+        is counted both in the fuzzification and in the defuzzification.<br />
+        With {@link FuzzyLogic.THEN}, the rules are identified by their set and quantifier; with a {@link FuzzyRuleBase}, by their output and number.
+        The rules evaluated by {@link FuzzyRuleBase.evaluateBatch} are not counted.<br />
+        The rule bases are compiled again while the profiler is enabled, with timed membership functions: their fuzzification is measured by set,
+        like {@link FuzzySet.contains}, and they are compiled again without them when the profiler is disabled.
+        The operators of their antecedents are inlined in the compiled plan and can't be measured: their time is only included in the <code>ruleBase</code> stage.
+        The controllers created before the profiler was enabled, the surfaces and the generated functions are not measured, except when they fall back to the rule base.
+        @example
+        profiler = logic.newProfiler()
+        with profiler:
+            for row in rows:
+                rules.evaluate(row)
+        print(profiler.toPrometheus())
+        :param callback: {function} [callback] A function called after each timed call, with the stage, the name of the set for the fuzzification (or None), and the time in seconds.
+        :param clock: {function} [clock=time.perf_counter] The function returning the current time, in seconds.
+        @property {function} callback The function called after each timed call.
+        @property {dict} stages The number of calls and the time, for each stage, as [calls, seconds].
+        @property {dict} sets The number of calls to {@link FuzzySet.contains} and the time, for each set name, as [calls, seconds].
+        @property {dict} rules The number of evaluations, the number of times the rule fired and the sum of its veracities, for each rule, as [evaluations, fired, veracity].
+        """
+        self.callback = callback
+        self.clock = clock
+        self.stages = {}
+        self.sets = {}
+        self.rules = {}
+        self._originals = None
+        # the rule bases compiled with the timed membership functions
+        self._profiled = weakref.WeakSet()
+
+    def __enter__(self):
+        return self.enable()
+
+    def __exit__(self, exceptionType, exception, traceback):
+        self.disable()
+        return False
+
+    @property
+    def enabled(self):
+        """
+        True while this profiler is enabled.
+        """
+        return self._originals is not None
+
+    def enable(self):
+        """
+        Starts instrumenting the methods of the classes of the engine.
+        :return: {FuzzyProfiler} This profiler.
+        """
+        global _enabled
+        if _enabled is self:
+            return self
+        if _enabled is not None:
+            raise RuntimeError("Another profiler is already enabled")
+
+        self._originals = []
+        self._instrument(FuzzySet, "contains", self._fuzzification)
+        for name in _VERACITY_OPERATORS:
+            self._instrument(FuzzyVeracity, name, self._antecedent)
+        self._instrument(FuzzyValue, "SET", self._implication)
+        self._instrument(FuzzyValue, "crispify", self._defuzzification)
+        self._instrument(FuzzyRuleBase, "_crispify", self._ruleBaseCrispification)
+        # the plans are linked when the rule bases are compiled, and when they are unpickled from a cache
+        self._instrument(FuzzyRuleBase, "_link", self._compilation)
+        self._instrument(FuzzyRuleBase, "evaluate", self._ruleBase)
+        self._instrument(FuzzyRuleBase, "evaluateBatch", self._ruleBase)
+        fz_rulebase._profileMembership = self._membership
+        _enabled = self
+        return self
+
+    def disable(self):
+        """
+        Stops instrumenting the methods, and restores the classes. The measures are kept.
+        :return: {FuzzyProfiler} This profiler.
+        """
+        global _enabled
+        if _enabled is not self:
+            return self
+        for cls, name, original in self._originals:
+            setattr(cls, name, original)
+        self._originals = None
+        fz_rulebase._profileMembership = None
+        # the plans with the timed membership functions are dropped, the rule bases are compiled again when needed
+        for ruleBase in list(self._profiled):
+            ruleBase._plan = None
+        self._profiled = weakref.WeakSet()
+        _enabled = None
+        return self
+
+    def reset(self):
+        """
+        Clears the measures.
+        :return: {FuzzyProfiler} This profiler.
+        """
+        self.stages = {}
+        self.sets = {}
+        self.rules = {}
+        return self
+
+    def _instrument(self, cls, name, instrumentation):
+        """
+        low-level undocumented method
+        replaces a method of a class by its instrumented version
+        """
+        original = cls.__dict__[name]
+        self._originals.append((cls, name, original))
+        setattr(cls, name, wraps(original)(instrumentation(original)))
+
+    def _measure(self, stage, key, seconds):
+        """
+        low-level undocumented method
+        adds the time of a call to the measures of its stage (and set)
+        """
+        measure = self.stages.get(stage)
+        if measure is None:
+            measure = self.stages[stage] = [0, 0.0]
+        measure[0] += 1
+        measure[1] += seconds
+        if key is not None:
+            measure = self.sets.get(key)
+            if measure is None:
+                measure = self.sets[key] = [0, 0.0]
+            measure[0] += 1
+            measure[1] += seconds
+        if self.callback is not None:
+            self.callback(stage, key, seconds)
+
+    def _fire(self, rule, veracity):
+        """
+        low-level undocumented method
+        counts the evaluation of a rule
+        """
+        measure = self.rules.get(rule)
+        if measure is None:
+            measure = self.rules[rule] = [0, 0, 0.0]
+        measure[0] += 1
+        if veracity != 0:
+            measure[1] += 1
+            measure[2] += veracity
+
+    def _fuzzification(self, original):
+        clock = self.clock
+
+        def contains(fuzzySet, *args, **kwargs):
+            start = clock()
+            result = original(fuzzySet, *args, **kwargs)
+            self._measure(FUZZIFICATION, fuzzySet.name, clock() - start)
+            return result
+
+        return contains
+
+    def _membership(self, name, membership):
+        clock = self.clock
+
+        def timed(value):
+            start = clock()
+            result = membership(value)
+            self._measure(FUZZIFICATION, name, clock() - start)
+            return result
+
+        return timed
+
+    def _compilation(self, original):
+
+        def link(ruleBase, *args, **kwargs):
+            result = original(ruleBase, *args, **kwargs)
+            self._profiled.add(ruleBase)
+            return result
+
+        return link
+
+    def _antecedent(self, original):
+        clock = self.clock
+
+        def operator(veracity, *args, **kwargs):
+            start = clock()
+            result = original(veracity, *args, **kwargs)
+            self._measure(ANTECEDENT, None, clock() - start)
+            return result
+
+        return operator
+
+    def _implication(self, original):
+        clock = self.clock
+
+        def SET(value, fuzzySet, quantifier=FuzzyQuantifier.NONE, veracity=None):
+            start = clock()
+            original(value, fuzzySet, quantifier, veracity)
+            self._measure(IMPLICATION, None, clock() - start)
+            name = fuzzySet.name
+            quantifier = toQuantifier(quantifier)
+            if quantifier:
+                name += " (" + str(quantifier) + ")"
+            self._fire(name, 1 if veracity is None else veracity.veracity)
+
+        return SET
+
+    def _defuzzification(self, original):
+        clock = self.clock
+
+        def crispify(value, *args, **kwargs):
+            start = clock()
+            result = original(value, *args, **kwargs)
+            self._measure(DEFUZZIFICATION, None, clock() - start)
+            return result
+
+        return crispify
+
+    def _ruleBaseCrispification(self, original):
+        clock = self.clock
+
+        def crispify(ruleBase, registers, output, *args):
+            start = clock()
+            result = original(ruleBase, registers, output, *args)
+            self._measure(DEFUZZIFICATION, None, clock() - start)
+            name = output[0]
+            consequents = output[2]
+            numbers = output[4]
+            for i in range(0, len(consequents)):
+                self._fire(name + ": Rule #" + str(numbers[i]), registers[consequents[i][0]])
+            return result
+
+        return crispify
+
+    def _ruleBase(self, original):
+        clock = self.clock
+
+        def evaluate(ruleBase, *args, **kwargs):
+            start = clock()
+            if ruleBase not in self._profiled:
+                # compiled before the profiler was enabled
+                ruleBase.compile()
+            result = original(ruleBase, *args, **kwargs)
+            self._measure(RULE_BASE, None, clock() - start)
+            return result
+
+        return evaluate
+
+    def toDict(self):
+        """
+        Exports the measures.
+        :return: {dict} The measures: <code>stages</code> and <code>sets</code> with the <code>calls</code>, <code>seconds</code>
+        and <code>meanSeconds</code> of each stage and set; and <code>rules</code> with the number of <code>evaluations</code>,
+        the number of times each rule <code>fired</code> and its <code>meanVeracity</code> when it fired.
+        """
+        def timing(measures):
+            return {key: {"calls": calls, "seconds": seconds, "meanSeconds": seconds / calls if calls > 0 else 0}
+                    for key, (calls, seconds) in measures.items()}
+
+        return {
+            "stages": timing(self.stages),
+            "sets": timing(self.sets),
+            "rules": {rule: {"evaluations": evaluations, "fired": fired,
+                             "meanVeracity": veracity / fired if fired > 0 else 0}
+                      for rule, (evaluations, fired, veracity) in self.rules.items()}
+        }
+
+    def toPrometheus(self, prefix="dufuzzylogic"):
+        """
+        Exports the measures in the text format of Prometheus.
+        :param prefix: {string} [prefix="dufuzzylogic"] The prefix of the names of the metrics.
+        :return: {string} The metrics.
+        """
+        lines = []
+
+        def metric(name, kind, description, label, values):
+            lines.append("# HELP " + prefix + "_" + name + " " + description)
+            lines.append("# TYPE " + prefix + "_" + name + " " + kind)
+            for key, value in values:
+                lines.append(prefix + "_" + name + "{" + label + "=\"" + _escape(key) + "\"} " + repr(value))
+
+        metric("stage_calls_total", "counter", "Number of calls, by stage of the inference.", "stage",
+               [(stage, calls) for stage, (calls, seconds) in self.stages.items()])
+        metric("stage_seconds_total", "counter", "Time spent, by stage of the inference.", "stage",
+               [(stage, seconds) for stage, (calls, seconds) in self.stages.items()])
+        metric("set_calls_total", "counter", "Number of fuzzifications, by set.", "set",
+               [(name, calls) for name, (calls, seconds) in self.sets.items()])
+        metric("set_seconds_total", "counter", "Time spent in fuzzification, by set.", "set",
+               [(name, seconds) for name, (calls, seconds) in self.sets.items()])
+        metric("rule_evaluations_total", "counter", "Number of evaluations, by rule.", "rule",
+               [(rule, evaluations) for rule, (evaluations, fired, veracity) in self.rules.items()])
+        metric("rule_fired_total", "counter", "Number of evaluations with a veracity above 0, by rule.", "rule",
+               [(rule, fired) for rule, (evaluations, fired, veracity) in self.rules.items()])
+        metric("rule_veracity_sum", "counter", "Sum of the veracities of the rule when it fired.", "rule",
+               [(rule, veracity) for rule, (evaluations, fired, veracity) in self.rules.items()])
+        return "\n".join(lines) + "\n"
+
+
+def _escape(label):
+    return str(label).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
@@ -1,37 +1,112 @@
 from .fz_veracity import FuzzyVeracity
 from .fz_logicalgorithm import FuzzyLogicAlgorithm
+from bisect import bisect_left
+import math
+
+
+class _Quantifier(str):
+    """
+    low-level undocumented class
+    the quantifiers are unique instances of this class: a string (the name of the quantifier) carrying
+    its index in the list of quantifiers, its factor, and the precompiled functions applying it to a veracity
+    (None if the veracity is not changed)
+    """
+
+    def __new__(cls, name, index, factor, forward=None, inverse=None):
+        self = str.__new__(cls, name)
+        self.index = index
+        self.factor = factor
+        self.forward = forward
+        self.inverse = inverse
+        return self
+
+    def __reduce__(self):
+        # the functions can't be pickled, get the unique instance back from the name
+        return toQuantifier, (str(self),)
 
 
 class FuzzyQuantifier():
-    """! Enum of available quantifiers. """
+    """! Enum of available quantifiers. They can also be given by their names, which are case insensitive ("very" is PLUS). """
 
     ## This quantifier is meant to be used for crispification (with {@link FuzzyLogic.SET} or {@link FuzzyValue.SET})
-    IS_NOT = "Not"
+    IS_NOT = _Quantifier("Not", 0, 0, lambda v: 1, lambda v: 0)
     ## This quantifier is meant to be used for crispification (with {@link FuzzyLogic.SET} or {@link FuzzyValue.SET})
-    LESS = "Less"
+    LESS = _Quantifier("Less", 1, 0, lambda v: 1, lambda v: 0)
     ## Slightly
-    DOUBLE_MINUS = "Slightly"
+    DOUBLE_MINUS = _Quantifier("Slightly", 2, pow(0.5, 3), lambda v: pow(v, 1/3), lambda v: pow(v, 3))
     ## Somewhat
-    MINUS = "Somewhat"
+    MINUS = _Quantifier("Somewhat", 3, pow(0.5, 2), lambda v: pow(v, 0.5), lambda v: pow(v, 2))
     ## Moderately
-    AVERAGE = "Moderately"
+    AVERAGE = _Quantifier("Moderately", 4, 0.5)
     ## None
-    NONE = ""
+    NONE = _Quantifier("", 5, 0.5)
     ## Very
-    PLUS = "Very"
+    PLUS = _Quantifier("Very", 6, pow(0.5, 0.5), lambda v: pow(v, 2), lambda v: pow(v, 0.5))
     ## Extremely
-    DOUBLE_PLUS = "Extremely"
+    DOUBLE_PLUS = _Quantifier("Extremely", 7, pow(0.5, 1/3), lambda v: pow(v, 3), lambda v: pow(v, 1/3))
     ## This quantifier is meant to be used for crispification (with {@link FuzzyLogic.SET} or {@link FuzzyValue.SET})
-    IS = "Completely"
+    IS = _Quantifier("Completely", 8, 1, lambda v: 0, lambda v: 1)
     ## This quantifier is meant to be used for crispification (with {@link FuzzyLogic.SET} or {@link FuzzyValue.SET})
-    MORE = "More"
+    MORE = _Quantifier("More", 9, 1, lambda v: 0, lambda v: 1)
 
     FuzzyQuantifierList = {
-        IS_NOT: "Not", LESS: "Less", DOUBLE_MINUS: "Slightly", MINUS: "Somewhat", AVERAGE: "Moderately",
-        NONE: "", PLUS: "Very", DOUBLE_PLUS: "Extremely", IS: "Completely", MORE: "More"
+        IS_NOT: IS_NOT, LESS: LESS, DOUBLE_MINUS: DOUBLE_MINUS, MINUS: MINUS, AVERAGE: AVERAGE,
+        NONE: NONE, PLUS: PLUS, DOUBLE_PLUS: DOUBLE_PLUS, IS: IS, MORE: MORE
     }
 
 
+# The quantifiers by lower case name
+_quantifierNames = {q.lower(): q for q in FuzzyQuantifier.FuzzyQuantifierList}
+# The names which have already been resolved
+_resolvedNames = dict(FuzzyQuantifier.FuzzyQuantifierList)
+
+# The sorted factors of the quantifiers, to find the closest quantifier to a veracity.
+# When several quantifiers have the same factor, the first one of the list is kept.
+_nearestFactors = []
+_nearestQuantifiers = []
+for _q in sorted(FuzzyQuantifier.FuzzyQuantifierList, key=lambda q: q.factor):
+    if _q.factor not in _nearestFactors:
+        _nearestFactors.append(_q.factor)
+        _nearestQuantifiers.append(_q)
+
+
+def toQuantifier(quantifier):
+    """
+    low-level undocumented method
+    gets the quantifier from its name, which is case insensitive ("very" is FuzzyQuantifier.PLUS)
+    returns the argument as is if it's not the name of a quantifier
+    """
+    if type(quantifier) is _Quantifier:
+        return quantifier
+    try:
+        return _resolvedNames[quantifier]
+    except (KeyError, TypeError):
+        pass
+    if isinstance(quantifier, str):
+        q = _quantifierNames.get(quantifier.strip().lower())
+        if q is not None:
+            _resolvedNames[quantifier] = q
+            return q
+    return quantifier
+
+
+def nearestQuantifier(veracity):
+    """
+    low-level undocumented method
+    gets the quantifier which factor is the closest to the veracity
+    """
+    i = bisect_left(_nearestFactors, veracity)
+    quantifier = FuzzyQuantifier.IS_NOT
+    distance = 1
+    for j in (i - 1, i):
+        if 0 <= j < len(_nearestFactors):
+            test = math.fabs(_nearestFactors[j] - veracity)
+            if test < distance:
+                distance = test
+                quantifier = _nearestQuantifiers[j]
+    return quantifier
+
+
 """
     low-level undocumented method
     adjusts an existing veracity according to the quantifier
@@ -40,58 +115,32 @@ class FuzzyQuantifier():
 """
 
 def quantify(quantifier, veracity=None, algorithm=FuzzyLogicAlgorithm.LINEAR, inverse=False):
-    v = veracity
-
-    if quantifier == FuzzyQuantifier.IS_NOT or quantifier == FuzzyQuantifier.LESS:
-        if veracity is None:
-            return 0
-        if inverse:
-            v = 0
-        else:
-            v = 1
-
-    elif quantifier == FuzzyQuantifier.DOUBLE_MINUS:
-        if veracity is None:
-            return pow(0.5, 3)
-        if inverse:
-            v = pow(veracity, 3)
-        else:
-            v = pow(veracity, 1/3)
-
-    elif quantifier == FuzzyQuantifier.MINUS:
-        if veracity is None:
-            return pow(0.5, 2)
-        if inverse:
-            v = pow(veracity, 2)
-        else:
-            v = pow(veracity, 0.5)
-
-    elif quantifier == FuzzyQuantifier.AVERAGE or quantifier == FuzzyQuantifier.NONE:
-        if veracity is None:
-            return 0.5
-
-    elif quantifier == FuzzyQuantifier.PLUS:
-        if veracity is None:
-            return pow(0.5, 0.5)
-        if inverse:
-            v = pow(veracity, 0.5)
-        else:
-            v = pow(veracity, 2)
-
-    elif quantifier == FuzzyQuantifier.DOUBLE_PLUS:
-        if veracity is None:
-            return pow(0.5, 1/3)
-        if inverse:
-            v = pow(veracity, 1/3)
-        else:
-            v = pow(veracity, 3)
-
-    elif quantifier == FuzzyQuantifier.IS or quantifier == FuzzyQuantifier.MORE:
-        if veracity is None:
-            return 1
-        if inverse:
-            v = 1
-        else:
-            v = 0
-
-    return FuzzyVeracity(v, algorithm)
+    if type(quantifier) is not _Quantifier:
+        quantifier = toQuantifier(quantifier)
+        if type(quantifier) is not _Quantifier:
+            # Unknown quantifiers don't change the veracity
+            return FuzzyVeracity(veracity, algorithm)
+
+    if veracity is None:
+        return quantifier.factor
+
+    h = quantifier.inverse if inverse else quantifier.forward
+    if h is not None:
+        veracity = h(veracity)
+
+    return FuzzyVeracity(veracity, algorithm)
+
+
+def hedge(quantifier, inverse=False):
+    """
+    low-level undocumented method
+    returns a function applying the quantifier to a veracity number, like {@link quantify} does,
+    but without allocating a {@link FuzzyVeracity} for each call.
+    returns None if the quantifier does not change the veracity
+    """
+    quantifier = toQuantifier(quantifier)
+    if type(quantifier) is not _Quantifier:
+        return None
+    if inverse:
+        return quantifier.inverse
+    return quantifier.forward
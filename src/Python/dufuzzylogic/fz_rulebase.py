@@ -0,0 +1,1149 @@
+from .fz_quantifier import FuzzyQuantifier, hedge, toQuantifier
+from .fz_logicalgorithm import FuzzyLogicAlgorithm
+from .fz_crispalgorithm import FuzzyCrispAlgorithm
+from .fz_universe import universeFor
+from .fz_controller import FuzzyController
+from .fz_service import FuzzyService
+from .fz_surface import FuzzySurface
+from .fz_codegen import generateSource, loadSource, writeSource
+from array import array
+from operator import add
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+import os
+import threading
+
+# ========== FUZZY RULE BASE ==========
+
+
+# Logical operators, as functions of two veracity numbers (see {@link FuzzyVeracity} for the formulas).
+
+def _negate(x, y):
+    return 1 - x
+
+
+def _linearXor(x, y):
+    return x + y - 2 * min(x, y)
+
+
+def _linearNxr(x, y):
+    return 1 - x - y + 2 * min(x, y)
+
+
+def _linearImplies(x, y):
+    return 1 - min(x, 1 - y)
+
+
+def _linearDoesNotImply(x, y):
+    return min(x, 1 - y)
+
+
+def _linearNand(x, y):
+    return 1 - min(x, y)
+
+
+def _linearNor(x, y):
+    return 1 - max(x, y)
+
+
+def _hyperbolicAnd(x, y):
+    return x * y
+
+
+def _hyperbolicOr(x, y):
+    return x + y - x * y
+
+
+def _hyperbolicXor(x, y):
+    return x + y - 2 * x * y
+
+
+def _hyperbolicNxr(x, y):
+    return 1 - x - y + 2 * x * y
+
+
+def _hyperbolicImplies(x, y):
+    return 1 - x + x * y
+
+
+def _hyperbolicDoesNotImply(x, y):
+    return x * (1 - y)
+
+
+def _hyperbolicNand(x, y):
+    return 1 - x * y
+
+
+def _hyperbolicNor(x, y):
+    return 1 - x - y + x * y
+
+
+_OPERATORS = {
+    FuzzyLogicAlgorithm.LINEAR: {
+        "NEGATE": _negate, "AND": min, "OR": max, "XOR": _linearXor, "NXR": _linearNxr,
+        "IMPLIES": _linearImplies, "DOES_NOT_IMPLY": _linearDoesNotImply, "NAND": _linearNand, "NOR": _linearNor
+    },
+    FuzzyLogicAlgorithm.HYPERBOLIC: {
+        "NEGATE": _negate, "AND": _hyperbolicAnd, "OR": _hyperbolicOr, "XOR": _hyperbolicXor,
+        "NXR": _hyperbolicNxr, "IMPLIES": _hyperbolicImplies, "DOES_NOT_IMPLY": _hyperbolicDoesNotImply,
+        "NAND": _hyperbolicNand, "NOR": _hyperbolicNor
+    }
+}
+
+
+# The operators which are 0 when their first operand is 0: their second operand is not computed then,
+# unless it contains a WEIGHTED operator, which may go out of [0, 1] (min(0, -0.25) is not 0)
+_SHORT_CIRCUITS = ("AND", "DOES_NOT_IMPLY")
+
+# The instructions of the evaluation program, see {@link FuzzyRuleBase.compile}
+_TEST = 0
+_OPERATION = 1
+_SKIP = 2
+
+
+def _weighted(weight):
+    def weighted(x, y):
+        return 1 - weight * x + weight * y
+    return weighted
+
+
+def _addProduct(crisp, value, weight):
+    return crisp + value * weight
+
+
+def _divide(crisp, sumWeights):
+    if sumWeights != 0:
+        return crisp / sumWeights
+    return crisp
+
+
+# The function timing the membership functions in the compiled plans, set while a {@link FuzzyProfiler} is enabled:
+# it takes the name of the set and its membership function, and returns the timed function
+_profileMembership = None
+
+# The rule base of the current worker process, see {@link FuzzyRuleBase.map}
+_workerRuleBase = None
+
+
+def _initWorker(ruleBase):
+    global _workerRuleBase
+    _workerRuleBase = ruleBase.compile()
+
+
+def _evaluateChunk(rows):
+    return _workerRuleBase._evaluateRows(rows)
+
+
+class FuzzyExpression:
+    """
+    Do not use the constructor of this class, use {@link FuzzyInput.IS} or {@link FuzzyInput.IS_NOT} to create expressions.
+    @class
+    @classdesc A FuzzyExpression is the declaration of the antecedent of a rule in a {@link FuzzyRuleBase}.<br />
+    It has the same operators as {@link FuzzyVeracity}, but instead of computing a veracity right away,
+    it builds an expression tree which is compiled once by the rule base.
+    @example
+    var isHotAndWet = temperature.IS( hot ).AND( humidity.IS( wet ) );
+    @property {string} operator The name of the operator ("IS" for a test on an input)
+    @property {FuzzyExpression[]} operands The operands of the operator
+    """
+
+    def __init__(self, operator, operands=(), fuzzyInput=None, fuzzySet=None, quantifier=None, weight=None):
+        self.operator = operator
+        self.operands = operands
+        self.input = fuzzyInput
+        self.fuzzySet = fuzzySet
+        self.quantifier = toQuantifier(quantifier)
+        self.weight = weight
+
+    def NEGATE(self):
+        """
+        Negates this expression.
+        :return: {FuzzyExpression}
+        """
+        return FuzzyExpression("NEGATE", (self,))
+
+    def AND(self, other):
+        """
+        The equivalent of the boolean operation <code>this and other</code>
+        :param other: {FuzzyExpression} The other operand.
+        :return: {FuzzyExpression}
+        """
+        return FuzzyExpression("AND", (self, other))
+
+    def OR(self, other):
+        """
+        The equivalent of the boolean operation <code>this or other</code>
+        :param other: {FuzzyExpression} The other operand.
+        :return: {FuzzyExpression}
+        """
+        return FuzzyExpression("OR", (self, other))
+
+    def XOR(self, other):
+        """
+        The equivalent of the boolean operation <code>this != other</code>
+        :param other: {FuzzyExpression} The other operand.
+        :return: {FuzzyExpression}
+        """
+        return FuzzyExpression("XOR", (self, other))
+
+    def IS_NOT(self, other):
+        """
+        Alias for {@link FuzzyExpression.XOR}
+        """
+        return self.XOR(other)
+
+    def DIFFERENT(self, other):
+        """
+        Alias for {@link FuzzyExpression.XOR}
+        """
+        return self.XOR(other)
+
+    def NXR(self, other):
+        """
+        The equivalent of the boolean operation <code>this == other</code>
+        :param other: {FuzzyExpression} The other operand.
+        :return: {FuzzyExpression}
+        """
+        return FuzzyExpression("NXR", (self, other))
+
+    def IS(self, other):
+        """
+        Alias for {@link FuzzyExpression.NXR}
+        """
+        return self.NXR(other)
+
+    def EQUALS(self, other):
+        """
+        Alias for {@link FuzzyExpression.NXR}
+        """
+        return self.NXR(other)
+
+    def IMPLIES(self, other):
+        """
+        The equivalent of the boolean operation <code>!this or other</code>
+        :param other: {FuzzyExpression} The other operand.
+        :return: {FuzzyExpression}
+        """
+        return FuzzyExpression("IMPLIES", (self, other))
+
+    def WITH(self, other):
+        """
+        Alias for {@link FuzzyExpression.IMPLIES}
+        """
+        return self.IMPLIES(other)
+
+    def HAS(self, other):
+        """
+        Alias for {@link FuzzyExpression.IMPLIES}
+        """
+        return self.IMPLIES(other)
+
+    def DOES_NOT_IMPLY(self, other):
+        """
+        The equivalent of the boolean operation <code>this and !other</code>
+        :param other: {FuzzyExpression} The other operand.
+        :return: {FuzzyExpression}
+        """
+        return FuzzyExpression("DOES_NOT_IMPLY", (self, other))
+
+    def WITHOUT(self, other):
+        """
+        Alias for {@link FuzzyExpression.DOES_NOT_IMPLY}
+        """
+        return self.DOES_NOT_IMPLY(other)
+
+    def DOES_NOT_HAVE(self, other):
+        """
+        Alias for {@link FuzzyExpression.DOES_NOT_IMPLY}
+        """
+        return self.DOES_NOT_IMPLY(other)
+
+    def AND_NOT(self, other):
+        """
+        Alias for {@link FuzzyExpression.DOES_NOT_IMPLY}
+        """
+        return self.DOES_NOT_IMPLY(other)
+
+    def NAND(self, other):
+        """
+        The equivalent of the boolean operation <code>!(this and other)</code>
+        :param other: {FuzzyExpression} The other operand.
+        :return: {FuzzyExpression}
+        """
+        return FuzzyExpression("NAND", (self, other))
+
+    def NOT_BOTH(self, other):
+        """
+        Alias for {@link FuzzyExpression.NAND}
+        """
+        return self.NAND(other)
+
+    def NOR(self, other):
+        """
+        The equivalent of the boolean operation <code>!(this or other)</code>
+        :param other: {FuzzyExpression} The other operand.
+        :return: {FuzzyExpression}
+        """
+        return FuzzyExpression("NOR", (self, other))
+
+    def NONE(self, other):
+        """
+        Alias for {@link FuzzyExpression.NOR}
+        """
+        return self.NOR(other)
+
+    def WEIGHTED(self, other, weight):
+        """
+        Weights this and other according to a given factor.
+        The weight factor is applied to the other operand, and the <code>1 - weight</code> factor is applied to this.
+        :param other: {FuzzyExpression} The other operand.
+        :param weight: {Number} The weight.
+        :return: {FuzzyExpression}
+        """
+        return FuzzyExpression("WEIGHTED", (self, other), weight=weight)
+
+
+class FuzzyInput:
+    """
+    Do not use the constructor of this class, use {@link FuzzyRuleBase.newInput} to create a new input.
+    @class
+    @classdesc An input variable of a {@link FuzzyRuleBase}, used to declare the antecedents of the rules.
+    @property {string} name The name of the input, used as a key in the dict passed to {@link FuzzyRuleBase.evaluate}
+    @property {Number} value The value to use when the input is not given to {@link FuzzyRuleBase.evaluate}
+    @property {string} unit The unit of the input
+    """
+
+    def __init__(self, name, value=0, unit=""):
+        self.name = name
+        self.value = value
+        self.unit = unit
+
+    def IS(self, fuzzySet, quantifier=FuzzyQuantifier.NONE):
+        """
+        Declares a test of the inclusion of the input in the set
+        :param fuzzySet: {FuzzySet} The set which may include the value.
+        :param quantifier: {FuzzyQuantifier|string} A quantifier.
+        :return: {FuzzyExpression} The expression of the inclusion of the input in the set.
+        """
+        return FuzzyExpression("IS", (), self, fuzzySet, quantifier)
+
+    def IS_NOT(self, fuzzySet, quantifier=FuzzyQuantifier.NONE):
+        """
+        Declares a test of the exclusion of the input in the set
+        :param fuzzySet: {FuzzySet} The set which may (not) include the value.
+        :param quantifier: {FuzzyQuantifier|string} A quantifier.
+        :return: {FuzzyExpression} The expression of the exclusion of the input in the set.
+        """
+        return self.IS(fuzzySet, quantifier).NEGATE()
+
+
+class FuzzyOutput:
+    """
+    Do not use the constructor of this class, use {@link FuzzyRuleBase.newOutput} to create a new output.
+    @class
+    @classdesc An output variable of a {@link FuzzyRuleBase}, used to declare the consequents of the rules.
+    @property {string} name The name of the output, used as a key in the dict returned by {@link FuzzyRuleBase.evaluate}
+    @property {Number} value The value returned when no rule sets this output
+    @property {string} unit The unit of the output
+    @property {FuzzyUniverse} universe The universe used by the area crispification algorithms. By default, it is created to cover all the sets of the output.
+    """
+
+    def __init__(self, name, value=0, unit=""):
+        self.name = name
+        self.value = value
+        self.unit = unit
+        self.universe = None
+
+
+class FuzzyRule:
+    """
+    Do not use the constructor of this class, use {@link FuzzyRuleBase.addRule} to create a new rule.
+    @class
+    @classdesc A rule of a {@link FuzzyRuleBase}: <code>IF antecedent THEN output IS quantifier fuzzySet</code>,
+    or with a function rule (see {@link FuzzyRuleBase.addFunctionRule}): <code>IF antecedent THEN output = constant + coefficient * input...</code>
+    @property {Number} number The number of the rule, starting at 1
+    @property {FuzzyExpression} antecedent The condition of the rule
+    @property {FuzzyOutput} output The output set by the rule
+    @property {FuzzySet} fuzzySet The set the output has to be included in, None for a function rule
+    @property {FuzzyQuantifier} quantifier The quantifier to apply for setting the value
+    @property {Number} constant The constant of a function rule, None for a rule with a set
+    @property {dict} coefficients The coefficients of the inputs of a function rule, by {@link FuzzyInput} or input name
+    """
+
+    def __init__(self, number, antecedent, output, fuzzySet, quantifier=FuzzyQuantifier.NONE, constant=None,
+                 coefficients=None):
+        self.number = number
+        self.antecedent = antecedent
+        self.output = output
+        self.fuzzySet = fuzzySet
+        self.quantifier = toQuantifier(quantifier)
+        self.constant = constant
+        self.coefficients = {} if coefficients is None else dict(coefficients)
+
+
+class FuzzyRuleBase:
+
+    def __init__(self, algorithm=FuzzyLogicAlgorithm.LINEAR, crispAlgorithm=FuzzyCrispAlgorithm.CENTROID):
+        """
+        Creates a new rule base.
+        @class
+        @classdesc A set of rules declared once, then compiled to a flat evaluation plan.
+        Unlike {@link FuzzyLogic.IF} and {@link FuzzyLogic.THEN}, evaluating the rules does not build any
+        {@link FuzzyVeracity} nor change the {@link FuzzySet}s, and the same rule base can be evaluated any number of times.
+        @example
+        rules = logic.newRuleBase()
+        temperature = rules.newInput("temperature")
+        power = rules.newOutput("power")
+        rules.addRule(temperature.IS(hot), power, refresh)
+        rules.addRule(temperature.IS(cold), power, heat)
+        result = rules.evaluate({"temperature": 22})["power"]
+        :param algorithm: {FuzzyLogicAlgorithm} [algorithm=FuzzyLogicAlgorithm.LINEAR] The algorithm to use for logic operations
+        :param crispAlgorithm: {FuzzyCrispAlgorithm} [crispAlgorithm=FuzzyCrispAlgorithm.CENTROID] The algorithm to use for crispification
+        """
+        self.algorithm = algorithm
+        self.crispAlgorithm = crispAlgorithm
+        self.inputs = []
+        self.outputs = []
+        self.rules = []
+        self._plan = None
+        # the plan with the sets, quantifiers and operator names instead of the functions, which can be pickled
+        self._layout = None
+        # the expressions and the sets of the consequents of the plan, see {@link FuzzyRuleBase.toPython}
+        self._declarations = None
+        # the number of tests and operators shared by several rules, see {@link FuzzyRuleBase.statistics}
+        self._savedTests = 0
+        self._savedOperations = 0
+        # the rule base may be evaluated by several threads: the statistics are updated under a lock
+        self._statisticsLock = threading.Lock()
+        self.resetStatistics()
+
+    def __getstate__(self):
+        # the compiled plan can't be pickled, but its layout can: the plan is linked again from it when unpickling,
+        # without compiling the rules again; neither can the lock
+        state = self.__dict__.copy()
+        state["_plan"] = None
+        if self._plan is None:
+            # the layout is out of date
+            state["_layout"] = None
+        state["_declarations"] = None
+        del state["_statisticsLock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._statisticsLock = threading.Lock()
+        self._layout = state.get("_layout")
+        if self._layout is not None:
+            self._plan = self._link(self._layout)
+
+    def newInput(self, name, value=0, unit=""):
+        """
+        Creates a new {@link FuzzyInput}
+        :param name: {string} The unique name of the input.
+        :param value: {Number} [value=0] The value to use when the input is missing from the values to evaluate.
+        :param unit: {string} [unit=""] The unit of the input.
+        :return: {FuzzyInput} The input.
+        """
+        fuzzyInput = FuzzyInput(name, value, unit)
+        self.inputs.append(fuzzyInput)
+        self._plan = None
+        return fuzzyInput
+
+    def newOutput(self, name, value=0, unit=""):
+        """
+        Creates a new {@link FuzzyOutput}
+        :param name: {string} The unique name of the output.
+        :param value: {Number} [value=0] The value of the output when no rule sets it.
+        :param unit: {string} [unit=""] The unit of the output.
+        :return: {FuzzyOutput} The output.
+        """
+        output = FuzzyOutput(name, value, unit)
+        self.outputs.append(output)
+        self._plan = None
+        return output
+
+    def addRule(self, antecedent, output, fuzzySet, quantifier=FuzzyQuantifier.NONE):
+        """
+        Adds a rule, the equivalent of <code>logic.IF(antecedent)</code> then <code>logic.THEN(output, fuzzySet, quantifier)</code>.
+        Use the same antecedent in several rules to set several outputs.
+        :param antecedent: {FuzzyExpression} The condition of the rule.
+        :param output: {FuzzyOutput} The output to set.
+        :param fuzzySet: {FuzzySet} The set the output has to be included in.
+        :param quantifier: {FuzzyQuantifier} [quantifier=FuzzyQuantifier.NONE] A quantifier to apply for setting the value.
+        :return: {FuzzyRule} The rule.
+        """
+        rule = FuzzyRule(len(self.rules) + 1, antecedent, output, fuzzySet, quantifier)
+        self.rules.append(rule)
+        self._plan = None
+        return rule
+
+    def addFunctionRule(self, antecedent, output, constant=0, coefficients=None):
+        """
+        Adds a Takagi-Sugeno rule, which sets the output to a constant or a linear function of the inputs instead of a set.
+        The value of an output set by these rules is the mean of the values of its rules, weighted by their veracities:
+        there is no set to crispify, which is much faster. The crispification algorithm is not used.
+        An output is set either by rules with sets or by function rules, not both.
+        When the veracities of all its rules are 0, the output keeps its value (see {@link FuzzyOutput}).
+        @example
+        rules.addFunctionRule(temperature.IS(hot), power, -20, {temperature: -2})
+        rules.addFunctionRule(temperature.IS(cold), power, 60)
+        :param antecedent: {FuzzyExpression} The condition of the rule.
+        :param output: {FuzzyOutput} The output to set.
+        :param constant: {Number} [constant=0] The constant term of the function.
+        :param coefficients: {dict} [coefficients] The coefficients of the inputs, by {@link FuzzyInput} or input name.
+        :return: {FuzzyRule} The rule.
+        """
+        rule = FuzzyRule(len(self.rules) + 1, antecedent, output, None, FuzzyQuantifier.NONE, constant, coefficients)
+        self.rules.append(rule)
+        self._plan = None
+        return rule
+
+    def compile(self):
+        """
+        Compiles the rules to a flat evaluation plan.
+        This is done automatically by {@link FuzzyRuleBase.evaluate} when the rules have changed,
+        but the {@link FuzzySet}s must not be changed after the compilation, or this method must be called again.
+        In the plan, the second operand of an AND is skipped when the first one is 0, see {@link FuzzyRuleBase.statistics},
+        except when it contains a WEIGHTED operator, as its veracity may then be out of the [0.0, 1.0] range.
+        The identical tests (the same input, set and quantifier) and operators (the same operator on identical operands)
+        are computed only once, even when they are declared several times.
+        :return: {FuzzyRuleBase} This rule base.
+        """
+        inputIndices = {}
+        inputNames = {}
+        for i in range(0, len(self.inputs)):
+            inputIndices[id(self.inputs[i])] = i
+            inputNames[self.inputs[i].name] = i
+
+        atoms = []
+        operations = []
+        registers = {}
+        # The expression of each register
+        expressions = []
+        # The same tests and operators, in a single program where the second operand of an AND
+        # is skipped when the first one is 0
+        program = []
+
+        # The identical expressions share the same key: the number of each distinct test or operator,
+        # by expression and by declaration
+        keys = {}
+        nodes = {}
+
+        def keyOf(expression):
+            key = keys.get(id(expression))
+            if key is not None:
+                return key
+            if expression.operator == "IS":
+                node = ("IS", inputIndices[id(expression.input)], id(expression.fuzzySet), hedge(expression.quantifier))
+            else:
+                node = (expression.operator, expression.weight) + tuple(keyOf(o) for o in expression.operands)
+            key = nodes.setdefault(node, len(nodes))
+            keys[id(expression)] = key
+            return key
+
+        # The number of tests and operators of each expression, if nothing was shared
+        sizes = {}
+
+        def sizeOf(expression):
+            size = sizes.get(id(expression))
+            if size is None:
+                if expression.operator == "IS":
+                    size = (1, 0)
+                else:
+                    size = (0, 1)
+                    for operand in expression.operands:
+                        tests, operators = sizeOf(operand)
+                        size = (size[0] + tests, size[1] + operators)
+                sizes[id(expression)] = size
+            return size
+
+        # Whether each expression stays in [0, 1], i.e. contains no WEIGHTED operator, by key
+        bounded = {}
+
+        def isBounded(expression):
+            key = keyOf(expression)
+            if key not in bounded:
+                if expression.operator == "IS":
+                    bounded[key] = True
+                else:
+                    bounded[key] = expression.operator != "WEIGHTED" and all(isBounded(o) for o in expression.operands)
+            return bounded[key]
+
+        # The number of references to each expression, by the rules and the other expressions
+        references = {}
+
+        def countReferences(expression):
+            key = keyOf(expression)
+            references[key] = references.get(key, 0) + 1
+            if references[key] == 1 and expression.operator != "IS":
+                for operand in expression.operands:
+                    countReferences(operand)
+
+        for rule in self.rules:
+            countReferences(rule.antecedent)
+
+        def hoist(expression):
+            # the expressions referenced elsewhere must not be skipped: they are computed before
+            if keyOf(expression) in registers:
+                return
+            if references[keyOf(expression)] > 1:
+                compileExpression(expression)
+            elif expression.operator != "IS":
+                for operand in expression.operands:
+                    hoist(operand)
+
+        def compileExpression(expression):
+            key = keyOf(expression)
+            if key in registers:
+                return registers[key]
+
+            if expression.operator == "IS":
+                register = len(registers)
+                atom = (register, inputIndices[id(expression.input)], expression.fuzzySet, expression.quantifier)
+                atoms.append(atom)
+                program.append((_TEST,) + atom)
+            else:
+                a = compileExpression(expression.operands[0])
+                b = a
+                skip = None
+                if len(expression.operands) > 1:
+                    if expression.operator in _SHORT_CIRCUITS and isBounded(expression.operands[1]):
+                        hoist(expression.operands[1])
+                        skip = len(program)
+                        program.append(None)
+                    b = compileExpression(expression.operands[1])
+                    if skip is not None and len(program) == skip + 1:
+                        # the second operand was already computed
+                        program.pop()
+                        skip = None
+                operator = (expression.operator, expression.weight)
+                register = len(registers)
+                operations.append((register, operator, a, b))
+                program.append((_OPERATION, register, operator, a, b))
+                if skip is not None:
+                    # if a is 0, the result is 0: skip the second operand and the operation
+                    program[skip] = (_SKIP, a, None, register, len(program) - skip - 1)
+
+            registers[key] = register
+            expressions.append(expression)
+            return register
+
+        ruleRegisters = [compileExpression(rule.antecedent) for rule in self.rules]
+
+        crispAlgorithm = self.crispAlgorithm
+        implemented = crispAlgorithm in (FuzzyCrispAlgorithm.CENTROID, FuzzyCrispAlgorithm.CENTROID_LOWER,
+                                         FuzzyCrispAlgorithm.CENTROID_HIGHER, FuzzyCrispAlgorithm.MEAN,
+                                         FuzzyCrispAlgorithm.MEAN_LOWER, FuzzyCrispAlgorithm.MEAN_HIGHER)
+        area = crispAlgorithm in (FuzzyCrispAlgorithm.AREA_CENTROID, FuzzyCrispAlgorithm.AREA_BISECTOR,
+                                  FuzzyCrispAlgorithm.MEAN_OF_MAXIMUM)
+        weighted = crispAlgorithm in (FuzzyCrispAlgorithm.CENTROID, FuzzyCrispAlgorithm.CENTROID_LOWER,
+                                      FuzzyCrispAlgorithm.CENTROID_HIGHER)
+
+        outputs = []
+        # the sets and quantifiers of the consequents of each output
+        outputSets = []
+        for output in self.outputs:
+            rules = [i for i in range(0, len(self.rules)) if self.rules[i].output is output]
+            functional = len(rules) > 0 and self.rules[rules[0]].fuzzySet is None
+            if any((self.rules[i].fuzzySet is None) != functional for i in rules):
+                raise ValueError("The output " + str(output.name) + " is set both by rules with sets and by function rules")
+
+            if functional:
+                # (register, constant, ((input index, coefficient), ...)) for each rule
+                consequents = []
+                for i in rules:
+                    rule = self.rules[i]
+                    terms = []
+                    for key, coefficient in rule.coefficients.items():
+                        index = inputNames.get(key) if isinstance(key, str) else inputIndices.get(id(key))
+                        if index is None:
+                            raise KeyError("Unknown input: " + str(getattr(key, "name", key)))
+                        terms.append((index, coefficient))
+                    consequents.append((ruleRegisters[i], rule.constant, tuple(terms)))
+                outputs.append((output.name, output.value, tuple(consequents), None,
+                                tuple(self.rules[i].number for i in rules), True))
+                outputSets.append(())
+                continue
+
+            # Group the rules by set, in the same order as FuzzyValue.SET does
+            groups = []
+            groupSets = {}
+            for i in rules:
+                rule = self.rules[i]
+                name = rule.fuzzySet.name
+                if name not in groupSets:
+                    groupSets[name] = (rule.fuzzySet, [])
+                    groups.append(groupSets[name])
+                groupSets[name][1].append((ruleRegisters[i], rule.quantifier, rule.number))
+
+            consequents = []
+            # the numbers of the rules of the consequents
+            numbers = []
+            universe = None
+            if area:
+                for fuzzySet, activations in groups:
+                    for register, quantifier, number in activations:
+                        consequents.append((register, fuzzySet, quantifier))
+                        numbers.append(number)
+                if len(groups) > 0:
+                    sets = [group[0] for group in groups]
+                    if output.universe is None or not all(output.universe.covers(s) for s in sets):
+                        output.universe = universeFor(sets)
+                    universe = output.universe
+            else:
+                for fuzzySet, activations in groups:
+                    for register, quantifier, number in activations:
+                        consequents.append((register, fuzzySet, quantifier))
+                        numbers.append(number)
+
+            outputs.append((output.name, output.value, tuple(consequents), universe, tuple(numbers), False))
+            outputSets.append(tuple((fuzzySet, quantifier) for fuzzySet, activations in groups
+                                    for register, quantifier, number in activations))
+
+        self._layout = (
+            tuple((i.name, i.value) for i in self.inputs),
+            len(registers),
+            tuple(atoms),
+            tuple(operations),
+            tuple(outputs),
+            implemented,
+            weighted,
+            tuple(program)
+        )
+        self._plan = self._link(self._layout)
+        self._declarations = (tuple(expressions), tuple(outputSets))
+        tests = 0
+        operators = 0
+        for rule in self.rules:
+            size = sizeOf(rule.antecedent)
+            tests += size[0]
+            operators += size[1]
+        self._savedTests = tests - len(atoms)
+        self._savedOperations = operators - len(operations)
+        return self
+
+    def _link(self, layout):
+        """
+        low-level undocumented method
+        builds the plan from its layout: the functions of the sets, quantifiers and operators replace them
+        """
+        inputDefaults, numRegisters, atoms, operations, outputs, implemented, weighted, program = layout
+        operators = _OPERATORS[self.algorithm]
+        memberships = {}
+        linked = {}
+
+        for register, inputIndex, fuzzySet, quantifier in atoms:
+            membership = memberships.get(id(fuzzySet))
+            if membership is None:
+                membership = memberships[id(fuzzySet)] = fuzzySet.membershipFunction()
+            if _profileMembership is not None:
+                membership = _profileMembership(fuzzySet.name, membership)
+            linked[register] = (register, inputIndex, membership, hedge(quantifier))
+
+        for register, (name, weight), a, b in operations:
+            linked[register] = (register, _weighted(weight) if name == "WEIGHTED" else operators[name], a, b)
+
+        linkedOutputs = []
+        for name, default, consequents, universe, numbers, functional in outputs:
+            if not functional and universe is None:
+                consequents = tuple((register, fuzzySet.crispFunction(self.crispAlgorithm), hedge(quantifier, True))
+                                    for register, fuzzySet, quantifier in consequents)
+            linkedOutputs.append((name, default, consequents, universe, numbers, functional))
+
+        return (
+            inputDefaults,
+            numRegisters,
+            tuple(linked[atom[0]] for atom in atoms),
+            tuple(linked[operation[0]] for operation in operations),
+            tuple(linkedOutputs),
+            implemented,
+            weighted,
+            tuple(step if step[0] == _SKIP else (step[0],) + linked[step[1]] for step in program)
+        )
+
+    def evaluate(self, inputs):
+        """
+        Evaluates all the rules and crispifies the outputs.
+        :param inputs: {dict} The crisp values of the inputs, by name. Missing inputs use the value of their {@link FuzzyInput}.
+        :return: {dict} The crisp values of the outputs, by name.
+        """
+        if self._plan is None:
+            self.compile()
+        inputDefaults, numRegisters, atoms, operations, outputs, implemented, weighted, program = self._plan
+
+        values = [inputs.get(name, default) for name, default in inputDefaults]
+        registers = [0] * numRegisters
+
+        skipped = 0
+        i = 0
+        end = len(program)
+        while i < end:
+            kind, register, x, y, z = program[i]
+            i += 1
+            if kind == _TEST:
+                veracity = y(values[x])
+                if z is not None:
+                    veracity = z(veracity)
+                registers[register] = veracity
+            elif kind == _OPERATION:
+                registers[register] = x(registers[y], registers[z])
+            elif registers[register] == 0:
+                # jump after the operation
+                registers[y] = 0
+                skipped += z
+                i += z
+
+        pruned = 0
+        result = {}
+        for output in outputs:
+            result[output[0]], outputPruned = self._crispify(registers, output, implemented, weighted, values)
+            pruned += outputPruned
+
+        self._count(1, skipped, pruned)
+        return result
+
+    def _crispify(self, registers, output, implemented, weighted, values):
+        # crispifies an output of the plan from the veracities of the registers (and the values of the inputs for the function rules),
+        # returns the crisp value and the number of rules which were not crispified because their veracity is 0
+        name, default, consequents, universe, numbers, functional = output
+        if len(consequents) == 0:
+            return default, 0
+
+        if functional:
+            crisp = 0
+            sumWeights = 0
+            pruned = 0
+            for register, constant, terms in consequents:
+                veracity = registers[register]
+                if veracity == 0:
+                    pruned += 1
+                    continue
+                value = constant
+                for index, coefficient in terms:
+                    value += values[index] * coefficient
+                crisp += value * veracity
+                sumWeights += veracity
+            if sumWeights == 0:
+                return default, pruned
+            return crisp / sumWeights, pruned
+
+        if universe is not None:
+            activations = [(fuzzySet, quantifier, registers[register])
+                           for register, fuzzySet, quantifier in consequents if registers[register] != 0]
+            if len(activations) == 0:
+                return 0, len(consequents)
+            crisp = universe.crispify(activations, self.crispAlgorithm, self.algorithm)
+            return 0 if crisp is None else crisp, len(consequents) - len(activations)
+
+        crisp = 0
+        sumWeights = 0
+        pruned = 0
+        if implemented:
+            for register, crispValue, inverse in consequents:
+                veracity = registers[register]
+                if weighted and veracity == 0:
+                    # no weight, no need to crispify
+                    pruned += 1
+                    continue
+                if inverse is None:
+                    val = crispValue(veracity)
+                else:
+                    val = crispValue(inverse(veracity))
+                if weighted:
+                    crisp += val * veracity
+                    sumWeights += veracity
+                else:
+                    crisp += val
+                    sumWeights += 1
+
+        if sumWeights != 0:
+            crisp = crisp / sumWeights
+        return crisp, pruned
+
+    def evaluateBatch(self, inputs):
+        """
+        Evaluates all the rules and crispifies the outputs for a whole table of inputs at once.
+        The table is processed column by column: each test, operator and crispification runs once over all the rows,
+        which gives the same results as calling {@link FuzzyRuleBase.evaluate} on each row, much faster.
+        :param inputs: {dict|Number[][]} Either the columns of crisp values of the inputs, by name
+        (any sequence: list, array, NumPy array...), missing inputs using the value of their {@link FuzzyInput};
+        or the rows of crisp values, each row listing the inputs in the order they were created.
+        :return: {dict} The columns of crisp values of the outputs, by name, as arrays of doubles.
+        """
+        if self._plan is None:
+            self.compile()
+        inputDefaults, numRegisters, atoms, operations, outputs, implemented, weighted, program = self._plan
+
+        if isinstance(inputs, dict):
+            columns = [inputs.get(name) for name, default in inputDefaults]
+        else:
+            columns = list(zip(*inputs))
+            if len(columns) == 0:
+                columns = [()] * len(inputDefaults)
+        numRows = 0
+        for column in columns:
+            if column is not None:
+                numRows = len(column)
+                break
+        for i in range(0, len(columns)):
+            if columns[i] is None:
+                columns[i] = [inputDefaults[i][1]] * numRows
+
+        registers = [None] * numRegisters
+
+        # the second operand of an AND is skipped when the first one is 0 for all the rows
+        skipped = 0
+        i = 0
+        end = len(program)
+        while i < end:
+            kind, register, x, y, z = program[i]
+            i += 1
+            if kind == _TEST:
+                veracities = map(y, columns[x])
+                if z is not None:
+                    veracities = map(z, veracities)
+                registers[register] = list(veracities)
+            elif kind == _OPERATION:
+                registers[register] = list(map(x, registers[y], registers[z]))
+            elif not any(registers[register]):
+                registers[y] = [0] * numRows
+                skipped += z * numRows
+                i += z
+
+        pruned = 0
+        result = {}
+        for name, default, consequents, universe, numbers, functional in outputs:
+            if len(consequents) == 0:
+                result[name] = array('d', [default]) * numRows
+                continue
+
+            if functional:
+                crisp = [0] * numRows
+                sumWeights = [0] * numRows
+                for register, constant, terms in consequents:
+                    veracities = registers[register]
+                    zeros = veracities.count(0)
+                    pruned += zeros
+                    if zeros == numRows:
+                        continue
+                    values = [constant] * numRows
+                    for index, coefficient in terms:
+                        values = list(map(_addProduct, values, columns[index], repeat(coefficient)))
+                    if zeros > 0:
+                        # no weight, the value is not used
+                        values = [v if w != 0 else 0 for v, w in zip(values, veracities)]
+                    crisp = list(map(_addProduct, crisp, values, veracities))
+                    sumWeights = list(map(add, sumWeights, veracities))
+                result[name] = array('d', [c / w if w != 0 else default for c, w in zip(crisp, sumWeights)])
+                continue
+
+            if universe is not None:
+                column = array('d')
+                for row in range(0, numRows):
+                    activations = [(fuzzySet, quantifier, registers[register][row])
+                                   for register, fuzzySet, quantifier in consequents if registers[register][row] != 0]
+                    pruned += len(consequents) - len(activations)
+                    crisp = None
+                    if len(activations) > 0:
+                        crisp = universe.crispify(activations, self.crispAlgorithm, self.algorithm)
+                    column.append(0 if crisp is None else crisp)
+                result[name] = column
+                continue
+
+            crisp = [0] * numRows
+            sumWeights = [0] * numRows
+            if implemented:
+                for register, crispValue, inverse in consequents:
+                    veracities = registers[register]
+                    if weighted:
+                        zeros = veracities.count(0)
+                        pruned += zeros
+                        if zeros == numRows:
+                            continue
+                    if inverse is None:
+                        vals = map(crispValue, veracities)
+                    else:
+                        vals = map(crispValue, map(inverse, veracities))
+                    if weighted:
+                        if zeros > 0:
+                            # no weight, no need to crispify
+                            vals = [crispValue(v if inverse is None else inverse(v)) if v != 0 else 0
+                                    for v in veracities]
+                        crisp = list(map(_addProduct, crisp, vals, veracities))
+                        sumWeights = list(map(add, sumWeights, veracities))
+                    else:
+                        crisp = list(map(add, crisp, vals))
+                        sumWeights = [w + 1 for w in sumWeights]
+
+            result[name] = array('d', map(_divide, crisp, sumWeights))
+
+        self._count(numRows, skipped, pruned)
+        return result
+
+    def _count(self, evaluations, skipped, pruned):
+        """
+        low-level undocumented method
+        adds the counts of an evaluation to the statistics
+        """
+        with self._statisticsLock:
+            self.evaluations += evaluations
+            self.skippedOperations += skipped
+            self.prunedRules += pruned
+
+    def statistics(self):
+        """
+        Gets the statistics of the evaluations of the rules since the rule base was created or {@link FuzzyRuleBase.resetStatistics} was called.
+        When the first operand of an AND is 0, the tests and operators of the second operand are skipped;
+        with the CENTROID algorithms and the function rules, the rules with a veracity of 0 are pruned: they are not crispified, as their weight is 0.
+        The identical tests and operators declared by several rules are computed once per evaluation, see {@link FuzzyRuleBase.compile}.
+        The evaluations made by the worker processes of {@link FuzzyRuleBase.map} are not counted.
+        :return: {dict} <code>evaluations</code> (each row of a batch is an evaluation), <code>skippedOperations</code>,
+        <code>prunedRules</code>, and the mean numbers per evaluation <code>skippedPerEvaluation</code> and <code>prunedPerEvaluation</code>;
+        <code>savedTests</code> and <code>savedOperations</code>, the numbers of tests and operators of the rules not computed in each evaluation
+        because they are shared (as of the last compilation), and <code>savedEvaluations</code>, the total number of tests and operators saved.
+        """
+        with self._statisticsLock:
+            evaluations = self.evaluations
+            skipped = self.skippedOperations
+            pruned = self.prunedRules
+        return {
+            "evaluations": evaluations,
+            "skippedOperations": skipped,
+            "prunedRules": pruned,
+            "skippedPerEvaluation": skipped / evaluations if evaluations > 0 else 0,
+            "prunedPerEvaluation": pruned / evaluations if evaluations > 0 else 0,
+            "savedTests": self._savedTests,
+            "savedOperations": self._savedOperations,
+            "savedEvaluations": evaluations * (self._savedTests + self._savedOperations)
+        }
+
+    def resetStatistics(self):
+        """
+        Resets the statistics of the evaluations, see {@link FuzzyRuleBase.statistics}.
+        """
+        with self._statisticsLock:
+            self.evaluations = 0
+            self.skippedOperations = 0
+            self.prunedRules = 0
+
+    def map(self, inputs, workers=None, chunksize=256):
+        """
+        Evaluates the rules for a stream of inputs, using a pool of worker processes.
+        The rule base is sent only once to each worker, then the inputs are sent by chunks
+        and evaluated with {@link FuzzyRuleBase.evaluateBatch}.
+        The inputs are read lazily, so this can be used with streams bigger than the memory.
+        @example
+        for result in rules.map(readRows(), workers=32):
+            write(result["power"])
+        :param inputs: {dict[]} The crisp values of the inputs, by name, like in {@link FuzzyRuleBase.evaluate}. Any iterable.
+        :param workers: {Number} [workers] The number of processes. By default, the number of CPUs. With a single worker, no process is started.
+        :param chunksize: {Number} [chunksize=256] The number of inputs sent at once to a worker.
+        :return: {generator} The crisp values of the outputs, by name, in the same order as the inputs.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        chunksize = max(int(chunksize), 1)
+        iterator = iter(inputs)
+
+        if workers <= 1:
+            while True:
+                rows = list(islice(iterator, chunksize))
+                if len(rows) == 0:
+                    return
+                yield from self._evaluateRows(rows)
+
+        with ProcessPoolExecutor(workers, initializer=_initWorker, initargs=(self,)) as executor:
+            pending = deque()
+            while True:
+                # keep all the workers busy, without reading the whole stream
+                while len(pending) < workers * 2:
+                    rows = list(islice(iterator, chunksize))
+                    if len(rows) == 0:
+                        break
+                    pending.append(executor.submit(_evaluateChunk, rows))
+                if len(pending) == 0:
+                    return
+                yield from pending.popleft().result()
+
+    def newController(self, inputs=None):
+        """
+        Creates a new {@link FuzzyController}, to evaluate the rules on a stream of updates of the inputs,
+        computing again only what depends on the inputs which have changed.
+        :param inputs: {dict} [inputs] The initial crisp values of the inputs, by name.
+        :return: {FuzzyController} The controller.
+        """
+        return FuzzyController(self, inputs)
+
+    def newService(self, maxBatchSize=256, maxWait=0.002, executor=None):
+        """
+        Creates a new {@link FuzzyService}, to evaluate the rules from asyncio coroutines, in micro-batches.
+        :param maxBatchSize: {Number} [maxBatchSize=256] The maximum number of inputs evaluated at once.
+        :param maxWait: {Number} [maxWait=0.002] The maximum time, in seconds, an input waits for its batch to be evaluated.
+        :param executor: {concurrent.futures.Executor} [executor] An executor to evaluate the batches out of the event loop.
+        :return: {FuzzyService} The service.
+        """
+        return FuzzyService(self, maxBatchSize, maxWait, executor)
+
+    def bake(self, grid, validation=1000):
+        """
+        Evaluates the rules once over a grid of values of the inputs, and returns a {@link FuzzySurface} interpolating the outputs.
+        Querying the surface does not depend on the number of rules: use it for controllers with few inputs and many rules.
+        @example
+        surface = rules.bake({"temperature": (-10, 40, 101)})
+        if surface.error < 0.5:
+            power = surface.function("power")
+        :param grid: {dict} The grid, as [minimum, maximum, resolution] for each input name, the resolution being the number of points on this axis.
+        The other inputs keep their default value.
+        :param validation: {int} [validation=1000] The number of random points where the interpolation is compared to the exact evaluation,
+        the maximum deviation being reported by {@link FuzzySurface.errors} and {@link FuzzySurface.error}.
+        :return: {FuzzySurface} The surface.
+        """
+        return FuzzySurface(self, grid, validation)
+
+    def toPython(self, name="evaluate"):
+        """
+        Generates the source of a Python module defining a function which evaluates the rules like {@link FuzzyRuleBase.evaluate}:
+        the constants of the sets are inlined, the shapes and the operators are resolved when generating the source,
+        and the crispification is unrolled, so there is no attribute lookup nor dispatch left when evaluating.
+        The rules are compiled again first; the source must be generated again when the rules or the sets change.
+        The statistics of the rule base are not updated by the generated function.
+        The area crispification algorithms are not supported.
+        :param name: {string} [name="evaluate"] The name of the function.
+        :return: {string} The source, which imports only <code>math</code>: it does not need DuFuzzyLogic to run.
+        """
+        return generateSource(self, name)
+
+    def generate(self, path=None, name="evaluate"):
+        """
+        Generates the function evaluating the rules, see {@link FuzzyRuleBase.toPython}.
+        @example
+        evaluate = rules.generate("hvac_rules.py")
+        power = evaluate({"temperature": 22})["power"]
+        # later, or in other processes
+        evaluate = logic.loadGenerated("hvac_rules.py")
+        :param path: {string} [path] A <code>.py</code> file where to write the source, to be loaded with {@link FuzzyLogic.loadGenerated}
+        or imported. The file is replaced atomically.
+        :param name: {string} [name="evaluate"] The name of the function.
+        :return: {function} The function, taking a dict of the crisp values of the inputs by name (missing inputs use the value of their {@link FuzzyInput}),
+        and returning a dict of the crisp values of the outputs by name.
+        """
+        source = generateSource(self, name)
+        if path is not None:
+            writeSource(path, source)
+            return loadSource(source, name, str(path))
+        return loadSource(source, name)
+
+    def _evaluateRows(self, rows):
+        """
+        Evaluates a list of inputs as a batch, and returns the list of outputs.
+        """
+        columns = {}
+        for fuzzyInput in self.inputs:
+            name = fuzzyInput.name
+            default = fuzzyInput.value
+            columns[name] = [row.get(name, default) for row in rows]
+        results = self.evaluateBatch(columns)
+        names = list(results.keys())
+        outputs = [results[name] for name in names]
+        return [dict(zip(names, values)) for values in zip(*outputs)]
@@ -0,0 +1,300 @@
+from .fz_set import FuzzySet
+from .fz_shape import FuzzyShape
+from .fz_quantifier import FuzzyQuantifier, toQuantifier, _Quantifier
+from .fz_logicalgorithm import FuzzyLogicAlgorithm
+from .fz_crispalgorithm import FuzzyCrispAlgorithm
+from .fz_rulebase import FuzzyRuleBase, FuzzyExpression
+import gc
+import hashlib
+import json
+import os
+import pickle
+
+# ========== RULE FILES ==========
+
+"""
+A rule base can be declared in a JSON (or TOML) document, instead of code:
+{
+    "algorithm": "LINEAR",
+    "crispAlgorithm": "CENTROID",
+    "sets": [
+        {"name": "Hot", "extremeValue": 21, "referenceValue": 35, "shapeIn": "GAUSSIAN", "shapeOut": "CONSTANT"},
+        {"name": "Cold", "extremeValue": 17, "referenceValue": 10, "shapeIn": "CONSTANT", "shapeOut": "GAUSSIAN"},
+        {"name": "Wet", "extremeValue": 60, "referenceValue": 100, "shapeIn": "GAUSSIAN", "shapeOut": "CONSTANT", "plateauMin": 90},
+        ...
+    ],
+    "inputs": [{"name": "temperature", "value": 20, "unit": "°C"}, {"name": "humidity", "unit": "%"}],
+    "outputs": [{"name": "power", "unit": "%"}, {"name": "fan", "unit": "%"}],
+    "rules": [
+        {"if": ["IS", "temperature", "Hot"], "then": ["power", "Refresh"]},
+        {"if": ["AND", ["IS", "temperature", "Hot"], ["IS", "humidity", "Wet"]], "then": ["power", "Refresh", "More"]},
+        {"if": ["IS", "temperature", "Warm"], "then": [["power", "Refresh", "Not"], ["power", "Heat", "Not"]]},
+        {"if": ["IS", "temperature", "Cold"], "then": ["fan", 20, {"temperature": -0.5}]}
+    ]
+}
+The algorithms, shapes and quantifiers are given by their names, which are case insensitive.
+A test is ["IS", input, set] or ["IS_NOT", input, set], with an optional quantifier as a fourth item.
+An operator is [operator, operand, operand...] with any operator of {@link FuzzyExpression};
+more than two operands are combined from left to right, and WEIGHTED takes the weight as last item: ["WEIGHTED", a, b, 0.5].
+A consequent is [output, set] with an optional quantifier; "then" can also be a list of consequents.
+The consequent of a function rule (see {@link FuzzyRuleBase.addFunctionRule}) is [output, constant],
+with optional coefficients of the inputs by name: [output, constant, {input: coefficient...}].
+"""
+
+# The version of the cache files; change it when the pickled classes change
+_CACHE_VERSION = b"5"
+
+_ALGORITHMS = {"linear": FuzzyLogicAlgorithm.LINEAR, "hyperbolic": FuzzyLogicAlgorithm.HYPERBOLIC}
+
+_CRISP_ALGORITHMS = {name.lower(): getattr(FuzzyCrispAlgorithm, name)
+                     for name in vars(FuzzyCrispAlgorithm) if name.isupper()}
+
+_SHAPES = {}
+for _name in vars(FuzzyShape):
+    if _name.isupper():
+        _SHAPES[_name.lower()] = getattr(FuzzyShape, _name)
+        _SHAPES[getattr(FuzzyShape, _name)] = getattr(FuzzyShape, _name)
+
+_OPERATORS = ("NEGATE", "AND", "OR", "XOR", "IS_NOT", "DIFFERENT", "NXR", "IS", "EQUALS", "IMPLIES", "WITH", "HAS",
+              "DOES_NOT_IMPLY", "WITHOUT", "DOES_NOT_HAVE", "AND_NOT", "NAND", "NOT_BOTH", "NOR", "NONE", "WEIGHTED")
+
+
+def _error(path, message):
+    return ValueError("Invalid rule base, " + path + ": " + message)
+
+
+def _enum(values, value, path, default):
+    if value is None:
+        return default
+    if isinstance(value, str):
+        if value.lower() not in values:
+            raise _error(path, "unknown value " + repr(value))
+        return values[value.lower()]
+    if value not in values.values():
+        raise _error(path, "unknown value " + repr(value))
+    return value
+
+
+def _number(item, key, path, default=None, required=False):
+    value = item.get(key, default)
+    if value is None:
+        if required:
+            raise _error(path, "missing " + repr(key))
+        return None
+    if not _isNumber(value):
+        raise _error(path + "." + key, "not a number: " + repr(value))
+    return value
+
+
+def _isNumber(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _quantifier(value, path):
+    if value is None:
+        return FuzzyQuantifier.NONE
+    quantifier = toQuantifier(value)
+    if type(quantifier) is not _Quantifier:
+        raise _error(path, "unknown quantifier " + repr(value))
+    return quantifier
+
+
+def _list(document, key, path):
+    items = document.get(key, [])
+    if not isinstance(items, list):
+        raise _error(path + key, "not a list")
+    for i in range(0, len(items)):
+        if not isinstance(items[i], dict):
+            raise _error(path + key + "[" + str(i) + "]", "not an object")
+    return items
+
+
+def parseRuleBase(document, algorithm=FuzzyLogicAlgorithm.LINEAR, crispAlgorithm=FuzzyCrispAlgorithm.CENTROID):
+    """
+    low-level undocumented method
+    validates a rule base declared as a dict (a parsed JSON or TOML document), and creates it
+    raises a ValueError explaining the first error found
+    """
+    if not isinstance(document, dict):
+        raise _error("document", "not an object")
+
+    algorithm = _enum(_ALGORITHMS, document.get("algorithm"), "algorithm", algorithm)
+    crispAlgorithm = _enum(_CRISP_ALGORITHMS, document.get("crispAlgorithm"), "crispAlgorithm", crispAlgorithm)
+    ruleBase = FuzzyRuleBase(algorithm, crispAlgorithm)
+
+    sets = {}
+    items = _list(document, "sets", "")
+    for i in range(0, len(items)):
+        item = items[i]
+        path = "sets[" + str(i) + "]"
+        name = item.get("name")
+        if not isinstance(name, str):
+            raise _error(path, "missing name")
+        if name in sets:
+            raise _error(path, "duplicate set " + repr(name))
+        shapeIn = _enum(_SHAPES, item.get("shapeIn"), path + ".shapeIn", FuzzyShape.LINEAR)
+        shapeOut = _enum(_SHAPES, item.get("shapeOut"), path + ".shapeOut", shapeIn)
+        sets[name] = FuzzySet(name,
+                              _number(item, "extremeValue", path, required=True),
+                              _number(item, "referenceValue", path, required=True),
+                              shapeIn, shapeOut,
+                              _number(item, "plateauMin", path),
+                              _number(item, "plateauMax", path),
+                              algorithm)
+
+    inputs = {}
+    items = _list(document, "inputs", "")
+    for i in range(0, len(items)):
+        item = items[i]
+        path = "inputs[" + str(i) + "]"
+        name = item.get("name")
+        if not isinstance(name, str):
+            raise _error(path, "missing name")
+        if name in inputs:
+            raise _error(path, "duplicate input " + repr(name))
+        inputs[name] = ruleBase.newInput(name, _number(item, "value", path, 0), str(item.get("unit", "")))
+
+    outputs = {}
+    items = _list(document, "outputs", "")
+    for i in range(0, len(items)):
+        item = items[i]
+        path = "outputs[" + str(i) + "]"
+        name = item.get("name")
+        if not isinstance(name, str):
+            raise _error(path, "missing name")
+        if name in outputs:
+            raise _error(path, "duplicate output " + repr(name))
+        outputs[name] = ruleBase.newOutput(name, _number(item, "value", path, 0), str(item.get("unit", "")))
+
+    def getSet(name, path):
+        if not isinstance(name, str) or name not in sets:
+            raise _error(path, "unknown set " + repr(name))
+        return sets[name]
+
+    def parseExpression(item, path):
+        if not isinstance(item, list) or len(item) < 2 or not isinstance(item[0], str):
+            raise _error(path, "an expression must be a list starting with an operator")
+        operator = item[0].upper()
+
+        # A test on an input
+        if (operator == "IS" or operator == "IS_NOT") and isinstance(item[1], str):
+            if len(item) < 3 or len(item) > 4:
+                raise _error(path, "a test must be [\"" + operator + "\", input, set, quantifier]")
+            if item[1] not in inputs:
+                raise _error(path, "unknown input " + repr(item[1]))
+            quantifier = _quantifier(item[3] if len(item) > 3 else None, path)
+            test = inputs[item[1]].IS(getSet(item[2], path), quantifier)
+            if operator == "IS_NOT":
+                return test.NEGATE()
+            return test
+
+        if operator not in _OPERATORS:
+            raise _error(path, "unknown operator " + repr(item[0]))
+
+        operands = item[1:]
+        weight = None
+        if operator == "WEIGHTED":
+            if len(operands) != 3:
+                raise _error(path, "WEIGHTED must be [\"WEIGHTED\", expression, expression, weight]")
+            weight = operands[2]
+            if not _isNumber(weight):
+                raise _error(path, "the weight is not a number: " + repr(weight))
+            operands = operands[:2]
+        if operator == "NEGATE":
+            if len(operands) != 1:
+                raise _error(path, "NEGATE takes a single operand")
+            return parseExpression(operands[0], path + "[1]").NEGATE()
+        if len(operands) < 2:
+            raise _error(path, operator + " takes at least two operands")
+
+        expression = parseExpression(operands[0], path + "[1]")
+        for j in range(1, len(operands)):
+            other = parseExpression(operands[j], path + "[" + str(j + 1) + "]")
+            if weight is not None:
+                expression = expression.WEIGHTED(other, weight)
+            else:
+                expression = getattr(FuzzyExpression, operator)(expression, other)
+        return expression
+
+    rules = _list(document, "rules", "")
+    for i in range(0, len(rules)):
+        path = "rules[" + str(i) + "]"
+        antecedent = parseExpression(rules[i].get("if"), path + ".if")
+        consequents = rules[i].get("then")
+        if isinstance(consequents, list) and len(consequents) > 0 and not isinstance(consequents[0], list):
+            consequents = [consequents]
+        if not isinstance(consequents, list) or len(consequents) == 0:
+            raise _error(path + ".then", "missing consequent")
+        for j in range(0, len(consequents)):
+            consequent = consequents[j]
+            consequentPath = path + ".then[" + str(j) + "]"
+            if not isinstance(consequent, list) or len(consequent) < 2 or len(consequent) > 3:
+                raise _error(consequentPath, "a consequent must be [output, set, quantifier]")
+            if not isinstance(consequent[0], str) or consequent[0] not in outputs:
+                raise _error(consequentPath, "unknown output " + repr(consequent[0]))
+            if _isNumber(consequent[1]):
+                coefficients = consequent[2] if len(consequent) > 2 else {}
+                if not isinstance(coefficients, dict):
+                    raise _error(consequentPath + "[2]", "the coefficients must be an object")
+                for name in coefficients:
+                    if name not in inputs:
+                        raise _error(consequentPath + "[2]", "unknown input " + repr(name))
+                    if not _isNumber(coefficients[name]):
+                        raise _error(consequentPath + "[2]." + name, "not a number: " + repr(coefficients[name]))
+                ruleBase.addFunctionRule(antecedent, outputs[consequent[0]], consequent[1], coefficients)
+                continue
+            quantifier = _quantifier(consequent[2] if len(consequent) > 2 else None, consequentPath)
+            ruleBase.addRule(antecedent, outputs[consequent[0]], getSet(consequent[1], consequentPath), quantifier)
+
+    return ruleBase.compile()
+
+
+def loadRuleBase(path, cacheDirectory=None, algorithm=FuzzyLogicAlgorithm.LINEAR,
+                 crispAlgorithm=FuzzyCrispAlgorithm.CENTROID):
+    """
+    low-level undocumented method
+    loads a rule base from a JSON or TOML (.toml) file, see {@link FuzzyLogic.loadRuleBase}
+    """
+    with open(path, "rb") as f:
+        content = f.read()
+
+    cachePath = None
+    if cacheDirectory is not None:
+        key = hashlib.sha256(content)
+        key.update(b"\0" + _CACHE_VERSION + b"\0" + repr((algorithm, crispAlgorithm)).encode())
+        cachePath = os.path.join(cacheDirectory, key.hexdigest() + ".fzc")
+        try:
+            with open(cachePath, "rb") as f:
+                data = f.read()
+            # unpickling creates many objects, none of them garbage: collecting meanwhile would only slow it down
+            collecting = gc.isenabled()
+            gc.disable()
+            try:
+                ruleBase = pickle.loads(data)
+            finally:
+                if collecting:
+                    gc.enable()
+            # the plan is linked from its pickled layout, without compiling the rules again
+            if isinstance(ruleBase, FuzzyRuleBase) and ruleBase._plan is not None:
+                return ruleBase
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, IndexError,
+                ValueError, TypeError, KeyError):
+            # no cache yet, or an invalid one, e.g. written by another version of the classes
+            pass
+
+    if str(path).lower().endswith(".toml"):
+        import tomllib
+        document = tomllib.loads(content.decode("utf-8"))
+    else:
+        document = json.loads(content.decode("utf-8"))
+    ruleBase = parseRuleBase(document, algorithm, crispAlgorithm)
+
+    if cachePath is not None:
+        os.makedirs(cacheDirectory, exist_ok=True)
+        # write to a temporary file first so that other processes never read a partial cache
+        temporaryPath = cachePath + "." + str(os.getpid()) + ".tmp"
+        with open(temporaryPath, "wb") as f:
+            pickle.dump(ruleBase, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(temporaryPath, cachePath)
+
+    return ruleBase
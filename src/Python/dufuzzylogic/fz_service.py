@@ -0,0 +1,124 @@
+import asyncio
+
+# ========== FUZZY SERVICE ==========
+
+
+class FuzzyService:
+
+    def __init__(self, ruleBase, maxBatchSize=256, maxWait=0.002, executor=None):
+        """
+        Do not use the constructor of this class, use {@link FuzzyRuleBase.newService} to create a new service.
+        @class
+        @classdesc An asyncio front end for a {@link FuzzyRuleBase}.
+        The inputs of concurrent calls to {@link FuzzyService.infer} are collected in micro-batches,
+        each batch being evaluated at once with {@link FuzzyRuleBase.evaluateBatch}.
+        A batch is evaluated when it reaches <code>maxBatchSize</code> inputs, or <code>maxWait</code> seconds after its first input.
+        When a batch fails, its inputs are evaluated one by one, so that only the calls with bad inputs raise the exception.
+        @example
+        service = rules.newService(maxBatchSize=128, maxWait=0.001)
+        async def handle(request):
+            result = await service.infer({"temperature": 22, "humidity": 50})
+            return result["power"]
+        :param ruleBase: {FuzzyRuleBase} The rule base.
+        :param maxBatchSize: {Number} [maxBatchSize=256] The maximum number of inputs evaluated at once.
+        :param maxWait: {Number} [maxWait=0.002] The maximum time, in seconds, an input waits for its batch to be evaluated.
+        :param executor: {concurrent.futures.Executor} [executor] An executor to evaluate the batches, so that they don't block the event loop.
+        By default, the batches are evaluated in the event loop.
+        @property {FuzzyRuleBase} ruleBase The rule base.
+        """
+        self.ruleBase = ruleBase
+        self.maxBatchSize = max(int(maxBatchSize), 1)
+        self.maxWait = maxWait
+        self.executor = executor
+        self._pending = []
+        self._timer = None
+
+    async def infer(self, inputs):
+        """
+        Evaluates the rules, in the next batch.
+        :param inputs: {dict} The crisp values of the inputs, by name, like in {@link FuzzyRuleBase.evaluate}.
+        :return: {dict} The crisp values of the outputs, by name.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((inputs, future))
+
+        if len(self._pending) >= self.maxBatchSize:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.maxWait, self.flush)
+
+        return await future
+
+    def flush(self):
+        """
+        Evaluates the pending inputs now, without waiting for the batch to be full.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if len(self._pending) == 0:
+            return
+
+        batch = self._pending[:self.maxBatchSize]
+        del self._pending[:self.maxBatchSize]
+        if len(self._pending) > 0:
+            # start the next batch
+            self._timer = asyncio.get_running_loop().call_later(self.maxWait, self.flush)
+
+        rows = [inputs for inputs, future in batch]
+        futures = [future for inputs, future in batch]
+
+        if self.executor is None:
+            _settle(futures, _evaluate(self.ruleBase, rows))
+            return
+
+        evaluation = asyncio.get_running_loop().run_in_executor(self.executor, _evaluate, self.ruleBase, rows)
+        evaluation.add_done_callback(lambda done: _settleLater(futures, done))
+
+
+def _evaluate(ruleBase, rows):
+    """
+    low-level undocumented method
+    evaluates the rows as a batch, and returns the result or the exception of each row;
+    when the batch fails, the rows are evaluated one by one, so that a bad row only fails its own call
+    """
+    try:
+        return [(result, None) for result in ruleBase._evaluateRows(rows)]
+    except Exception as error:
+        if len(rows) == 1:
+            return [(None, error)]
+    outcomes = []
+    for row in rows:
+        try:
+            outcomes.append((ruleBase._evaluateRows([row])[0], None))
+        except Exception as error:
+            outcomes.append((None, error))
+    return outcomes
+
+
+def _settle(futures, outcomes):
+    for future, (result, error) in zip(futures, outcomes):
+        # the caller may have been cancelled
+        if future.done():
+            continue
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+
+def _reject(futures, error):
+    for future in futures:
+        if not future.done():
+            future.set_exception(error)
+
+
+def _settleLater(futures, evaluation):
+    if evaluation.cancelled():
+        for future in futures:
+            future.cancel()
+    elif evaluation.exception() is not None:
+        _reject(futures, evaluation.exception())
+    else:
+        _settle(futures, evaluation.result())
@@ -2,15 +2,25 @@ from .fz_value import FuzzyValue
 from .fz_quantifier import quantify
 from .fz_veracity import FuzzyVeracity
 from .fz_math import logistic, inverseLogistic, gaussian, reversedGaussian, inverseGaussian, inverseReversedGaussian, mean
+# the functions of numbers only, for the membership and crisp functions
+from .fz_math import _logistic, _inverseLogistic, _gaussian, _reversedGaussian, _inverseGaussian, _inverseReversedGaussian
 from .fz_shape import FuzzyShape
 from .fz_logicalgorithm import FuzzyLogicAlgorithm
-from .fz_quantifier import FuzzyQuantifier
+from .fz_crispalgorithm import FuzzyCrispAlgorithm
+from .fz_quantifier import FuzzyQuantifier, hedge, nearestQuantifier
+from .fz_settable import mappedTable
+from array import array
+from collections import OrderedDict
 import math
 
 
 # =========== FUZZY SETS ============
 
 class FuzzySet:
+    __slots__ = ("name", "minimum", "maximum", "shapeIn", "shapeOut", "plateauMin", "plateauMax", "algorithm",
+                 "table", "tableError", "_interpolate", "_source", "_crispFunctions",
+                 "cacheSize", "cacheHits", "cacheMisses", "_containsCache", "_valuesCache")
+
     def __init__(self, name, valueNot, valueIS, shapeIn=None, shapeOut=None, plateauMin=None,
                  plateauMax=None, algorithm=None):
         """"
@@ -27,6 +37,11 @@ class FuzzySet:
         :param plateauMax: {Number} The value under which a value is considered completely included.
         :param algorithm:
         :return:
+        @property {array} table The membership function sampled by {@link FuzzySet.tabulate}, or None if the set is not tabulated.
+        @property {Number} tableError The maximum interpolation error of the table against the exact membership function.
+        @property {int} cacheSize The maximum number of results kept by the cache of {@link FuzzySet.enableCache}, 0 if the cache is disabled.
+        @property {int} cacheHits The number of results found in the cache.
+        @property {int} cacheMisses The number of results computed and added to the cache.
         """
         if shapeIn is None:
             shapeIn = FuzzyShape.LINEAR
@@ -52,6 +67,90 @@ class FuzzySet:
         self.plateauMin = plateauMin
         self.plateauMax = plateauMax
         self.algorithm = algorithm
+        self.table = None
+        self.tableError = 0
+        self._interpolate = None
+        # the file, index and digest of the file of the table, when it is mapped from a file written by FuzzyLogic.saveSets
+        self._source = None
+        # the crisp functions already built, by crispification algorithm, with the parameters they were built for
+        self._crispFunctions = {}
+        self.cacheSize = 0
+        self.cacheHits = 0
+        self.cacheMisses = 0
+        self._containsCache = None
+        self._valuesCache = None
+
+    def __getstate__(self):
+        # the interpolation and crisp functions can't be pickled, they are built again when needed;
+        # the cache is not copied either, it is created again empty
+        state = {name: getattr(self, name) for name in FuzzySet.__slots__
+                 if name not in ("_interpolate", "_crispFunctions", "_containsCache", "_valuesCache")}
+        if self._source is not None:
+            # the table is mapped again from the file instead of being copied
+            state["table"] = None
+        return state
+
+    def __setstate__(self, state):
+        for name in FuzzySet.__slots__:
+            setattr(self, name, state.get(name))
+        if self._source is not None and self.table is None:
+            self.table = mappedTable(*self._source)
+        if self.table is not None:
+            self._interpolate = self._interpolation(self.table)
+        self._crispFunctions = {}
+        # the states saved by FuzzyLogic.saveSets have no cache
+        if self.cacheSize:
+            self.enableCache(self.cacheSize)
+        else:
+            self.disableCache()
+
+    def enableCache(self, size=1024):
+        """
+        Keeps the latest results of {@link FuzzySet.contains} and {@link FuzzySet.getValues}, to return them again
+        without computing them when they're called with the same arguments.
+        This is useful when the values are quantized (e.g. integer channels of a color, whole degrees...).
+        The least recently used results are dropped when there are more than <code>size</code> of them.
+        Only use this with sets which won't change anymore, or call {@link FuzzySet.clearCache} when they change.
+        :param size: {int} [size=1024] The maximum number of results kept, for each method.
+        """
+        self.cacheSize = max(int(size), 1)
+        self.cacheHits = 0
+        self.cacheMisses = 0
+        self._containsCache = OrderedDict()
+        self._valuesCache = OrderedDict()
+
+    def disableCache(self):
+        """
+        Disables the cache of {@link FuzzySet.enableCache}.
+        """
+        self.cacheSize = 0
+        self.cacheHits = 0
+        self.cacheMisses = 0
+        self._containsCache = None
+        self._valuesCache = None
+
+    def clearCache(self):
+        """
+        Drops all the results kept by the cache of {@link FuzzySet.enableCache}, and the functions built by {@link FuzzySet.crispFunction}.
+        """
+        self._crispFunctions = {}
+        if self._containsCache is not None:
+            self._containsCache.clear()
+            self._valuesCache.clear()
+
+    def _cache(self, cache, key, result):
+        """
+        low-level undocumented method
+        adds a result to a cache, and drops the least recently used one if the cache is full
+        """
+        self.cacheMisses += 1
+        cache[key] = result
+        if len(cache) > self.cacheSize:
+            try:
+                cache.popitem(False)
+            except KeyError:
+                # another thread emptied the cache
+                pass
 
     def contains(self, value, quantifier=FuzzyQuantifier.NONE):
         """
@@ -63,6 +162,31 @@ class FuzzySet:
         if isinstance(value, FuzzyValue):
             value = value.crispify(False)
 
+        cache = self._containsCache
+        if cache is None:
+            return self._contains(value, quantifier)
+
+        # the cache keeps the veracity numbers: each call gets its own FuzzyVeracity, which can be changed safely
+        key = (value, quantifier)
+        # pop and insert again to mark it as the most recently used;
+        # unlike move_to_end, this can't raise an error if another thread drops the key
+        veracity = cache.pop(key, None)
+        if veracity is None:
+            veracity = self._contains(value, quantifier).veracity
+            self._cache(cache, key, veracity)
+        else:
+            cache[key] = veracity
+            self.cacheHits += 1
+        return FuzzyVeracity(veracity, self.algorithm)
+
+    def _contains(self, value, quantifier):
+        """
+        low-level undocumented method
+        computes the veracity of the inclusion of a number in the set
+        """
+        if self.table is not None:
+            return quantify(quantifier, self._interpolate(value), self.algorithm)
+
         if value >= self.plateauMin and value <= self.plateauMax:
             return quantify(quantifier, 1, self.algorithm)
 
@@ -134,15 +258,226 @@ class FuzzySet:
             else:
                 return quantify(quantifier, 0, self.algorithm)
 
+    def containsMany(self, values, quantifier=FuzzyQuantifier.NONE):
+        """
+        Checks if a list of values are contained in the set.
+        This is the batch version of {@link FuzzySet.contains}: the shape of the set is resolved only once,
+        and no {@link FuzzyVeracity} is created.
+        :param values: {Number[]} The values to test. Any iterable of numbers (list, array, buffer, NumPy array...).
+        :param quantifier: {FuzzyQuantifier|Number} [quantifier=FuzzyQuantifier.NONE] Checks in which part of the set the values are in.
+        :return: {array} The veracities, as an array of doubles, in the same order as the values.
+        """
+        membership = self.membershipFunction()
+        h = hedge(quantifier)
+        if h is None:
+            return array('d', map(membership, values))
+        return array('d', [h(membership(value)) for value in values])
+
+    def tabulate(self, resolution=256):
+        """
+        Samples the membership function once over [minimum, maximum], then {@link FuzzySet.contains} interpolates in this table
+        instead of computing the shape of the set. Only use this with sets which won't change anymore.
+        Values outside of [minimum, maximum] are still computed with the exact function.
+        :param resolution: {Number} [resolution=256] The number of samples in the table.
+        :return: {Number} The maximum interpolation error against the exact membership function, also stored in <code>tableError</code>.
+        """
+        exact = self.membershipFunction(True)
+        minimum = self.minimum
+        maximum = self.maximum
+        last = max(int(resolution), 2) - 1
+        step = (maximum - minimum) / last
+        if step == 0:
+            self.untabulate()
+            return 0
+
+        table = array('d', [exact(minimum + step * i) for i in range(0, last)])
+        table.append(exact(maximum))
+        interpolate = self._interpolation(table)
+
+        # measure the error between the samples, and on both sides of the edges of the shapes
+        tests = [minimum + step * (i + j / 8) for i in range(0, last) for j in range(1, 8)]
+        for edge in (self.plateauMin, self.plateauMax, mean([self.plateauMin, minimum]), mean([self.plateauMax, maximum])):
+            tests.extend((math.nextafter(edge, minimum), edge, math.nextafter(edge, maximum)))
+        error = 0
+        for value in tests:
+            if minimum <= value <= maximum:
+                error = max(error, math.fabs(interpolate(value) - exact(value)))
+
+        self.table = table
+        self.tableError = error
+        self._interpolate = interpolate
+        self._source = None
+        self.clearCache()
+        return error
+
+    def _interpolation(self, table):
+        """
+        Builds the function interpolating in a table of samples of the membership function over [minimum, maximum].
+        """
+        exact = self.membershipFunction(True)
+        minimum = self.minimum
+        maximum = self.maximum
+        last = len(table) - 1
+        scale = last / (maximum - minimum)
+
+        def interpolate(value):
+            x = (value - minimum) * scale
+            if 0 <= x < last:
+                i = int(x)
+                a = table[i]
+                return a + (table[i + 1] - a) * (x - i)
+            if value == maximum:
+                return table[last]
+            return exact(value)
+
+        return interpolate
+
+    def untabulate(self):
+        """
+        Goes back to computing the exact membership function, after a call to {@link FuzzySet.tabulate}.
+        """
+        self.table = None
+        self.tableError = 0
+        self._interpolate = None
+        self._source = None
+        self.clearCache()
+
+    def membershipFunction(self, exact=False):
+        """
+        low-level method
+        Builds the membership function of the set, without any quantifier.
+        The shapes of the set are resolved when building the function, not when calling it.
+        The function must be built again if the set is changed.
+        :param exact: {bool} [exact=False] Ignore the table built by {@link FuzzySet.tabulate}.
+        :return: {function} A function taking a Number and returning its (unquantified) veracity as a Number.
+        """
+        if self._interpolate is not None and not exact:
+            return self._interpolate
+
+        minimum = self.minimum
+        maximum = self.maximum
+        plateauMin = self.plateauMin
+        plateauMax = self.plateauMax
+
+        # below
+
+        if self.shapeIn == FuzzyShape.CONSTANT:
+            def below(value):
+                return 1
+
+        elif self.shapeIn == FuzzyShape.SQUARE:
+            squareMin = mean([plateauMin, minimum])
+
+            def below(value):
+                return 1 if value >= squareMin else 0
+
+        elif self.shapeIn == FuzzyShape.LINEAR:
+            def below(value):
+                if value < minimum:
+                    return 0
+                return (value - minimum) / (plateauMin - minimum)
+
+        elif self.shapeIn == FuzzyShape.SIGMOID:
+            inMid = (plateauMin + minimum) / 2
+            inRate = 6 / (plateauMin - minimum)
+
+            def below(value):
+                return _logistic(value, inMid, 0, 1, inRate)
+
+        elif self.shapeIn == FuzzyShape.GAUSSIAN:
+            inWidth = plateauMin - minimum
+
+            def below(value):
+                return _gaussian(value, 0, 1, plateauMin, inWidth)
+
+        elif self.shapeIn == FuzzyShape.REVERSED_GAUSSIAN:
+            inWidth = plateauMin - minimum
+
+            def below(value):
+                return _reversedGaussian(value, 0, 1, plateauMin, inWidth)
+
+        else:
+            def below(value):
+                return 0
+
+        # above
+
+        if self.shapeOut == FuzzyShape.CONSTANT:
+            def above(value):
+                return 1
+
+        elif self.shapeOut == FuzzyShape.SQUARE:
+            squareMax = mean([plateauMax, maximum])
+
+            def above(value):
+                return 1 if value <= squareMax else 0
+
+        elif self.shapeOut == FuzzyShape.LINEAR:
+            def above(value):
+                if value > maximum:
+                    return 0
+                return 1 - ((value - plateauMax) / (maximum - plateauMax))
+
+        elif self.shapeOut == FuzzyShape.SIGMOID:
+            outMid = (plateauMax + maximum) / 2
+            outRate = 6 / (maximum - plateauMax)
+
+            def above(value):
+                return 1 - _logistic(value, outMid, 0, 1, outRate)
+
+        elif self.shapeOut == FuzzyShape.GAUSSIAN:
+            outWidth = maximum - plateauMax
+
+            def above(value):
+                return _gaussian(value, 0, 1, plateauMax, outWidth)
+
+        elif self.shapeOut == FuzzyShape.REVERSED_GAUSSIAN:
+            outWidth = maximum - plateauMax
+
+            def above(value):
+                return _reversedGaussian(value, 0, 1, plateauMax, outWidth)
+
+        else:
+            def above(value):
+                return 0
+
+        def membership(value):
+            if plateauMin <= value <= plateauMax:
+                return 1
+            if value < plateauMin:
+                return below(value)
+            return above(value)
+
+        return membership
+
     def getValues(self, veracity=0.5):
         """
         Gets a list of precise values from the set corresponding to the given veracity.
         :param veracity: {FuzzyVeracity|Number} [veracity=0.5] The veracity
         :return: {Number[]} The list of possible crisp values, ordered from minimum to maximum.
+        When the cache is enabled (see {@link FuzzySet.enableCache}), it is a tuple, as it is shared by all the calls with the same veracity.
         """
         if isinstance(veracity, FuzzyVeracity):
             veracity = veracity.veracity
 
+        cache = self._valuesCache
+        if cache is None:
+            return self._getValues(veracity)
+
+        values = cache.pop(veracity, None)
+        if values is None:
+            values = tuple(self._getValues(veracity))
+            self._cache(cache, veracity, values)
+        else:
+            cache[veracity] = values
+            self.cacheHits += 1
+        return values
+
+    def _getValues(self, veracity):
+        """
+        low-level undocumented method
+        computes the list of crisp values of the set for a veracity number
+        """
         defaultValue = mean([self.plateauMin, self.plateauMax])
 
         if self.shapeIn == FuzzyShape.CONSTANT and self.shapeOut == FuzzyShape.CONSTANT:
@@ -209,6 +544,174 @@ class FuzzySet:
 
         return sorted(crisp)
 
+    def crispFunction(self, crispAlgorithm=FuzzyCrispAlgorithm.CENTROID):
+        """
+        low-level method
+        Builds the function returning the crisp value of the set used by a crispification algorithm for a given veracity:
+        the mean, the lowest or the highest of the values returned by {@link FuzzySet.getValues}.
+        The values are computed in closed form, without building nor sorting the list.
+        The function is built once for each algorithm, and built again when the set is changed.
+        :param crispAlgorithm: {FuzzyCrispAlgorithm} [crispAlgorithm=FuzzyCrispAlgorithm.CENTROID] The crispification algorithm.
+        :return: {function} A function taking a veracity Number and returning a crisp Number.
+        """
+        parameters = (self.name, self.minimum, self.maximum, self.shapeIn, self.shapeOut, self.plateauMin, self.plateauMax)
+        cached = self._crispFunctions.get(crispAlgorithm)
+        if cached is not None and cached[0] == parameters:
+            return cached[1]
+        function = self._crispFunction(crispAlgorithm)
+        self._crispFunctions[crispAlgorithm] = (parameters, function)
+        return function
+
+    def _crispFunction(self, crispAlgorithm):
+        """
+        low-level undocumented method
+        builds the function of crispFunction
+        """
+        if crispAlgorithm in (FuzzyCrispAlgorithm.CENTROID, FuzzyCrispAlgorithm.MEAN):
+            pick = 0
+        elif crispAlgorithm in (FuzzyCrispAlgorithm.CENTROID_LOWER, FuzzyCrispAlgorithm.MEAN_LOWER):
+            pick = -1
+        elif crispAlgorithm in (FuzzyCrispAlgorithm.CENTROID_HIGHER, FuzzyCrispAlgorithm.MEAN_HIGHER):
+            pick = 1
+        else:
+            # not implemented yet
+            return lambda veracity: 0
+
+        name = self.name
+        minimum = self.minimum
+        maximum = self.maximum
+        plateauMin = self.plateauMin
+        plateauMax = self.plateauMax
+        defaultValue = mean([plateauMin, plateauMax])
+
+        if self.shapeIn == FuzzyShape.CONSTANT and self.shapeOut == FuzzyShape.CONSTANT:
+            values = [minimum, plateauMin, defaultValue, plateauMax, maximum]
+            if pick == 0:
+                constant = mean(values)
+            elif pick < 0:
+                constant = values[0]
+            else:
+                constant = values[len(values) - 1]
+            return lambda veracity: constant
+
+        # below
+
+        if self.shapeIn == FuzzyShape.CONSTANT:
+            def below(veracity):
+                return minimum if veracity == 1 else None
+
+        elif self.shapeIn == FuzzyShape.SQUARE:
+            def below(veracity):
+                return plateauMin if veracity >= 0.5 else minimum
+
+        elif self.shapeIn == FuzzyShape.LINEAR:
+            minRange = plateauMin - minimum
+
+            def below(veracity):
+                return minimum + minRange * veracity
+
+        elif self.shapeIn == FuzzyShape.SIGMOID:
+            inMid = (plateauMin + minimum) / 2
+
+            def below(veracity):
+                return _inverseLogistic(veracity, inMid)
+
+        elif self.shapeIn == FuzzyShape.GAUSSIAN:
+            inWidth = plateauMin - minimum
+
+            def below(veracity):
+                return _inverseGaussian(veracity, 0, 1, plateauMin, inWidth)[0]
+
+        elif self.shapeIn == FuzzyShape.REVERSED_GAUSSIAN:
+            inWidth = plateauMin - minimum
+
+            def below(veracity):
+                return _inverseReversedGaussian(veracity, 0, 1, plateauMin, inWidth)[0]
+
+        else:
+            def below(veracity):
+                return None
+
+        # above
+
+        if self.shapeOut == FuzzyShape.CONSTANT:
+            def above(veracity):
+                return maximum if veracity == 1 else None
+
+        elif self.shapeOut == FuzzyShape.SQUARE:
+            def above(veracity):
+                return plateauMax if veracity >= 0.5 else maximum
+
+        elif self.shapeOut == FuzzyShape.LINEAR:
+            maxRange = maximum - plateauMax
+
+            def above(veracity):
+                return maximum + 1 - (maxRange * veracity)
+
+        elif self.shapeOut == FuzzyShape.SIGMOID:
+            outMid = (plateauMax + maximum) / 2
+
+            def above(veracity):
+                return _inverseLogistic(1 - veracity, outMid, 0, 1)
+
+        elif self.shapeOut == FuzzyShape.GAUSSIAN:
+            outWidth = maximum - plateauMax
+
+            def above(veracity):
+                return _inverseGaussian(1 - veracity, 0, 1, plateauMax, outWidth)[1]
+
+        elif self.shapeOut == FuzzyShape.REVERSED_GAUSSIAN:
+            outWidth = maximum - plateauMax
+
+            def above(veracity):
+                return _inverseReversedGaussian(1 - veracity, 0, 1, plateauMax, outWidth)[1]
+
+        else:
+            def above(veracity):
+                return None
+
+        def clamp(value):
+            if value > maximum:
+                value = maximum
+            if value < minimum:
+                value = minimum
+            return value
+
+        def crisp(veracity):
+            low = below(veracity)
+            high = above(veracity)
+
+            if veracity >= 1:
+                # rare case, with the plateau: use the list
+                values = [plateauMin, defaultValue, plateauMax]
+                if low is not None:
+                    values.append(low)
+                if high is not None:
+                    values.append(high)
+                values = sorted([clamp(value) for value in values])
+                if pick == 0:
+                    return mean(values)
+                if pick < 0:
+                    return values[0]
+                return values[len(values) - 1]
+
+            if low is None:
+                if high is None:
+                    raise ValueError("The set " + str(name) + " has no crisp value for the veracity " + str(veracity))
+                return clamp(high)
+            low = clamp(low)
+            if high is None:
+                return low
+            high = clamp(high)
+
+            if pick == 0:
+                return (low + high) / 2
+            if (pick < 0) == (low <= high):
+                return low
+            return high
+
+        return crisp
+
     def crispify(self, quantifier=FuzzyQuantifier.AVERAGE, veracity=None):
         """
         Gets a list of precise values from the set corresponding to the quantifier
@@ -250,19 +753,7 @@ class FuzzySet:
         if self.plateauMin <= val <= self.plateauMax:
             return FuzzyQuantifier.IS
 
-        quantifier = FuzzyQuantifier.IS_NOT        # Attention, c'était FuzzyQuantifier.NOT en js !?
-        veracity = self.contains(val).veracity
-
-        distance = 1
-        for i in FuzzyQuantifier.FuzzyQuantifierList:
-            q = FuzzyQuantifier.FuzzyQuantifierList[i]
-            test = math.fabs(quantify(q) - veracity)
-
-            if test < distance:
-                distance = test
-                quantifier = q
-
-        return quantifier
+        return nearestQuantifier(self.contains(val).veracity)
 
     def toString(self):
         """
@@ -0,0 +1,159 @@
+from array import array
+import hashlib
+import mmap
+import os
+import struct
+
+# ========== SET TABLES ==========
+
+"""
+low-level undocumented module
+reads and writes the parameters and the tables of sets (see {@link FuzzySet.tabulate}) in a single binary file,
+which is memory-mapped read-only: all the processes using the file share the same memory, and the tables are never copied.
+
+The file starts with a header, with the digest of the rest of the file, followed by a record for each set, then the names of the sets, then the tables (8 bytes aligned).
+All numbers are little-endian.
+"""
+
+_MAGIC = b"FZST"
+_VERSION = 2
+# magic, version, number of sets, digest of the rest of the file
+_HEADER = struct.Struct("<4sII16s")
+# minimum, maximum, plateauMin, plateauMax, tableError, shapeIn, shapeOut, algorithm, (padding),
+# name offset, name length, table offset, table length
+_RECORD = struct.Struct("<5d3i4x4q")
+
+_SHAPES = ["constant", "square", "linear", "sigmoid", "gaussian", "reversed_gaussian"]
+
+# The files mapped by this process, by absolute path, with the identity of the file which was mapped and the digest of its content
+_mappings = {}
+
+
+def _shapeCode(shape):
+    if shape is None:
+        return -1
+    return _SHAPES.index(shape)
+
+
+def _shape(code):
+    if code < 0:
+        return None
+    return _SHAPES[code]
+
+
+def writeSetTables(path, sets):
+    """
+    low-level undocumented method
+    writes the sets to a file; the file is replaced atomically, so that processes which already mapped it are not disturbed
+    """
+    names = [s.name.encode("utf-8") for s in sets]
+    tables = [s.table if s.table is not None else () for s in sets]
+
+    nameOffset = _HEADER.size + _RECORD.size * len(sets)
+    tableOffset = nameOffset + sum(len(name) for name in names)
+    tableOffset += -tableOffset % 8
+
+    records = []
+    for i in range(0, len(sets)):
+        s = sets[i]
+        records.append(_RECORD.pack(s.minimum, s.maximum, s.plateauMin, s.plateauMax, s.tableError,
+                                    _shapeCode(s.shapeIn), _shapeCode(s.shapeOut),
+                                    -1 if s.algorithm is None else s.algorithm,
+                                    nameOffset, len(names[i]), tableOffset, len(tables[i])))
+        nameOffset += len(names[i])
+        tableOffset += len(tables[i]) * 8
+
+    # the digest is computed while writing, so that the readers don't have to hash the whole file
+    digest = hashlib.blake2b(digest_size=16)
+
+    def write(data):
+        digest.update(data)
+        f.write(data)
+
+    temporaryPath = str(path) + "." + str(os.getpid()) + ".tmp"
+    with open(temporaryPath, "wb") as f:
+        f.write(b"\0" * _HEADER.size)
+        for record in records:
+            write(record)
+        for name in names:
+            write(name)
+        write(b"\0" * (-f.tell() % 8))
+        for table in tables:
+            values = array('d', table)
+            if struct.pack("=d", 1.0) != struct.pack("<d", 1.0):
+                values.byteswap()
+            write(values.tobytes())
+        f.seek(0)
+        f.write(_HEADER.pack(_MAGIC, _VERSION, len(sets), digest.digest()))
+    os.replace(temporaryPath, path)
+
+
+def _mapping(path):
+    path = os.path.abspath(path)
+    with open(path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        identity = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        cached = _mappings.get(path)
+        # the file may have been replaced since it was mapped
+        if cached is not None and cached[0] == identity:
+            return cached[1], cached[2]
+        mapping = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    if len(mapping) < _HEADER.size:
+        raise ValueError("Not a set table file: " + path)
+    magic, version, count, digest = _HEADER.unpack_from(mapping, 0)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("Not a set table file: " + path)
+    if struct.pack("=d", 1.0) != struct.pack("<d", 1.0):
+        raise ValueError("Set table files can only be mapped on little-endian systems")
+    # the digest, read from the header, tells the sets unpickled later whether the file is still the one their tables were read from
+    _mappings[path] = (identity, mapping, digest)
+    return mapping, digest
+
+
+def _record(mapping, index):
+    return _RECORD.unpack_from(mapping, _HEADER.size + _RECORD.size * index)
+
+
+def mappedTable(path, index, digest=None):
+    """
+    low-level undocumented method
+    gets the table of a set in a file, as a read-only view of doubles in the mapped file;
+    raises a ValueError if the digest of the file is not the given one, i.e. the file has been written again
+    """
+    mapping, fileDigest = _mapping(path)
+    if digest is not None and digest != fileDigest:
+        raise ValueError("The set table file has changed since the set was read from it: " + str(path))
+    record = _record(mapping, index)
+    offset = record[10]
+    length = record[11]
+    if length == 0:
+        return None
+    return mapping[offset:offset + length * 8].cast('d')
+
+
+def readSetTables(path):
+    """
+    low-level undocumented method
+    reads the sets of a file, as a list of the states of the sets (see FuzzySet.__setstate__)
+    """
+    path = os.path.abspath(path)
+    mapping, digest = _mapping(path)
+    count = _HEADER.unpack_from(mapping, 0)[2]
+    states = []
+    for i in range(0, count):
+        minimum, maximum, plateauMin, plateauMax, tableError, shapeIn, shapeOut, algorithm, \
+            nameOffset, nameLength, tableOffset, tableLength = _record(mapping, i)
+        states.append({
+            "name": bytes(mapping[nameOffset:nameOffset + nameLength]).decode("utf-8"),
+            "minimum": minimum,
+            "maximum": maximum,
+            "shapeIn": _shape(shapeIn),
+            "shapeOut": _shape(shapeOut),
+            "plateauMin": plateauMin,
+            "plateauMax": plateauMax,
+            "algorithm": None if algorithm < 0 else algorithm,
+            "table": None,
+            "tableError": tableError,
+            "_source": (path, i, digest) if tableLength > 0 else None
+        })
+    return states
@@ -0,0 +1,212 @@
+from itertools import product
+import random
+
+# ========== FUZZY SURFACE ==========
+
+
+class FuzzySurface:
+
+    def __init__(self, ruleBase, grid, validation=1000):
+        """
+        Do not use the constructor of this class, use {@link FuzzyRuleBase.bake} to create a new surface.
+        @class
+        @classdesc A response surface: the outputs of a {@link FuzzyRuleBase} evaluated once over a regular grid of values of its inputs,
+        then interpolated (multilinear interpolation) when queried. The cost of a query does not depend on the number of rules,
+        but only on the number of inputs of the grid.<br />
+        The inputs which are not in the grid keep their default value (see {@link FuzzyInput}), and are ignored by the queries.
+        The queries out of the grid are evaluated exactly by the rule base.
+        The surface must be baked again if the rules change.
+        @example
+        surface = rules.bake({"temperature": (-10, 40, 101), "humidity": (0, 100, 51)})
+        print(surface.error)
+        power = surface.function("power")
+        for t, h in readings:
+            setPower(power(t, h))
+        :param ruleBase: {FuzzyRuleBase} The rule base.
+        :param grid: {dict} The grid, as [minimum, maximum, resolution] for each input name, the resolution being the number of points on this axis.
+        :param validation: {int} [validation=1000] The number of random points where the interpolation is compared to the exact evaluation.
+        @property {FuzzyRuleBase} ruleBase The rule base.
+        @property {string[]} inputs The names of the inputs of the grid, in the order of the arguments of the functions returned by {@link FuzzySurface.function}.
+        @property {Number[]} minimums The lowest value of each input.
+        @property {Number[]} maximums The highest value of each input.
+        @property {int[]} resolutions The number of points of the grid for each input.
+        @property {dict} tables The crisp values of each output on the grid, by name, as arrays of doubles (the last input varying the fastest).
+        @property {dict} errors The maximum deviation of the interpolation from the exact evaluation on the validation points, by output name.
+        @property {Number} error The maximum of the errors.
+        """
+        names = set(fuzzyInput.name for fuzzyInput in ruleBase.inputs)
+        self.ruleBase = ruleBase
+        self.inputs = []
+        self.minimums = []
+        self.maximums = []
+        self.resolutions = []
+        for name in grid:
+            if name not in names:
+                raise KeyError("Unknown input: " + str(name))
+            minimum, maximum, resolution = grid[name]
+            resolution = int(resolution)
+            if not maximum > minimum or resolution < 2:
+                raise ValueError("Invalid grid for " + str(name) + ": the maximum must be above the minimum, with at least 2 points")
+            self.inputs.append(name)
+            self.minimums.append(minimum)
+            self.maximums.append(maximum)
+            self.resolutions.append(resolution)
+        if len(self.inputs) == 0:
+            raise ValueError("The grid needs at least one input")
+
+        # evaluate all the points of the grid at once
+        axes = []
+        for i in range(0, len(self.inputs)):
+            step = (self.maximums[i] - self.minimums[i]) / (self.resolutions[i] - 1)
+            axis = [self.minimums[i] + step * j for j in range(0, self.resolutions[i] - 1)]
+            axis.append(self.maximums[i])
+            axes.append(axis)
+        points = list(product(*axes))
+        columns = {self.inputs[i]: [point[i] for point in points] for i in range(0, len(self.inputs))}
+        self.tables = ruleBase.evaluateBatch(columns)
+        # the interpolating functions are built once, and used by evaluate and validate
+        self._functions = {name: self.function(name) for name in self.tables}
+
+        self.errors = {name: 0 for name in self.tables}
+        self.error = 0
+        if validation > 0:
+            self.validate(validation)
+
+    def __getstate__(self):
+        # the functions are closures, which can't be pickled; they are built again when unpickling
+        state = self.__dict__.copy()
+        del state["_functions"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._functions = {name: self.function(name) for name in self.tables}
+
+    def validate(self, count=1000, seed=0):
+        """
+        Compares the interpolation to the exact evaluation of the rule base, on random points of the grid,
+        and updates <code>errors</code> and <code>error</code>.
+        :param count: {int} [count=1000] The number of points.
+        :param seed: {int} [seed=0] The seed of the random points.
+        :return: {Number} The maximum deviation, for all the outputs.
+        """
+        generator = random.Random(seed)
+        points = [[generator.uniform(self.minimums[i], self.maximums[i]) for i in range(0, len(self.inputs))]
+                  for j in range(0, count)]
+        columns = {self.inputs[i]: [point[i] for point in points] for i in range(0, len(self.inputs))}
+        exact = self.ruleBase.evaluateBatch(columns)
+
+        for name in self.tables:
+            function = self._functions[name]
+            error = 0
+            expected = exact[name]
+            for j in range(0, count):
+                error = max(error, abs(function(*points[j]) - expected[j]))
+            self.errors[name] = error
+        self.error = max(self.errors.values()) if len(self.errors) > 0 else 0
+        return self.error
+
+    def evaluate(self, inputs):
+        """
+        Interpolates the outputs, like {@link FuzzyRuleBase.evaluate}.
+        :param inputs: {dict} The crisp values of the inputs of the grid, by name. Missing inputs use the value of their {@link FuzzyInput}.
+        :return: {dict} The crisp values of the outputs, by name.
+        """
+        values = []
+        for name in self.inputs:
+            if name in inputs:
+                values.append(inputs[name])
+            else:
+                values.append(self._default(name))
+        return {name: function(*values) for name, function in self._functions.items()}
+
+    def _default(self, name):
+        """
+        low-level undocumented method
+        the default value of an input
+        """
+        for fuzzyInput in self.ruleBase.inputs:
+            if fuzzyInput.name == name:
+                return fuzzyInput.value
+        raise KeyError("Unknown input: " + str(name))
+
+    def function(self, output):
+        """
+        low-level method
+        Builds the function interpolating an output. Build it once, and call it in the loops.
+        :param output: {string} The name of the output.
+        :return: {function} A function taking the values of the inputs, in the order of <code>inputs</code>, and returning the crisp value of the output.
+        """
+        table = self.tables[output]
+        ruleBase = self.ruleBase
+        names = self.inputs
+        minimums = self.minimums
+        maximums = self.maximums
+        lasts = [resolution - 1 for resolution in self.resolutions]
+        scales = [lasts[i] / (maximums[i] - minimums[i]) for i in range(0, len(names))]
+
+        def exact(values):
+            return ruleBase.evaluate(dict(zip(names, values)))[output]
+
+        if len(names) == 1:
+            minimum = minimums[0]
+            maximum = maximums[0]
+            scale = scales[0]
+            last = lasts[0]
+
+            def interpolate(value):
+                if not minimum <= value <= maximum:
+                    return exact((value,))
+                x = (value - minimum) * scale
+                i = int(x)
+                if i >= last:
+                    return table[last]
+                a = table[i]
+                return a + (table[i + 1] - a) * (x - i)
+
+            return interpolate
+
+        if len(names) == 2:
+            minimumX, minimumY = minimums
+            maximumX, maximumY = maximums
+            scaleX, scaleY = scales
+            lastX, lastY = lasts
+            stride = lastY + 1
+
+            def interpolate(x, y):
+                if not (minimumX <= x <= maximumX and minimumY <= y <= maximumY):
+                    return exact((x, y))
+                x = (x - minimumX) * scaleX
+                y = (y - minimumY) * scaleY
+                i = min(int(x), lastX - 1)
+                j = min(int(y), lastY - 1)
+                tx = x - i
+                ty = y - j
+                index = i * stride + j
+                a = table[index]
+                b = table[index + 1]
+                c = table[index + stride]
+                d = table[index + stride + 1]
+                low = a + (b - a) * ty
+                return low + (c + (d - c) * ty - low) * tx
+
+            return interpolate
+
+        strides = [1] * len(names)
+        for i in range(len(names) - 2, -1, -1):
+            strides[i] = strides[i + 1] * (lasts[i + 1] + 1)
+        dimensions = list(zip(minimums, maximums, scales, lasts, strides))
+
+        def interpolate(*values):
+            corners = [(0, 1.0)]
+            for value, (minimum, maximum, scale, last, stride) in zip(values, dimensions):
+                if not minimum <= value <= maximum:
+                    return exact(values)
+                x = (value - minimum) * scale
+                i = min(int(x), last - 1)
+                t = x - i
+                corners = [(index + i * stride, weight * (1 - t)) for index, weight in corners] + \
+                          [(index + (i + 1) * stride, weight * t) for index, weight in corners]
+            return sum(weight * table[index] for index, weight in corners)
+
+        return interpolate
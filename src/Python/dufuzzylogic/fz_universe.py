@@ -0,0 +1,174 @@
+from .fz_quantifier import FuzzyQuantifier, hedge, toQuantifier
+from .fz_logicalgorithm import FuzzyLogicAlgorithm
+from .fz_crispalgorithm import FuzzyCrispAlgorithm
+from array import array
+from operator import mul
+
+# ========== FUZZY UNIVERSE ==========
+
+
+def _probabilisticSum(x, y):
+    return x + y - x * y
+
+
+class FuzzyUniverse:
+
+    def __init__(self, minimum, maximum, resolution=1001):
+        """
+        Do not use the constructor of this class, use {@link FuzzyLogic.newUniverse} to create a new universe.
+        @class
+        @classdesc A discretized universe of discourse, used by the area crispification algorithms
+        ({@link FuzzyCrispAlgorithm.AREA_CENTROID}, {@link FuzzyCrispAlgorithm.AREA_BISECTOR}, {@link FuzzyCrispAlgorithm.MEAN_OF_MAXIMUM}).<br />
+        The membership curves of the sets are sampled once and cached, so that only the clipping and the combination
+        of the curves are computed when crispifying.
+        The cache must be cleared with {@link FuzzyUniverse.clearCache} if the sets are changed.
+        :param minimum: {Number} The lowest value of the universe.
+        :param maximum: {Number} The highest value of the universe.
+        :param resolution: {Number} [resolution=1001] The number of points of the universe.
+        @property {array} points The values of the universe.
+        """
+        resolution = max(int(resolution), 2)
+        step = (maximum - minimum) / (resolution - 1)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.step = step
+        self.points = array('d', [minimum + step * i for i in range(0, resolution)])
+        self._curves = {}
+
+    def __getstate__(self):
+        # the cache is keyed by the ids of the sets, which change when unpickling
+        state = self.__dict__.copy()
+        state["_curves"] = {}
+        return state
+
+    def covers(self, fuzzySet):
+        """
+        Checks if the support of a set is included in this universe.
+        :param fuzzySet: {FuzzySet} The set.
+        :return: {bool}
+        """
+        return self.minimum <= fuzzySet.minimum and fuzzySet.maximum <= self.maximum
+
+    def curve(self, fuzzySet, quantifier=FuzzyQuantifier.NONE):
+        """
+        Gets the membership curve of a set on the points of this universe, from the cache if it's already been computed.
+        The quantifier is applied to the curve: "Not" and "Less" use the complement of the set,
+        the other quantifiers change the veracity like {@link FuzzySet.contains} does, except "Completely" and "More" which keep the set as is.
+        :param fuzzySet: {FuzzySet} The set.
+        :param quantifier: {FuzzyQuantifier} [quantifier=FuzzyQuantifier.NONE] The quantifier.
+        :return: {Number[]} The veracities, for each point of the universe. Do not modify this list.
+        """
+        quantifier = toQuantifier(quantifier)
+        key = (id(fuzzySet), quantifier)
+        cached = self._curves.get(key)
+        if cached is not None:
+            return cached[1]
+
+        values = list(map(fuzzySet.membershipFunction(), self.points))
+        if quantifier == FuzzyQuantifier.IS_NOT or quantifier == FuzzyQuantifier.LESS:
+            values = [1 - v for v in values]
+        elif quantifier != FuzzyQuantifier.IS and quantifier != FuzzyQuantifier.MORE:
+            h = hedge(quantifier)
+            if h is not None:
+                values = list(map(h, values))
+
+        # keep a reference to the set so that its id is not reused
+        self._curves[key] = (fuzzySet, values)
+        return values
+
+    def clearCache(self):
+        """
+        Clears the cached membership curves; they will be computed again when needed.
+        """
+        self._curves = {}
+
+    def aggregate(self, activations, algorithm=FuzzyLogicAlgorithm.LINEAR):
+        """
+        Combines the sets activated by the rules.
+        With the linear logic, each set is clipped at the veracity of its rule, and the sets are combined with max;
+        with the hyperbolic logic, each set is scaled by the veracity of its rule, and the sets are combined with the probabilistic sum.
+        :param activations: {Array[]} The activations, as a list of [FuzzySet, FuzzyQuantifier, Number] with the veracity of the rule.
+        :param algorithm: {FuzzyLogicAlgorithm} [algorithm=FuzzyLogicAlgorithm.LINEAR] The logic algorithm.
+        :return: {Number[]} The combined veracities, for each point of the universe, or None if no set is activated.
+        """
+        result = None
+
+        if algorithm == FuzzyLogicAlgorithm.LINEAR:
+            # the max of the same curve clipped at several levels is the curve clipped at the highest level
+            levels = {}
+            for fuzzySet, quantifier, veracity in activations:
+                key = (id(fuzzySet), quantifier)
+                if key not in levels or levels[key][2] < veracity:
+                    levels[key] = (fuzzySet, quantifier, veracity)
+            for fuzzySet, quantifier, veracity in levels.values():
+                if veracity <= 0:
+                    continue
+                curve = self.curve(fuzzySet, quantifier)
+                if result is None:
+                    if veracity < 1:
+                        result = [m if m < veracity else veracity for m in curve]
+                    else:
+                        result = curve
+                elif veracity < 1:
+                    result = [r if r > veracity or r > m else (m if m < veracity else veracity)
+                              for r, m in zip(result, curve)]
+                else:
+                    result = list(map(max, result, curve))
+            return result
+
+        for fuzzySet, quantifier, veracity in activations:
+            if veracity <= 0:
+                continue
+            curve = self.curve(fuzzySet, quantifier)
+            if veracity != 1:
+                curve = [m * veracity for m in curve]
+            if result is None:
+                result = curve
+            else:
+                result = list(map(_probabilisticSum, result, curve))
+        return result
+
+    def crispify(self, activations, crispAlgorithm=FuzzyCrispAlgorithm.AREA_CENTROID, algorithm=FuzzyLogicAlgorithm.LINEAR):
+        """
+        Computes the crisp value of the combined area of the activated sets.
+        :param activations: {Array[]} The activations, as a list of [FuzzySet, FuzzyQuantifier, Number] with the veracity of the rule.
+        :param crispAlgorithm: {FuzzyCrispAlgorithm} [crispAlgorithm=FuzzyCrispAlgorithm.AREA_CENTROID] One of the area algorithms.
+        :param algorithm: {FuzzyLogicAlgorithm} [algorithm=FuzzyLogicAlgorithm.LINEAR] The logic algorithm.
+        :return: {Number} The crisp value, or None if the area is empty.
+        """
+        area = self.aggregate(activations, algorithm)
+        if area is None:
+            return None
+        total = sum(area)
+        if total <= 0:
+            return None
+
+        points = self.points
+
+        if crispAlgorithm == FuzzyCrispAlgorithm.AREA_BISECTOR:
+            half = total / 2
+            cumulated = 0
+            for i in range(0, len(area)):
+                if cumulated + area[i] >= half:
+                    # each point is the center of a rectangle of width step
+                    x = points[i] - self.step / 2 + self.step * (half - cumulated) / area[i]
+                    return min(max(x, self.minimum), self.maximum)
+                cumulated += area[i]
+            return self.maximum
+
+        if crispAlgorithm == FuzzyCrispAlgorithm.MEAN_OF_MAXIMUM:
+            top = max(area) * (1 - 1e-12)
+            maxima = [points[i] for i in range(0, len(area)) if area[i] >= top]
+            return sum(maxima) / len(maxima)
+
+        return sum(map(mul, points, area)) / total
+
+
+def universeFor(sets, resolution=1001):
+    """
+    low-level undocumented method
+    creates a universe covering the support of all the sets
+    """
+    minimum = min(s.minimum for s in sets)
+    maximum = max(s.maximum for s in sets)
+    return FuzzyUniverse(minimum, maximum, resolution)
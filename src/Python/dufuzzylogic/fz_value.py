@@ -1,8 +1,9 @@
 from .fz_math import logistic, inverseLogistic, gaussian, reversedGaussian, inverseGaussian, inverseReversedGaussian, mean
 from .fz_crispalgorithm import FuzzyCrispAlgorithm
-from .fz_quantifier import FuzzyQuantifier
+from .fz_quantifier import FuzzyQuantifier, hedge, toQuantifier
 from .fz_veracity import FuzzyVeracity
 from .fz_logicalgorithm import FuzzyLogicAlgorithm
+from .fz_universe import universeFor
 
 # ========= FUZZY VALUES =============
 
@@ -25,23 +26,38 @@ from .fz_logicalgorithm import FuzzyLogicAlgorithm
  * @property {string} unit The unit to display when returning this value as a string.
  * @property {bool} reportEnabled Enables or disable report generation when crispifying. Disabled by default to improve performance.
  * @property {string[][]} report The report (explanation) of the latest crispification {@link FuzzyValue.crispify}.<br />
- * It is an Array containing Arrays of strings. Each sub-array is the report of one rule, which you can print with <code>.join(newLine)</code> for example.
+ * It is an Array containing Arrays of strings. Each sub-array is the report of one rule, which you can print with <code>.join(newLine)</code> for example.<br />
+ * When crispifying, only compact records are stored; the text is generated when the report is read. Set it to an empty list to clear all the records.
+ * @property {Array[]} reportRecords The records of the latest crispification, as Arrays: [rule number, set, quantifier, veracity, value, weight].<br />
+ * The value and weight are None with the area algorithms.
+ * @property {Array[]} reportHistory All the records kept, from the oldest to the latest, including those of the previous crispifications.
+ * @property {int} reportSize The number of records kept in the ring buffer of the report. Defaults to 1024.
+ * @property {FuzzyUniverse} universe The universe used by the area crispification algorithms. By default, it is created to cover all the sets of the value.
  */
 """
 
 
 class FuzzyValue:
+    __slots__ = ("value", "unit", "sets", "quantifiers", "veracities", "algorithm", "crispAlgorithm",
+                 "reportEnabled", "reportSize", "_records", "_recordCount", "_reportStart", "numRules", "universe")
+
     def __init__(self, value=0, unit="", algorithm=None,
                  crispAlgorithm=None):
         self.value = value
         self.unit = unit
         self.sets = []
+        self.quantifiers = []
+        self.veracities = []
         self.algorithm = algorithm
         self.crispAlgorithm = crispAlgorithm
 
-        self.report = []
         self.reportEnabled = False
+        self.reportSize = 1024
+        self._records = []
+        self._recordCount = 0
+        self._reportStart = 0
         self.numRules = 0
+        self.universe = None
 
     def IS(self, fuzzySet, quantifier=FuzzyQuantifier.NONE):
         """
@@ -73,6 +89,7 @@ class FuzzyValue:
         """
         if veracity is None:
             veracity = FuzzyVeracity(1, self.algorithm)
+        quantifier = toQuantifier(quantifier)
 
         self.numRules = self.numRules + 1
         veracity.ruleNum = self.numRules
@@ -80,14 +97,15 @@ class FuzzyValue:
         # Check if this set is already here
         for i in range(0, len(self.sets)):
             if FuzzySet.name == self.sets[i].name:
-                self.sets[i].quantifiers.append(quantifier)
-                self.sets[i].veracities.append(veracity)
+                self.quantifiers[i].append(quantifier)
+                self.veracities[i].append(veracity)
                 return
 
         # Otherwise, add it
-        FuzzySet.quantifiers = [quantifier]
-        FuzzySet.veracities = [veracity]
+        # The quantifiers and veracities are stored in the value, not in the set, so that sets can be shared
         self.sets.append(FuzzySet)
+        self.quantifiers.append([quantifier])
+        self.veracities.append([veracity])
 
     def crispify(self, clearSets=True, algorithm=None):
         """
@@ -103,29 +121,48 @@ class FuzzyValue:
             return self.value
 
         crisp = 0
-        self.report = []
+        self._reportStart = self._recordCount
+        if self.reportEnabled and len(self._records) != max(self.reportSize, 1):
+            self._records = [None] * max(self.reportSize, 1)
+            self._recordCount = 0
+            self._reportStart = 0
+
+        if algorithm == FuzzyCrispAlgorithm.AREA_CENTROID or algorithm == FuzzyCrispAlgorithm.AREA_BISECTOR or algorithm == FuzzyCrispAlgorithm.MEAN_OF_MAXIMUM:
+            crisp = self._crispifyArea(algorithm)
+            return self._crispified(crisp, clearSets)
+
+        # the report only records the rules; it is formatted when it's read
+        record = self.reportEnabled
+        records = self._records
+        count = self._recordCount
+        size = len(records)
 
         # get all average values and veracities from the sets
         sumWeights = 0
+        # with the centroid, the rules with a veracity of 0 have no weight: they're not crispified, unless they're reported
+        weighted = algorithm == FuzzyCrispAlgorithm.CENTROID or algorithm == FuzzyCrispAlgorithm.CENTROID_LOWER or algorithm == FuzzyCrispAlgorithm.CENTROID_HIGHER
+        prune = weighted and not record
 
-        for singleSet in self.sets:
-            for j in range(0, len(singleSet.veracities)):
+        for i in range(0, len(self.sets)):
+            singleSet = self.sets[i]
+            # the crisp value is computed in closed form, without the list of values
+            crispValue = singleSet.crispFunction(algorithm)
+            for j in range(0, len(self.veracities[i])):
                 #  the veracity
-                v = singleSet.veracities[j]
-                q = singleSet.quantifiers[j]
-                # the corresponding values
-                vals = singleSet.crispify(q, v)
+                v = self.veracities[i][j]
+                if prune and v.veracity == 0:
+                    continue
+                q = self.quantifiers[i][j]
                 val = 0
                 ver = 0
 
-                if algorithm == FuzzyCrispAlgorithm.CENTROID or algorithm == FuzzyCrispAlgorithm.MEAN:
-                    val = mean(vals)
-                elif algorithm == FuzzyCrispAlgorithm.CENTROID_LOWER or algorithm == FuzzyCrispAlgorithm.MEAN_LOWER:
-                    val = vals[0]
-                elif algorithm == FuzzyCrispAlgorithm.CENTROID_HIGHER or algorithm == FuzzyCrispAlgorithm.MEAN_HIGHER:
-                    val = vals[len(vals)-1]
+                inverse = hedge(q, True)
+                if inverse is None:
+                    val = crispValue(v.veracity)
+                else:
+                    val = crispValue(inverse(v.veracity))
 
-                if algorithm == FuzzyCrispAlgorithm.CENTROID or algorithm == FuzzyCrispAlgorithm.CENTROID_LOWER or algorithm == FuzzyCrispAlgorithm.CENTROID_HIGHER:
+                if weighted:
                     crisp += val * v.veracity
                     ver = v.veracity
                 elif algorithm == FuzzyCrispAlgorithm.MEAN or algorithm == FuzzyCrispAlgorithm.MEAN_LOWER or algorithm == FuzzyCrispAlgorithm.MEAN_HIGHER:
@@ -134,32 +171,102 @@ class FuzzyValue:
 
                 sumWeights += ver
 
-                # generate report
-                if self.reportEnabled:
-                    for iVals in range(0, len(vals), 1):
-                        vals[iVals] = round(vals[iVals] * 1000) / 1000
+                if record:
+                    records[count % size] = (v.ruleNum, singleSet, q, v.veracity, val, ver)
+                    count += 1
 
-                    valeurs = "".join(str(vals))
-                    reportRule = []
-                    reportRule.append("Rule #" + str(v.ruleNum) + ": Set " + singleSet.name + " (" + str(q) + ")")
-                    reportRule.append(
-                        "Gives value: " + str(round(val * 1000) / 1000) + " from these values: " + valeurs)
-                    reportRule.append("with a veracity of : " + str(round(ver * 1000) / 1000))
-                    self.report.append(reportRule)
+        self._recordCount = count
 
         if sumWeights != 0:
             crisp = crisp / sumWeights
 
-        # sort the report
-        if self.reportEnabled:
-            self.report.sort()
+        return self._crispified(crisp, clearSets)
 
+    def _crispified(self, crisp, clearSets):
         if clearSets:
             # freeze all
             self.value = crisp
             # reset sets
             self.sets = []
+            self.quantifiers = []
+            self.veracities = []
+
+        return crisp
+
+    def _reportRecords(self, start):
+        # the records still in the ring buffer, from the given count
+        size = len(self._records)
+        start = max(start, self._recordCount - size)
+        return [self._records[i % size] for i in range(start, self._recordCount)]
+
+    @property
+    def report(self):
+        """
+        The report (explanation) of the latest crispification, formatted from {@link FuzzyValue.reportRecords}.
+        The candidate values are computed again from the sets when the report is read.
+        """
+        report = []
+        for ruleNum, fuzzySet, quantifier, veracity, value, weight in self._reportRecords(self._reportStart):
+            reportRule = []
+            reportRule.append("Rule #" + str(ruleNum) + ": Set " + fuzzySet.name + " (" + str(quantifier) + ")")
+            if value is not None:
+                vals = [round(v * 1000) / 1000 for v in fuzzySet.crispify(quantifier, veracity)]
+                reportRule.append(
+                    "Gives value: " + str(round(value * 1000) / 1000) + " from these values: " + str(vals))
+                reportRule.append("with a veracity of : " + str(round(weight * 1000) / 1000))
+            else:
+                reportRule.append("with a veracity of : " + str(round(veracity * 1000) / 1000))
+            report.append(reportRule)
+        report.sort()
+        return report
+
+    @report.setter
+    def report(self, report):
+        # the report can only be cleared, as it's formatted from the records
+        if len(report) != 0:
+            raise ValueError("The report can only be cleared, with an empty list")
+        self._records = []
+        self._recordCount = 0
+        self._reportStart = 0
+
+    @property
+    def reportRecords(self):
+        """
+        The records of the rules used by the latest crispification.
+        """
+        return self._reportRecords(self._reportStart)
+
+    @property
+    def reportHistory(self):
+        """
+        All the records still in the ring buffer, from the oldest to the latest, including those of previous crispifications.
+        """
+        return self._reportRecords(0)
+
+    def _crispifyArea(self, algorithm):
+        # the universe is kept to cache the membership curves of the sets between calls
+        if self.universe is None or not all(self.universe.covers(s) for s in self.sets):
+            self.universe = universeFor(self.sets)
+
+        activations = []
+        for i in range(0, len(self.sets)):
+            singleSet = self.sets[i]
+            for j in range(0, len(self.veracities[i])):
+                v = self.veracities[i][j]
+                q = self.quantifiers[i][j]
+                activations.append((singleSet, q, v.veracity))
+
+                if self.reportEnabled:
+                    # no candidate values with the area algorithms
+                    self._records[self._recordCount % len(self._records)] = (v.ruleNum, singleSet, q, v.veracity, None, None)
+                    self._recordCount += 1
 
+        logicAlgorithm = self.algorithm
+        if logicAlgorithm is None:
+            logicAlgorithm = FuzzyLogicAlgorithm.LINEAR
+        crisp = self.universe.crispify(activations, algorithm, logicAlgorithm)
+        if crisp is None:
+            return 0
         return crisp
 
     def toNumber(self, clearSets, algorithm):
@@ -0,0 +1,187 @@
+from .fz_shape import FuzzyShape
+import math
+
+# ========== FUZZY VARIABLE ==========
+
+
+class FuzzyVariable:
+
+    def __init__(self, name, sets=None, threshold=1e-9):
+        """
+        Do not use the constructor of this class, use {@link FuzzyLogic.newVariable} to create a new variable.
+        @class
+        @classdesc A variable partitioned in (overlapping) sets, like the bands of prices or the shades of a color.<br />
+        The sets are indexed by the interval of values they contain, so that {@link FuzzyVariable.fuzzify} only tests
+        the few sets which may contain a value, instead of all the sets.
+        The sets must not be changed after they've been indexed, or {@link FuzzyVariable.buildIndex} must be called again.
+        @example
+        price = logic.newVariable("price")
+        for i in range(0, 500):
+            price.addSet( logic.newSet("Band " + str(i), i * 10, i * 10 + 15) )
+        for fuzzySet, veracity in price.fuzzify(1234):
+            print(fuzzySet.name + ": " + str(veracity))
+        :param name: {string} The name of the variable.
+        :param sets: {FuzzySet[]} [sets] The sets of the variable.
+        :param threshold: {Number} [threshold=1e-9] Only the sets containing a value with a veracity above this threshold are returned by {@link FuzzyVariable.fuzzify}.
+        The default ignores the far tails of the smooth shapes (sigmoid, gaussian), which never reach 0: with a threshold of 0, a value would be contained by nearly all these sets.
+        @property {string} name The name of the variable.
+        @property {FuzzySet[]} sets The sets of the variable, in the order they were added.
+        @property {Number} threshold The veracity above which a set is considered to contain a value.
+        """
+        self.name = name
+        self.sets = [] if sets is None else list(sets)
+        self.threshold = threshold
+        self._index = None
+        self._memberships = None
+        self._indexThreshold = None
+
+    def __getstate__(self):
+        # the index holds membership functions, which can't be pickled; it is built again when needed
+        state = self.__dict__.copy()
+        state["_index"] = None
+        state["_memberships"] = None
+        return state
+
+    def addSet(self, fuzzySet):
+        """
+        Adds a set to the variable.
+        :param fuzzySet: {FuzzySet} The set.
+        :return: {FuzzySet} The set.
+        """
+        self.sets.append(fuzzySet)
+        self._index = None
+        return fuzzySet
+
+    def buildIndex(self):
+        """
+        Indexes the sets by the interval of values where their veracity is above the threshold.
+        This is done automatically when the sets are added, but it must be done again if the sets are changed.
+        :return: {FuzzyVariable} This variable.
+        """
+        self._memberships = [s.membershipFunction() for s in self.sets]
+        intervals = []
+        for i in range(0, len(self.sets)):
+            low, high = _support(self.sets[i], self._memberships[i], self.threshold)
+            intervals.append((low, high, i))
+        self._index = _buildNode(intervals)
+        self._indexThreshold = self.threshold
+        return self
+
+    def fuzzify(self, value):
+        """
+        Gets the sets containing a value, with their veracities.
+        :param value: {Number} The crisp value.
+        :return: {Array[]} The sets with a veracity above the threshold, as a list of [FuzzySet, veracity], in the order the sets were added.
+        """
+        if self._index is None or self._indexThreshold != self.threshold:
+            self.buildIndex()
+
+        found = []
+        node = self._index
+        while node is not None:
+            center, byLow, byHigh, left, right = node
+            if value < center:
+                for low, high, i in byLow:
+                    if low > value:
+                        break
+                    found.append(i)
+                node = left
+            elif value > center:
+                for low, high, i in byHigh:
+                    if high < value:
+                        break
+                    found.append(i)
+                node = right
+            else:
+                found.extend(i for low, high, i in byLow)
+                break
+
+        found.sort()
+        result = []
+        threshold = self.threshold
+        for i in found:
+            veracity = self._memberships[i](value)
+            if veracity > threshold:
+                result.append((self.sets[i], veracity))
+        return result
+
+
+def _buildNode(intervals):
+    """
+    low-level undocumented method
+    builds a centered interval tree: each node keeps the intervals containing its center,
+    sorted by their lower and their higher bound; the other intervals are on the left or right of the center
+    """
+    if len(intervals) == 0:
+        return None
+    ends = sorted(e for low, high, i in intervals for e in (low, high) if not math.isinf(e))
+    center = ends[len(ends) // 2] if len(ends) > 0 else 0
+    left = []
+    right = []
+    here = []
+    for interval in intervals:
+        if interval[1] < center:
+            left.append(interval)
+        elif interval[0] > center:
+            right.append(interval)
+        else:
+            here.append(interval)
+    byLow = sorted(here, key=lambda interval: interval[0])
+    byHigh = sorted(here, key=lambda interval: interval[1], reverse=True)
+    return center, byLow, byHigh, _buildNode(left), _buildNode(right)
+
+
+def _veracity(membership, value):
+    try:
+        return membership(value)
+    except OverflowError:
+        # far on the tail of a sigmoid
+        return 0
+
+
+def _bound(membership, inside, outside, direction, threshold):
+    """
+    low-level undocumented method
+    finds the bound of the support of a set on one side (direction is -1 below the set, 1 above),
+    from a value inside the set and a first guess outside of it,
+    assuming the veracity decreases when going away from the set
+    """
+    step = math.fabs(outside - inside) or 1
+    for i in range(0, 1100):
+        if _veracity(membership, outside) <= threshold:
+            break
+        inside = outside
+        step *= 2
+        outside = inside + direction * step
+        if math.isinf(outside):
+            return outside
+    else:
+        return direction * math.inf
+
+    # refine between the last value inside and the first one outside
+    for i in range(0, 200):
+        middle = (inside + outside) / 2
+        if middle == inside or middle == outside:
+            break
+        if _veracity(membership, middle) <= threshold:
+            outside = middle
+        else:
+            inside = middle
+    return outside
+
+
+def _support(fuzzySet, membership, threshold):
+    """
+    low-level undocumented method
+    the interval out of which the veracity of the set is not above the threshold
+    """
+    if fuzzySet.shapeIn == FuzzyShape.CONSTANT or fuzzySet.shapeIn == FuzzyShape.REVERSED_GAUSSIAN:
+        # the reversed gaussian is not monotonic far from the set
+        low = -math.inf
+    else:
+        low = _bound(membership, fuzzySet.plateauMin, fuzzySet.minimum, -1, threshold)
+    if fuzzySet.shapeOut == FuzzyShape.CONSTANT or fuzzySet.shapeOut == FuzzyShape.REVERSED_GAUSSIAN:
+        high = math.inf
+    else:
+        high = _bound(membership, fuzzySet.plateauMax, fuzzySet.maximum, 1, threshold)
+    return low, high
@@ -31,6 +31,9 @@ class FuzzyVeracity:
     @property {Number} veracity The veracity level in the range [0.0, 1.0]
     """
 
+    # Veracities are created by the thousands when evaluating rules: no __dict__
+    __slots__ = ("veracity", "algorithm", "ruleNum")
+
     def __init__(self, veracity, algorithm=FuzzyLogicAlgorithm.LINEAR):
         self.veracity = veracity
         self.algorithm = algorithm
@@ -181,7 +184,7 @@ class FuzzyVeracity:
         else:
             veracity = x * (1 - y)
 
-        return FuzzyVeracity(veracity)
+        return FuzzyVeracity(veracity, self.algorithm)
 
     def WITHOUT(self, other):
         """
@@ -221,7 +224,7 @@ class FuzzyVeracity:
         else:
             veracity = 1 - x * y
 
-        return FuzzyVeracity(veracity)
+        return FuzzyVeracity(veracity, self.algorithm)
 
     def NOT_BOTH(self, other):
         """
@@ -245,7 +248,7 @@ class FuzzyVeracity:
         else:
             veracity = 1 - x - y + x * y
 
-        return FuzzyVeracity(veracity)
+        return FuzzyVeracity(veracity, self.algorithm)
 
     def NONE(self, other):
         """
@@ -268,4 +271,140 @@ class FuzzyVeracity:
 
         veracity = (1 - weight * x + weight * y)
 
-        return FuzzyVeracity(veracity)
+        return FuzzyVeracity(veracity, self.algorithm)
+
+    # ===== In-place operators =====
+    # They change and return this veracity instead of creating a new one,
+    # to fold a chain of operators without intermediate objects:
+    # isRed = redChannel.IS( intense ).AND_( greenChannel.IS( intense ).NOR_( blueChannel.IS( intense ) ) )
+    # Do not use them on a veracity which has already been used with FuzzyLogic.THEN or FuzzyValue.SET, as it is kept by the value.
+
+    def NEGATE_(self):
+        """
+        In-place version of {@link FuzzyVeracity.NEGATE}: this veracity is changed.
+        :return: {FuzzyVeracity} This veracity.
+        """
+        self.veracity = 1 - self.veracity
+        return self
+
+    def AND_(self, other):
+        """
+        In-place version of {@link FuzzyVeracity.AND}: this veracity is changed.
+        :param other: {FuzzyVeracity} The other operand.
+        :return: {FuzzyVeracity} This veracity.
+        """
+        x = self.veracity
+        y = other.veracity
+        if self.algorithm == FuzzyLogicAlgorithm.LINEAR:
+            self.veracity = x if x < y else y
+        else:
+            self.veracity = x * y
+        return self
+
+    def OR_(self, other):
+        """
+        In-place version of {@link FuzzyVeracity.OR}: this veracity is changed.
+        :param other: {FuzzyVeracity} The other operand.
+        :return: {FuzzyVeracity} This veracity.
+        """
+        x = self.veracity
+        y = other.veracity
+        if self.algorithm == FuzzyLogicAlgorithm.LINEAR:
+            self.veracity = x if x > y else y
+        else:
+            self.veracity = x + y - x * y
+        return self
+
+    def XOR_(self, other):
+        """
+        In-place version of {@link FuzzyVeracity.XOR}: this veracity is changed.
+        :param other: {FuzzyVeracity} The other operand.
+        :return: {FuzzyVeracity} This veracity.
+        """
+        x = self.veracity
+        y = other.veracity
+        if self.algorithm == FuzzyLogicAlgorithm.LINEAR:
+            self.veracity = x + y - 2 * min(x, y)
+        else:
+            self.veracity = x + y - 2 * x * y
+        return self
+
+    def NXR_(self, other):
+        """
+        In-place version of {@link FuzzyVeracity.NXR}: this veracity is changed.
+        :param other: {FuzzyVeracity} The other operand.
+        :return: {FuzzyVeracity} This veracity.
+        """
+        x = self.veracity
+        y = other.veracity
+        if self.algorithm == FuzzyLogicAlgorithm.LINEAR:
+            self.veracity = 1 - x - y + 2 * min(x, y)
+        else:
+            self.veracity = 1 - x - y + 2 * x * y
+        return self
+
+    def IMPLIES_(self, other):
+        """
+        In-place version of {@link FuzzyVeracity.IMPLIES}: this veracity is changed.
+        :param other: {FuzzyVeracity} The other operand.
+        :return: {FuzzyVeracity} This veracity.
+        """
+        x = self.veracity
+        y = other.veracity
+        if self.algorithm == FuzzyLogicAlgorithm.LINEAR:
+            self.veracity = 1 - min(x, 1 - y)
+        else:
+            self.veracity = 1 - x + x * y
+        return self
+
+    def DOES_NOT_IMPLY_(self, other):
+        """
+        In-place version of {@link FuzzyVeracity.DOES_NOT_IMPLY}: this veracity is changed.
+        :param other: {FuzzyVeracity} The other operand.
+        :return: {FuzzyVeracity} This veracity.
+        """
+        x = self.veracity
+        y = other.veracity
+        if self.algorithm == FuzzyLogicAlgorithm.LINEAR:
+            self.veracity = min(x, 1 - y)
+        else:
+            self.veracity = x * (1 - y)
+        return self
+
+    def NAND_(self, other):
+        """
+        In-place version of {@link FuzzyVeracity.NAND}: this veracity is changed.
+        :param other: {FuzzyVeracity} The other operand.
+        :return: {FuzzyVeracity} This veracity.
+        """
+        x = self.veracity
+        y = other.veracity
+        if self.algorithm == FuzzyLogicAlgorithm.LINEAR:
+            self.veracity = 1 - min(x, y)
+        else:
+            self.veracity = 1 - x * y
+        return self
+
+    def NOR_(self, other):
+        """
+        In-place version of {@link FuzzyVeracity.NOR}: this veracity is changed.
+        :param other: {FuzzyVeracity} The other operand.
+        :return: {FuzzyVeracity} This veracity.
+        """
+        x = self.veracity
+        y = other.veracity
+        if self.algorithm == FuzzyLogicAlgorithm.LINEAR:
+            self.veracity = 1 - max(x, y)
+        else:
+            self.veracity = 1 - x - y + x * y
+        return self
+
+    def WEIGHTED_(self, other, weight):
+        """
+        In-place version of {@link FuzzyVeracity.WEIGHTED}: this veracity is changed.
+        :param other: {FuzzyVeracity} The other operand.
+        :param weight: {Number} The weight.
+        :return: {FuzzyVeracity} This veracity.
+        """
+        self.veracity = 1 - weight * self.veracity + weight * other.veracity
+        return self
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import os
 from dufuzzylogic import *
 
 def runTest():
@@ -192,4 +193,103 @@ def runTest():
         hvacPower.toString(FuzzyCrispAlgorithm.MEAN_LOWER, None)))
 
 
+    print("\n===========================")
+    print("\n \n--- Rule Base Example ---\n \n")
+
+    # The same HVAC rules, declared once and compiled
+    rules = logic.newRuleBase()
+    temperatureIn = rules.newInput("temperature", 22, "°C")
+    humidityIn = rules.newInput("humidity", 10, "%")
+    power = rules.newOutput("hvacPower", 0, "%")
+
+    rules.addRule(temperatureIn.IS(hot), power, refresh)
+    rules.addRule(temperatureIn.IS(cold), power, heat)
+    rules.addRule(temperatureIn.IS(hot).AND(humidityIn.IS(wet)), power, refresh, "More")
+    rules.addRule(temperatureIn.IS(cold).AND(humidityIn.IS(wet)), power, heat, "More")
+    rules.addRule(temperatureIn.IS(cold)
+                  .AND(temperatureIn.IS_NOT(cold, "Extremely"))
+                  .AND(humidityIn.IS(dry)), power, heat, "Less")
+    rules.addRule(temperatureIn.IS(hot)
+                  .AND(temperatureIn.IS_NOT(hot, "Extremely"))
+                  .AND(humidityIn.IS(dry)), power, refresh, "Less")
+    rules.addRule(temperatureIn.IS(warm, "very")
+                  .OR(temperatureIn.IS(cold))
+                  .AND(humidityIn.IS(wet)), power, heat, "Somewhat")
+    isWarm = temperatureIn.IS(warm)
+    rules.addRule(isWarm, power, refresh, "not")
+    rules.addRule(isWarm, power, heat, "not")
+
+    for t in [5, 15, 22, 30]:
+        for h in [10, 50, 90]:
+            result = rules.evaluate({"temperature": t, "humidity": h})
+            print(str(t) + "°C, " + str(h) + "%: the power of the air conditionner is " +
+                  str(round(result["hvacPower"] * 100) / 100) + "%")
+
+    print("\n===========================")
+    print("\n \n--- Rule File Example ---\n \n")
+
+    # The same HVAC rules, declared in a JSON file
+    rules = logic.loadRuleBase(os.path.join(os.path.dirname(os.path.abspath(__file__)), "hvac.json"))
+
+    for t in [5, 15, 22, 30]:
+        for h in [10, 50, 90]:
+            result = rules.evaluate({"temperature": t, "humidity": h})
+            print(str(t) + "°C, " + str(h) + "%: the power of the air conditionner is " +
+                  str(round(result["hvacPower"] * 100) / 100) + "%")
+
+    print("\n===========================")
+    print("\n \n--- Generated Code Test ---\n \n")
+
+    # The generated function must give the same results as FuzzyRuleBase.evaluate,
+    # with all the shapes, hedges, logic and crispification algorithms, and with tabulated sets
+    shapes = [FuzzyShape.CONSTANT, FuzzyShape.SQUARE, FuzzyShape.LINEAR,
+              FuzzyShape.SIGMOID, FuzzyShape.GAUSSIAN, FuzzyShape.REVERSED_GAUSSIAN]
+    logicAlgorithms = ["LINEAR", "HYPERBOLIC"]
+    crispAlgorithms = ["CENTROID", "CENTROID_LOWER", "CENTROID_HIGHER", "MEAN", "MEAN_LOWER", "MEAN_HIGHER"]
+
+    for logicAlgorithm in logicAlgorithms:
+        for crispAlgorithm in crispAlgorithms:
+            logic = FuzzyLogic(getattr(FuzzyLogicAlgorithm, logicAlgorithm), getattr(FuzzyCrispAlgorithm, crispAlgorithm))
+            sets = []
+            for i in range(0, len(shapes)):
+                for j in range(0, len(shapes)):
+                    fuzzySet = logic.newSet("Set " + str(len(sets)), len(sets) * 4, len(sets) * 4 + 6, shapes[i], shapes[j])
+                    if len(sets) % 3 == 0:
+                        fuzzySet.tabulate(64)
+                    sets.append(fuzzySet)
+
+            # the crisp value of a sigmoid is not defined for a veracity of 0 or 1: they're only used in the antecedents
+            consequents = [s for s in sets if s.shapeIn != FuzzyShape.SIGMOID and s.shapeOut != FuzzyShape.SIGMOID]
+
+            rules = logic.newRuleBase()
+            x = rules.newInput("x")
+            u = rules.newInput("u")
+            y = rules.newOutput("y")
+            for k in range(0, len(sets)):
+                a = sets[k]
+                b = sets[(k * 7 + 3) % len(sets)]
+                antecedent = x.IS(a, quantifiers[k % len(quantifiers)])
+                if k % 4 == 1:
+                    antecedent = antecedent.AND(u.IS(b, quantifiers[(k + 3) % len(quantifiers)]))
+                elif k % 4 == 2:
+                    antecedent = antecedent.OR(u.IS(b)).NEGATE()
+                elif k % 4 == 3:
+                    antecedent = antecedent.DOES_NOT_IMPLY(u.IS(b, "very")).XOR(x.IS(b).NAND(u.IS(a)))
+                rules.addRule(antecedent, y, consequents[(k * 5 + 1) % len(consequents)], quantifiers[(k + 1) % len(quantifiers)])
+
+            generated = rules.generate()
+            points = 0
+            mismatches = 0
+            for xValue in range(-10, 160, 3):
+                for uValue in range(-10, 160, 17):
+                    inputs = {"x": xValue + 0.25, "u": uValue}
+                    expected = rules.evaluate(inputs)["y"]
+                    result = generated(inputs)["y"]
+                    points += 1
+                    if abs(expected - result) > 1e-9:
+                        mismatches += 1
+            print(logicAlgorithm + " / " + crispAlgorithm + ": " + str(points - mismatches) + " of " + str(points) +
+                  " points match")
+
+
 runTest()
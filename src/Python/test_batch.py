@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+import math
+import unittest
+
+from dufuzzylogic import *
+from test_rulebase import CRISP_ALGORITHMS, GRID, LOGIC_ALGORITHMS, inferHvacPower, newHvacRuleBase, newHvacSets
+
+
+class BatchTest(unittest.TestCase):
+
+    def testSameAsEvaluate(self):
+        columns = {"temperature": [t for t, h in GRID], "humidity": [h for t, h in GRID]}
+        for algorithm in LOGIC_ALGORITHMS:
+            for crispAlgorithm in CRISP_ALGORITHMS:
+                with self.subTest(algorithm=algorithm, crispAlgorithm=crispAlgorithm):
+                    logic = FuzzyLogic(algorithm, crispAlgorithm)
+                    rules = newHvacRuleBase(logic, newHvacSets(logic))
+                    expected = [rules.evaluate({"temperature": t, "humidity": h})["hvacPower"] for t, h in GRID]
+                    self.assertEqual(list(rules.evaluateBatch(columns)["hvacPower"]), expected)
+                    self.assertEqual(list(rules.evaluateBatch(GRID)["hvacPower"]), expected)
+
+    def testSameAsIfThen(self):
+        logic = FuzzyLogic(FuzzyLogicAlgorithm.HYPERBOLIC)
+        sets = newHvacSets(logic)
+        rules = newHvacRuleBase(logic, sets)
+        results = rules.evaluateBatch(GRID)["hvacPower"]
+        for (temperature, humidity), result in zip(GRID, results):
+            expected = inferHvacPower(logic, sets, temperature, humidity)
+            self.assertTrue(math.isclose(result, expected, rel_tol=1e-9, abs_tol=1e-9), (temperature, humidity))
+
+    def testDefaults(self):
+        logic = FuzzyLogic()
+        rules = newHvacRuleBase(logic, newHvacSets(logic))
+        results = rules.evaluateBatch({"temperature": [5, 30]})["hvacPower"]
+        self.assertEqual(list(results), [rules.evaluate({"temperature": t})["hvacPower"] for t in (5, 30)])
+
+    def testEmpty(self):
+        logic = FuzzyLogic()
+        rules = newHvacRuleBase(logic, newHvacSets(logic))
+        self.assertEqual(len(rules.evaluateBatch([])["hvacPower"]), 0)
+        self.assertEqual(len(rules.evaluateBatch({"temperature": []})["hvacPower"]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+import pickle
+import random
+import unittest
+
+from dufuzzylogic import *
+
+_SHAPES = [FuzzyShape.SQUARE, FuzzyShape.LINEAR, FuzzyShape.SIGMOID, FuzzyShape.GAUSSIAN, FuzzyShape.REVERSED_GAUSSIAN]
+
+_QUANTIFIERS = [FuzzyQuantifier.NONE, "very", "somewhat", FuzzyQuantifier.IS_NOT]
+
+
+class CacheTest(unittest.TestCase):
+
+    def testSameAsNoCache(self):
+        generator = random.Random(2)
+        plain = FuzzyLogic()
+        cached = FuzzyLogic(cacheSize=50)
+        for i in range(0, 50):
+            parameters = (generator.uniform(0, 100), generator.uniform(0, 100), generator.choice(_SHAPES), generator.choice(_SHAPES))
+            expected = plain.newSet("A", *parameters)
+            fuzzySet = cached.newSet("A", *parameters)
+            for k in range(0, 200):
+                value = generator.randint(-10, 110)
+                quantifier = generator.choice(_QUANTIFIERS)
+                veracity = fuzzySet.contains(value, quantifier)
+                self.assertEqual(veracity.veracity, expected.contains(value, quantifier).veracity)
+                self.assertEqual(veracity.algorithm, expected.algorithm)
+                # changing the result doesn't change the cache
+                veracity.NEGATE_()
+                self.assertEqual(fuzzySet.contains(value, quantifier).veracity, expected.contains(value, quantifier).veracity)
+                level = generator.choice([0.25, 0.5, 0.75])
+                self.assertEqual(list(fuzzySet.getValues(level)), expected.getValues(level))
+            self.assertLessEqual(len(fuzzySet._containsCache), 50)
+            self.assertGreater(fuzzySet.cacheHits, 0)
+
+    def testLeastRecentlyUsed(self):
+        fuzzySet = FuzzyLogic(cacheSize=2).newSet("A", 0, 10)
+        fuzzySet.contains(1)
+        fuzzySet.contains(2)
+        fuzzySet.contains(1)
+        # drops 2, the least recently used
+        fuzzySet.contains(3)
+        self.assertEqual(list(fuzzySet._containsCache.keys()), [(1, FuzzyQuantifier.NONE), (3, FuzzyQuantifier.NONE)])
+        self.assertEqual((fuzzySet.cacheHits, fuzzySet.cacheMisses), (1, 3))
+
+    def testClearCache(self):
+        fuzzySet = FuzzyLogic(cacheSize=10).newSet("A", 0, 10)
+        self.assertEqual(fuzzySet.contains(5).veracity, 0.5)
+        fuzzySet.maximum = 40
+        fuzzySet.plateauMin = 20
+        fuzzySet.plateauMax = 20
+        fuzzySet.clearCache()
+        self.assertEqual(fuzzySet.contains(5).veracity, FuzzyLogic().newSet("A", 0, 20).contains(5).veracity)
+
+    def testDisableCache(self):
+        fuzzySet = FuzzyLogic(cacheSize=10).newSet("A", 0, 10)
+        fuzzySet.contains(5)
+        fuzzySet.disableCache()
+        self.assertEqual(fuzzySet.cacheSize, 0)
+        self.assertEqual(fuzzySet.contains(5).veracity, 0.5)
+        self.assertEqual(fuzzySet.cacheHits, 0)
+
+    def testPickle(self):
+        fuzzySet = FuzzyLogic(cacheSize=50).newSet("A", 0, 10)
+        fuzzySet.contains(3)
+        copy = pickle.loads(pickle.dumps(fuzzySet))
+        # the cache is enabled, but empty
+        self.assertEqual(copy.cacheSize, 50)
+        self.assertEqual(len(copy._containsCache), 0)
+        self.assertEqual(copy.contains(3).veracity, fuzzySet.contains(3).veracity)
+
+
+if __name__ == "__main__":
+    unittest.main()
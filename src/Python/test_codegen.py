@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+import ast
+import math
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from dufuzzylogic import *
+from test_rulebase import GRID, LOGIC_ALGORITHMS, OPERATORS, inferHvacPower, newHvacRuleBase, newHvacSets
+
+# the area algorithms can't be generated
+_CRISP_ALGORITHMS = [FuzzyCrispAlgorithm.CENTROID, FuzzyCrispAlgorithm.CENTROID_LOWER, FuzzyCrispAlgorithm.CENTROID_HIGHER,
+                     FuzzyCrispAlgorithm.MEAN, FuzzyCrispAlgorithm.MEAN_HIGHER, FuzzyCrispAlgorithm.MEAN_LOWER]
+
+_SHAPES = [FuzzyShape.LINEAR, FuzzyShape.SQUARE, FuzzyShape.SIGMOID, FuzzyShape.GAUSSIAN, FuzzyShape.REVERSED_GAUSSIAN,
+           FuzzyShape.CONSTANT]
+
+_QUANTIFIERS = [FuzzyQuantifier.NONE, "very", "somewhat", "extremely", "slightly", "Not", "Completely", "Moderately"]
+
+
+def outcome(function, inputs):
+    """
+    The result of the function, or the type of its exception
+    """
+    try:
+        return function(inputs)
+    except Exception as error:
+        return type(error)
+
+
+class CodeGenerationTest(unittest.TestCase):
+
+    def testSameAsIfThen(self):
+        for algorithm in LOGIC_ALGORITHMS:
+            for crispAlgorithm in _CRISP_ALGORITHMS:
+                with self.subTest(algorithm=algorithm, crispAlgorithm=crispAlgorithm):
+                    logic = FuzzyLogic(algorithm, crispAlgorithm)
+                    sets = newHvacSets(logic)
+                    function = newHvacRuleBase(logic, sets).generate()
+                    for temperature, humidity in GRID:
+                        expected = inferHvacPower(logic, sets, temperature, humidity)
+                        result = function({"temperature": temperature, "humidity": humidity})["hvacPower"]
+                        self.assertTrue(math.isclose(result, expected, rel_tol=1e-9, abs_tol=1e-9), (temperature, humidity))
+
+    def testRandomRules(self):
+        generator = random.Random(7)
+        for i in range(0, 60):
+            logic = FuzzyLogic(generator.choice(LOGIC_ALGORITHMS), generator.choice(_CRISP_ALGORITHMS))
+            sets = [logic.newSet("S" + str(k), k * 10, k * 10 + 6 + generator.random(),
+                                 generator.choice(_SHAPES), generator.choice(_SHAPES)) for k in range(0, 12)]
+            for fuzzySet in sets:
+                if generator.random() < 0.2:
+                    fuzzySet.tabulate(generator.choice([16, 64]))
+            rules = logic.newRuleBase()
+            inputs = [rules.newInput("i" + str(k), generator.choice([0, 5.5])) for k in range(0, 3)]
+            outputs = [rules.newOutput("o" + str(k), generator.choice([0, 7])) for k in range(0, 3)]
+
+            def expression(depth):
+                if depth == 0 or generator.random() < 0.3:
+                    if generator.random() < 0.2:
+                        return generator.choice(inputs).IS_NOT(generator.choice(sets))
+                    return generator.choice(inputs).IS(generator.choice(sets), generator.choice(_QUANTIFIERS))
+                operator = generator.choice(OPERATORS + ["NEGATE", "WEIGHTED"])
+                if operator == "NEGATE":
+                    return expression(depth - 1).NEGATE()
+                if operator == "WEIGHTED":
+                    return expression(depth - 1).WEIGHTED(expression(depth - 1), generator.random())
+                return getattr(expression(depth - 1), operator)(expression(depth - 1))
+
+            for k in range(0, generator.randint(0, 30)):
+                rules.addRule(expression(4), generator.choice(outputs[:2]), generator.choice(sets), generator.choice(_QUANTIFIERS))
+            function = rules.generate()
+            for n in range(0, 30):
+                row = {"i" + str(k): generator.uniform(-10, 130) for k in range(0, 3) if generator.random() < 0.9}
+                expected = outcome(rules.evaluate, row)
+                result = outcome(function, row)
+                # NaN is not equal to itself
+                if expected == expected:
+                    self.assertEqual(result, expected, (i, row))
+
+    def testFile(self):
+        logic = FuzzyLogic()
+        rules = newHvacRuleBase(logic, newHvacSets(logic))
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "hvac_rules.py")
+            function = rules.generate(path, "hvac")
+            loaded = logic.loadGenerated(path, "hvac")
+            for temperature, humidity in GRID:
+                inputs = {"temperature": temperature + 0.3, "humidity": humidity + 0.1}
+                self.assertEqual(function(inputs), rules.evaluate(inputs))
+                self.assertEqual(loaded(inputs), rules.evaluate(inputs))
+        finally:
+            shutil.rmtree(directory)
+
+    def testStandalone(self):
+        # the generated source only depends on the standard library
+        logic = FuzzyLogic()
+        source = newHvacRuleBase(logic, newHvacSets(logic)).toPython("hvac")
+        modules = set()
+        for node in ast.walk(ast.parse(source)):
+            if isinstance(node, ast.Import):
+                modules.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                modules.add(node.module)
+        self.assertEqual(modules, {"math"})
+
+    def testAreaAlgorithm(self):
+        logic = FuzzyLogic(crispAlgorithm=FuzzyCrispAlgorithm.AREA_CENTROID)
+        with self.assertRaises(ValueError):
+            newHvacRuleBase(logic, newHvacSets(logic)).toPython()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+import math
+import random
+import unittest
+
+from dufuzzylogic import *
+from test_rulebase import CRISP_ALGORITHMS, LOGIC_ALGORITHMS, OPERATORS, newHvacRuleBase, newHvacSets
+
+
+def newRandomRuleBase(logic, generator, numRules=30):
+    """
+    A rule base with random antecedents, sharing some of their expressions
+    """
+    sets = [logic.newSet("S" + str(i), i * 10, i * 10 + 6) for i in range(0, 12)]
+    rules = logic.newRuleBase()
+    inputs = [rules.newInput("i" + str(i)) for i in range(0, 3)]
+    outputs = [rules.newOutput("o" + str(i), i) for i in range(0, 2)]
+    expressions = []
+
+    def expression(depth):
+        if len(expressions) > 0 and generator.random() < 0.2:
+            return generator.choice(expressions)
+        if depth == 0 or generator.random() < 0.3:
+            result = generator.choice(inputs).IS(generator.choice(sets), generator.choice(["", "very", "somewhat"]))
+        elif generator.random() < 0.1:
+            result = expression(depth - 1).NEGATE()
+        elif generator.random() < 0.1:
+            result = expression(depth - 1).WEIGHTED(expression(depth - 1), generator.random())
+        else:
+            result = getattr(expression(depth - 1), generator.choice(OPERATORS))(expression(depth - 1))
+        expressions.append(result)
+        return result
+
+    for i in range(0, numRules):
+        rules.addRule(expression(4), generator.choice(outputs), generator.choice(sets))
+    return rules
+
+
+class ControllerTest(unittest.TestCase):
+
+    def testSameAsEvaluate(self):
+        for algorithm in LOGIC_ALGORITHMS:
+            for crispAlgorithm in CRISP_ALGORITHMS:
+                with self.subTest(algorithm=algorithm, crispAlgorithm=crispAlgorithm):
+                    logic = FuzzyLogic(algorithm, crispAlgorithm)
+                    rules = newHvacRuleBase(logic, newHvacSets(logic))
+                    controller = rules.newController()
+                    inputs = {"temperature": 0, "humidity": 0}
+                    generator = random.Random(1)
+                    for i in range(0, 100):
+                        if i % 3 == 0:
+                            inputs = {"temperature": generator.uniform(-5, 45), "humidity": generator.uniform(0, 100)}
+                            controller.updateMany(inputs)
+                        else:
+                            name = generator.choice(["temperature", "humidity"])
+                            inputs[name] = generator.uniform(0, 60)
+                            controller.update(name, inputs[name])
+                        self.assertEqual(controller.results(), rules.evaluate(inputs))
+                        self.assertEqual(controller.get("hvacPower"), rules.evaluate(inputs)["hvacPower"])
+
+    def testRandomRules(self):
+        generator = random.Random(5)
+        for i in range(0, 20):
+            logic = FuzzyLogic(generator.choice(LOGIC_ALGORITHMS), generator.choice(CRISP_ALGORITHMS))
+            rules = newRandomRuleBase(logic, generator)
+            rows = [{"i" + str(k): generator.uniform(-10, 130) for k in range(0, 3)} for n in range(0, 20)]
+            controller = rules.newController(rows[0])
+            for row in rows:
+                controller.updateMany(row)
+                expected = rules.evaluate(row)
+                for name, value in controller.results().items():
+                    self.assertTrue(math.isclose(value, expected[name], rel_tol=1e-9, abs_tol=1e-9), (i, name))
+
+    def testUnchangedInput(self):
+        logic = FuzzyLogic()
+        rules = newHvacRuleBase(logic, newHvacSets(logic))
+        controller = rules.newController({"temperature": 30, "humidity": 80})
+        result = controller.get("hvacPower")
+        controller.update("temperature", 30)
+        self.assertEqual(controller.get("hvacPower"), result)
+        self.assertEqual(controller.value("temperature"), 30)
+
+    def testNewRule(self):
+        logic = FuzzyLogic()
+        sets = newHvacSets(logic)
+        rules = newHvacRuleBase(logic, sets)
+        controller = rules.newController({"temperature": 30, "humidity": 80})
+        controller.get("hvacPower")
+        rules.addRule(rules.inputs[1].IS(sets["wet"]), rules.outputs[0], sets["refresh"], "Very")
+        self.assertEqual(controller.results(), rules.evaluate({"temperature": 30, "humidity": 80}))
+
+
+if __name__ == "__main__":
+    unittest.main()
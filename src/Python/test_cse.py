@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+import random
+import unittest
+
+from dufuzzylogic import *
+from test_rulebase import LOGIC_ALGORITHMS
+from test_skip import build, newTree
+
+
+class SharedExpressionTest(unittest.TestCase):
+
+    def testStatistics(self):
+        logic = FuzzyLogic()
+        a = logic.newSet("A", 0, 10)
+        b = logic.newSet("B", 10, 0)
+        rules = logic.newRuleBase()
+        x = rules.newInput("x")
+        y = rules.newInput("y")
+        o = rules.newOutput("o")
+        # the same expression, declared twice
+        rules.addRule(x.IS(a).AND(y.IS(b)), o, a)
+        rules.addRule(x.IS(a).AND(y.IS(b)).OR(x.IS(b)), o, b)
+        # not the same quantifier
+        rules.addRule(x.IS(a, "very"), o, b)
+        statistics = rules.compile().statistics()
+        self.assertEqual(statistics["savedTests"], 2)
+        self.assertEqual(statistics["savedOperations"], 1)
+
+    def testSameAsSeparateRules(self):
+        # the rules sharing expressions give the same results as each rule alone in its own rule base
+        generator = random.Random(11)
+        saved = 0
+        for algorithm in LOGIC_ALGORITHMS:
+            logic = FuzzyLogic(algorithm)
+            sets = [logic.newSet("S" + str(i), i * 10, i * 10 + 8) for i in range(0, 6)]
+            power = logic.newSet("Power", 0, 100)
+            for i in range(0, 20):
+                shared = [newTree(generator, 3) for k in range(0, 4)]
+                trees = []
+                for k in range(0, 15):
+                    tree = generator.choice(shared) if generator.random() < 0.5 else newTree(generator, 3)
+                    if generator.random() < 0.4:
+                        tree = ("AND", tree, generator.choice(shared), 0)
+                    trees.append(tree)
+                rules = logic.newRuleBase()
+                inputs = [rules.newInput("x"), rules.newInput("y")]
+                alone = []
+                for k in range(0, len(trees)):
+                    rules.addRule(build(trees[k], inputs, sets), rules.newOutput("o" + str(k)), power)
+                    ruleBase = logic.newRuleBase()
+                    ruleBase.addRule(build(trees[k], [ruleBase.newInput("x"), ruleBase.newInput("y")], sets),
+                                     ruleBase.newOutput("o" + str(k)), power)
+                    alone.append(ruleBase)
+                for n in range(0, 20):
+                    values = {"x": generator.uniform(-5, 65), "y": generator.uniform(-5, 65)}
+                    results = rules.evaluate(values)
+                    for k in range(0, len(trees)):
+                        self.assertEqual(results["o" + str(k)], alone[k].evaluate(values)["o" + str(k)], (algorithm, trees[k]))
+                saved += rules.statistics()["savedTests"] + rules.statistics()["savedOperations"]
+        self.assertGreater(saved, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+import json
+import math
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from dufuzzylogic import *
+from test_rulebase import LOGIC_ALGORITHMS
+
+_OPERATORS = ["AND", "OR", "XOR", "NAND", "AND", "AND"]
+
+
+class FunctionRuleTest(unittest.TestCase):
+
+    def assertClose(self, first, second, message=None):
+        self.assertTrue(math.isclose(first, second, rel_tol=1e-9, abs_tol=1e-9), (first, second, message))
+
+    def testWeightedMean(self):
+        for algorithm in LOGIC_ALGORITHMS:
+            logic = FuzzyLogic(algorithm)
+            hot = logic.newSet("Hot", 21, 35)
+            cold = logic.newSet("Cold", 17, 10)
+            rules = logic.newRuleBase()
+            temperature = rules.newInput("temperature")
+            power = rules.newOutput("power", 42)
+            rules.addFunctionRule(temperature.IS(hot), power, -20, {temperature: -2})
+            rules.addFunctionRule(temperature.IS(cold), power, 60)
+            for t in range(-10, 50, 3):
+                isHot = hot.contains(t).veracity
+                isCold = cold.contains(t).veracity
+                if isHot + isCold == 0:
+                    expected = 42
+                else:
+                    expected = (isHot * (-20 - 2 * t) + isCold * 60) / (isHot + isCold)
+                self.assertClose(rules.evaluate({"temperature": t})["power"], expected, t)
+
+    def testSameEverywhere(self):
+        # evaluate, evaluateBatch, the controllers and the generated functions give the same results
+        generator = random.Random(3)
+        for i in range(0, 30):
+            logic = FuzzyLogic(generator.choice(LOGIC_ALGORITHMS),
+                               generator.choice([FuzzyCrispAlgorithm.CENTROID, FuzzyCrispAlgorithm.MEAN]))
+            sets = [logic.newSet("S" + str(k), k * 10, k * 10 + 8) for k in range(0, 12)]
+            rules = logic.newRuleBase()
+            inputs = [rules.newInput("i" + str(k), 1.5) for k in range(0, 3)]
+            outputs = [rules.newOutput("o" + str(k), 42) for k in range(0, 3)]
+
+            def expression(depth):
+                if depth == 0 or generator.random() < 0.3:
+                    return generator.choice(inputs).IS(generator.choice(sets))
+                return getattr(expression(depth - 1), generator.choice(_OPERATORS))(expression(depth - 1))
+
+            for k in range(0, 25):
+                output = generator.choice(outputs)
+                if output is outputs[2]:
+                    rules.addRule(expression(3), output, generator.choice(sets))
+                else:
+                    coefficients = {}
+                    for n in range(0, generator.randint(0, 2)):
+                        # by input or by name
+                        key = generator.choice(inputs) if generator.random() < 0.5 else "i" + str(generator.randrange(3))
+                        coefficients[key] = generator.uniform(-3, 3)
+                    rules.addFunctionRule(expression(3), output, generator.uniform(-50, 50), coefficients)
+
+            rows = [{"i" + str(k): generator.uniform(-10, 130) for k in range(0, 3)} for n in range(0, 30)]
+            batch = rules.evaluateBatch({name: [row[name] for row in rows] for name in rows[0]})
+            controller = rules.newController()
+            function = rules.generate()
+            for n in range(0, len(rows)):
+                expected = rules.evaluate(rows[n])
+                controller.updateMany(rows[n])
+                self.assertEqual(controller.results(), expected)
+                self.assertEqual(function(rows[n]), expected)
+                for name in expected:
+                    self.assertClose(batch[name][n], expected[name], (i, name))
+
+    def testController(self):
+        # an input only used by a function
+        logic = FuzzyLogic()
+        always = logic.newSet("Always", -1000, 0)
+        rules = logic.newRuleBase()
+        a = rules.newInput("a")
+        b = rules.newInput("b")
+        o = rules.newOutput("o", -1)
+        rules.addFunctionRule(a.IS(always), o, 1, {b: 2})
+        controller = rules.newController({"a": 0, "b": 0})
+        self.assertEqual(controller.get("o"), 1)
+        controller.update("b", 5)
+        self.assertEqual(controller.get("o"), 11)
+        controller.update("a", 5000)
+        self.assertEqual(controller.get("o"), -1)
+
+    def testMixed(self):
+        logic = FuzzyLogic()
+        always = logic.newSet("Always", -1000, 0)
+        rules = logic.newRuleBase()
+        a = rules.newInput("a")
+        o = rules.newOutput("o")
+        rules.addFunctionRule(a.IS(always), o, 1)
+        rules.addRule(a.IS(always), o, always)
+        with self.assertRaises(ValueError):
+            rules.evaluate({})
+
+    def testRuleFile(self):
+        document = {
+            "sets": [{"name": "Hot", "extremeValue": 21, "referenceValue": 35},
+                     {"name": "Cold", "extremeValue": 17, "referenceValue": 10}],
+            "inputs": [{"name": "t"}],
+            "outputs": [{"name": "p"}, {"name": "fan", "value": 3}],
+            "rules": [{"if": ["IS", "t", "Hot"], "then": [["p", "Hot"], ["fan", 10, {"t": 0.5}]]},
+                      {"if": ["IS", "t", "Cold"], "then": ["fan", -4]}]
+        }
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "rules.json")
+            with open(path, "w") as f:
+                json.dump(document, f)
+            rules = FuzzyLogic().loadRuleBase(path)
+            self.assertEqual(rules.evaluate({"t": 40})["fan"], 30)
+            self.assertEqual(rules.evaluate({"t": 5})["fan"], -4)
+            self.assertEqual(rules.evaluate({"t": 19})["fan"], 3)
+            for then in (["fan", 1, {"x": 1}], ["fan", 1, [1]], ["fan", 1, {"t": "a"}]):
+                with self.subTest(then=then):
+                    document["rules"][1]["then"] = then
+                    with open(path, "w") as f:
+                        json.dump(document, f)
+                    with self.assertRaises(ValueError):
+                        FuzzyLogic().loadRuleBase(path)
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
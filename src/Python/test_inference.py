@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from dufuzzylogic import *
+from test_rulebase import GRID, LOGIC_ALGORITHMS, inferHvacPower, newHvacSets
+
+
+def inferHvacPowerWith(inference, sets, temperature, humidity, hvacPower):
+    """
+    The power of the air conditioning, like inferHvacPower but with an inference
+    """
+    inference.IF(temperature.IS(sets["hot"]))
+    inference.THEN(hvacPower, sets["refresh"], None)
+    inference.IF(temperature.IS(sets["cold"]))
+    inference.THEN(hvacPower, sets["heat"], None)
+    inference.IF(temperature.IS(sets["hot"]).AND(humidity.IS(sets["wet"])))
+    inference.THEN(hvacPower, sets["refresh"], "More")
+    inference.IF(temperature.IS(sets["cold"]).AND(humidity.IS(sets["wet"])))
+    inference.THEN(hvacPower, sets["heat"], "More")
+    inference.IF(temperature.IS(sets["cold"]).AND(temperature.IS_NOT(sets["cold"], "Extremely")).AND(humidity.IS(sets["dry"])))
+    inference.THEN(hvacPower, sets["heat"], "Less")
+    inference.IF(temperature.IS(sets["hot"]).AND(temperature.IS_NOT(sets["hot"], "Extremely")).AND(humidity.IS(sets["dry"])))
+    inference.THEN(hvacPower, sets["refresh"], "Less")
+    inference.IF(temperature.IS(sets["warm"], "Very").OR(temperature.IS(sets["cold"])).AND(humidity.IS(sets["wet"])))
+    inference.THEN(hvacPower, sets["heat"], "Somewhat")
+    inference.IF(temperature.IS(sets["warm"]))
+    inference.THEN(hvacPower, sets["refresh"], "Not")
+    inference.THEN(hvacPower, sets["heat"], "Not")
+    return inference.crispify(hvacPower)
+
+
+class InferenceTest(unittest.TestCase):
+
+    def setUp(self):
+        # switch threads as often as possible
+        self.switchInterval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switchInterval)
+
+    def checkThreads(self, logic):
+        sets = newHvacSets(logic)
+        hvacPower = logic.newValue(0, "%")
+        expected = [inferHvacPower(logic, sets, t, h) for t, h in GRID]
+
+        def infer(point):
+            temperature = logic.newValue(point[0], "°C")
+            humidity = logic.newValue(point[1], "%")
+            return inferHvacPowerWith(logic.newInference(), sets, temperature, humidity, hvacPower)
+
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(infer, GRID * 4))
+        self.assertEqual(results, expected * 4)
+        # the shared value is never set
+        self.assertEqual(hvacPower.sets, [])
+        self.assertEqual(hvacPower.value, 0)
+
+    def testThreads(self):
+        for algorithm in LOGIC_ALGORITHMS:
+            with self.subTest(algorithm=algorithm):
+                self.checkThreads(FuzzyLogic(algorithm))
+
+    def testThreadsWithUniverse(self):
+        self.checkThreads(FuzzyLogic(crispAlgorithm=FuzzyCrispAlgorithm.AREA_CENTROID))
+
+    def testValues(self):
+        logic = FuzzyLogic()
+        sets = newHvacSets(logic)
+        power = logic.newValue(0, "%")
+        first = logic.newInference()
+        second = logic.newInference()
+        first.IF(logic.newVeracity(0.5))
+        first.THEN(power, sets["heat"])
+        second.IF(logic.newVeracity(0.9))
+        second.THEN(power, sets["refresh"])
+        self.assertEqual(len(first.value(power).sets), 1)
+        self.assertEqual(len(second.value(power).sets), 1)
+        self.assertGreater(first.crispify(power), 0)
+        self.assertLess(second.crispify(power), 0)
+        self.assertEqual(power.sets, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
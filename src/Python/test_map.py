@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+import itertools
+import pickle
+import unittest
+
+from dufuzzylogic import *
+from test_rulebase import GRID, LOGIC_ALGORITHMS, newHvacRuleBase, newHvacSets
+
+
+class MapTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = [{"temperature": t, "humidity": h} for t, h in GRID]
+
+    def testSameAsEvaluate(self):
+        for algorithm in LOGIC_ALGORITHMS:
+            logic = FuzzyLogic(algorithm)
+            sets = newHvacSets(logic)
+            sets["hot"].tabulate(128)
+            rules = newHvacRuleBase(logic, sets)
+            expected = [rules.evaluate(row) for row in self.rows]
+            for workers in (1, 2):
+                with self.subTest(algorithm=algorithm, workers=workers):
+                    self.assertEqual(list(rules.map(iter(self.rows), workers=workers, chunksize=10)), expected)
+
+    def testPickle(self):
+        logic = FuzzyLogic(crispAlgorithm=FuzzyCrispAlgorithm.AREA_CENTROID)
+        rules = newHvacRuleBase(logic, newHvacSets(logic))
+        copy = pickle.loads(pickle.dumps(rules))
+        self.assertEqual([copy.evaluate(row) for row in self.rows], [rules.evaluate(row) for row in self.rows])
+
+    def testLazy(self):
+        logic = FuzzyLogic()
+        rules = newHvacRuleBase(logic, newHvacSets(logic))
+        # an endless stream
+        rows = ({"temperature": i % 40, "humidity": 50} for i in itertools.count())
+        results = rules.map(rows, workers=2, chunksize=5)
+        self.assertEqual(list(itertools.islice(results, 50)),
+                         [rules.evaluate({"temperature": i % 40, "humidity": 50}) for i in range(50)])
+        results.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from dufuzzylogic import *
+from dufuzzylogic import fz_rulebase
+from test_rulebase import inferHvacPower, newHvacRuleBase, newHvacSets
+
+_RULES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hvac.json")
+
+_POINTS = [(t, h) for t in range(0, 40, 4) for h in (20, 80)]
+
+
+class ProfilerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.logic = FuzzyLogic()
+        self.sets = newHvacSets(self.logic)
+        self.rules = newHvacRuleBase(self.logic, self.sets)
+
+    def evaluate(self, rules):
+        return [rules.evaluate({"temperature": t, "humidity": h}) for t, h in _POINTS]
+
+    def testSameResults(self):
+        expected = [inferHvacPower(self.logic, self.sets, t, h) for t, h in _POINTS]
+        expectedRules = self.evaluate(self.rules)
+        contains = FuzzySet.contains
+        events = []
+        profiler = self.logic.newProfiler(lambda *event: events.append(event))
+        with profiler:
+            self.assertIsNot(FuzzySet.contains, contains)
+            self.assertEqual([inferHvacPower(self.logic, self.sets, t, h) for t, h in _POINTS], expected)
+            self.assertEqual(self.evaluate(self.rules), expectedRules)
+        # the classes are restored
+        self.assertIs(FuzzySet.contains, contains)
+        self.assertIsNone(fz_rulebase._profileMembership)
+        self.assertGreater(len(events), 0)
+        measures = profiler.toDict()
+        for stage in ["fuzzification", "antecedent", "implication", "defuzzification", "ruleBase"]:
+            self.assertGreater(measures["stages"][stage]["calls"], 0, stage)
+        self.assertIn("Hot", measures["sets"])
+        self.assertGreater(len(measures["rules"]), 0)
+
+    def testWrapped(self):
+        with self.logic.newProfiler():
+            self.assertEqual(FuzzyValue.SET.__name__, "SET")
+            self.assertIsNotNone(FuzzySet.contains.__doc__)
+
+    def testOneProfiler(self):
+        with self.logic.newProfiler():
+            with self.assertRaises(RuntimeError):
+                self.logic.newProfiler().enable()
+
+    def testRuleBase(self):
+        expected = self.evaluate(self.rules)
+        profiler = self.logic.newProfiler()
+        with profiler:
+            self.assertEqual(self.evaluate(self.rules), expected)
+        sets = {name: list(measure) for name, measure in profiler.sets.items()}
+        self.assertEqual(sorted(sets.keys()), ["Cold", "Comfortably warm", "Dry", "Hot", "Wet"])
+        self.assertIn("fuzzification", profiler.stages)
+        # the rule base is not measured anymore
+        self.assertEqual(self.evaluate(self.rules), expected)
+        self.assertEqual(profiler.sets, sets)
+
+    def testCachedRuleBase(self):
+        directory = tempfile.mkdtemp()
+        try:
+            self.logic.loadRuleBase(_RULES, directory)
+            profiler = self.logic.newProfiler()
+            with profiler:
+                rules = self.logic.loadRuleBase(_RULES, directory)
+                measured = self.logic.loadRuleBase(_RULES, directory)
+                measured.evaluate({"temperature": 3})
+            sets = {name: list(measure) for name, measure in profiler.sets.items()}
+            self.assertIn("Cold", sets)
+            # neither the rule base evaluated while profiling, nor the one only loaded, are measured anymore
+            measured.evaluate({"temperature": 3})
+            rules.evaluate({"temperature": 3})
+            self.assertEqual(profiler.sets, sets)
+        finally:
+            shutil.rmtree(directory)
+
+    def testClock(self):
+        ticks = iter(range(0, 1000000))
+        profiler = self.logic.newProfiler()
+        profiler.clock = lambda: next(ticks)
+        with profiler:
+            self.sets["hot"].contains(30)
+        self.assertEqual(profiler.sets["Hot"], [1, 1])
+
+    def testPrometheus(self):
+        profiler = self.logic.newProfiler()
+        with profiler:
+            self.evaluate(self.rules)
+        lines = profiler.toPrometheus().splitlines()
+        self.assertIn("# TYPE dufuzzylogic_stage_calls_total counter", lines)
+        self.assertIn("dufuzzylogic_set_calls_total{set=\"Hot\"} " + str(profiler.sets["Hot"][0]), lines)
+        profiler.reset()
+        self.assertEqual(profiler.toDict(), {"stages": {}, "sets": {}, "rules": {}})
+
+
+if __name__ == "__main__":
+    unittest.main()
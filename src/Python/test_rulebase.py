@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+import math
+import unittest
+
+from dufuzzylogic import *
+
+LOGIC_ALGORITHMS = [FuzzyLogicAlgorithm.LINEAR, FuzzyLogicAlgorithm.HYPERBOLIC]
+
+# the random algorithms can't give the same results twice
+CRISP_ALGORITHMS = [FuzzyCrispAlgorithm.CENTROID, FuzzyCrispAlgorithm.CENTROID_LOWER, FuzzyCrispAlgorithm.CENTROID_HIGHER,
+                    FuzzyCrispAlgorithm.MEAN, FuzzyCrispAlgorithm.MEAN_HIGHER, FuzzyCrispAlgorithm.MEAN_LOWER,
+                    FuzzyCrispAlgorithm.AREA_CENTROID, FuzzyCrispAlgorithm.AREA_BISECTOR, FuzzyCrispAlgorithm.MEAN_OF_MAXIMUM]
+
+OPERATORS = ["AND", "OR", "XOR", "NXR", "IMPLIES", "DOES_NOT_IMPLY", "NAND", "NOR"]
+
+# temperatures and humidities
+GRID = [(t, h) for t in range(-5, 45, 4) for h in range(0, 101, 12)]
+
+
+def newHvacSets(logic):
+    """
+    The sets of the air conditioning example of test.py
+    """
+    return {
+        "wet": logic.newSet("Wet", 60, 100, FuzzyShape.GAUSSIAN, FuzzyShape.CONSTANT),
+        "comfortable": logic.newSet("Comfortable", 40, 55, FuzzyShape.SIGMOID),
+        "dry": logic.newSet("Dry", 50, 0, FuzzyShape.CONSTANT, FuzzyShape.GAUSSIAN),
+        "hot": logic.newSet("Hot", 21, 35, FuzzyShape.GAUSSIAN, FuzzyShape.CONSTANT),
+        "warm": logic.newSet("Comfortably warm", 17, 20, FuzzyShape.GAUSSIAN),
+        "cold": logic.newSet("Cold", 17, 10, FuzzyShape.CONSTANT, FuzzyShape.GAUSSIAN),
+        "heat": logic.newSet("Heat", 0, 100, FuzzyShape.LINEAR, FuzzyShape.CONSTANT),
+        "refresh": logic.newSet("Refresh", 0, -100, FuzzyShape.CONSTANT, FuzzyShape.LINEAR)
+    }
+
+
+def inferHvacPower(logic, sets, temperature, humidity):
+    """
+    The power of the air conditioning, with FuzzyLogic.IF and FuzzyLogic.THEN
+    """
+    temperature = logic.newValue(temperature, "°C")
+    humidity = logic.newValue(humidity, "%")
+    hvacPower = logic.newValue(0, "%")
+    logic.IF(temperature.IS(sets["hot"]))
+    logic.THEN(hvacPower, sets["refresh"], None)
+    logic.IF(temperature.IS(sets["cold"]))
+    logic.THEN(hvacPower, sets["heat"], None)
+    logic.IF(temperature.IS(sets["hot"]).AND(humidity.IS(sets["wet"])))
+    logic.THEN(hvacPower, sets["refresh"], "More")
+    logic.IF(temperature.IS(sets["cold"]).AND(humidity.IS(sets["wet"])))
+    logic.THEN(hvacPower, sets["heat"], "More")
+    logic.IF(temperature.IS(sets["cold"]).AND(temperature.IS_NOT(sets["cold"], "Extremely")).AND(humidity.IS(sets["dry"])))
+    logic.THEN(hvacPower, sets["heat"], "Less")
+    logic.IF(temperature.IS(sets["hot"]).AND(temperature.IS_NOT(sets["hot"], "Extremely")).AND(humidity.IS(sets["dry"])))
+    logic.THEN(hvacPower, sets["refresh"], "Less")
+    logic.IF(temperature.IS(sets["warm"], "Very").OR(temperature.IS(sets["cold"])).AND(humidity.IS(sets["wet"])))
+    logic.THEN(hvacPower, sets["heat"], "Somewhat")
+    logic.IF(temperature.IS(sets["warm"]))
+    logic.THEN(hvacPower, sets["refresh"], "Not")
+    logic.THEN(hvacPower, sets["heat"], "Not")
+    return hvacPower.crispify()
+
+
+def newHvacRuleBase(logic, sets):
+    """
+    The rules of inferHvacPower, in a rule base
+    """
+    rules = logic.newRuleBase()
+    temperature = rules.newInput("temperature")
+    humidity = rules.newInput("humidity")
+    hvacPower = rules.newOutput("hvacPower")
+    rules.addRule(temperature.IS(sets["hot"]), hvacPower, sets["refresh"])
+    rules.addRule(temperature.IS(sets["cold"]), hvacPower, sets["heat"])
+    rules.addRule(temperature.IS(sets["hot"]).AND(humidity.IS(sets["wet"])), hvacPower, sets["refresh"], "More")
+    rules.addRule(temperature.IS(sets["cold"]).AND(humidity.IS(sets["wet"])), hvacPower, sets["heat"], "More")
+    rules.addRule(temperature.IS(sets["cold"]).AND(temperature.IS_NOT(sets["cold"], "Extremely")).AND(humidity.IS(sets["dry"])),
+                  hvacPower, sets["heat"], "Less")
+    rules.addRule(temperature.IS(sets["hot"]).AND(temperature.IS_NOT(sets["hot"], "Extremely")).AND(humidity.IS(sets["dry"])),
+                  hvacPower, sets["refresh"], "Less")
+    rules.addRule(temperature.IS(sets["warm"], "Very").OR(temperature.IS(sets["cold"])).AND(humidity.IS(sets["wet"])),
+                  hvacPower, sets["heat"], "Somewhat")
+    isWarm = temperature.IS(sets["warm"])
+    rules.addRule(isWarm, hvacPower, sets["refresh"], "Not")
+    rules.addRule(isWarm, hvacPower, sets["heat"], "Not")
+    return rules
+
+
+class RuleBaseTest(unittest.TestCase):
+
+    def assertClose(self, first, second):
+        self.assertTrue(math.isclose(first, second, rel_tol=1e-9, abs_tol=1e-9), (first, second))
+
+    def testSameAsIfThen(self):
+        for algorithm in LOGIC_ALGORITHMS:
+            for crispAlgorithm in CRISP_ALGORITHMS:
+                with self.subTest(algorithm=algorithm, crispAlgorithm=crispAlgorithm):
+                    logic = FuzzyLogic(algorithm, crispAlgorithm)
+                    sets = newHvacSets(logic)
+                    rules = newHvacRuleBase(logic, sets)
+                    for temperature, humidity in GRID:
+                        expected = inferHvacPower(logic, sets, temperature, humidity)
+                        result = rules.evaluate({"temperature": temperature, "humidity": humidity})
+                        self.assertClose(result["hvacPower"], expected)
+
+    def testOperators(self):
+        for algorithm in LOGIC_ALGORITHMS:
+            logic = FuzzyLogic(algorithm)
+            a = logic.newSet("A", 0, 40)
+            b = logic.newSet("B", 20, 60)
+            power = logic.newSet("Power", 0, 100)
+            for first in OPERATORS + ["WEIGHTED"]:
+                for second in OPERATORS:
+
+                    def antecedent(x, y):
+                        if first == "WEIGHTED":
+                            veracity = x.IS(a).WEIGHTED(y.IS(b), 0.3)
+                        else:
+                            veracity = getattr(x.IS(a), first)(y.IS(b))
+                        return getattr(veracity, second)(x.IS(b))
+
+                    rules = logic.newRuleBase()
+                    rules.addRule(antecedent(rules.newInput("x"), rules.newInput("y")), rules.newOutput("o"), power)
+                    with self.subTest(algorithm=algorithm, first=first, second=second):
+                        for x in range(0, 60, 6):
+                            for y in range(0, 60, 11):
+                                veracity = antecedent(logic.newValue(x, ""), logic.newValue(y, ""))
+                                value = logic.newValue(0, "")
+                                value.SET(power, FuzzyQuantifier.NONE, veracity)
+                                self.assertClose(rules.evaluate({"x": x, "y": y})["o"], value.crispify())
+
+    def testNoState(self):
+        logic = FuzzyLogic()
+        sets = newHvacSets(logic)
+        rules = newHvacRuleBase(logic, sets)
+        first = rules.evaluate({"temperature": 18, "humidity": 70})
+        self.assertEqual(rules.evaluate({"temperature": 18, "humidity": 70}), first)
+        self.assertEqual(rules.evaluate({}), rules.evaluate({"temperature": 0, "humidity": 0}))
+
+    def testNoRule(self):
+        rules = FuzzyLogic().newRuleBase()
+        rules.newInput("x")
+        rules.newOutput("o", 42)
+        self.assertEqual(rules.evaluate({"x": 3}), {"o": 42})
+
+
+if __name__ == "__main__":
+    unittest.main()
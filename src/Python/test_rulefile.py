@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+import copy
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from dufuzzylogic import *
+from dufuzzylogic.fz_rulefile import parseRuleBase
+from test_rulebase import GRID, LOGIC_ALGORITHMS, newHvacRuleBase, newHvacSets
+
+_RULES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hvac.json")
+
+
+class RuleFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = os.path.join(self.directory, "cache")
+        with open(_RULES, "r", encoding="utf-8") as f:
+            self.document = json.load(f)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def assertSameRules(self, rules, expected):
+        for temperature, humidity in GRID:
+            inputs = {"temperature": temperature, "humidity": humidity}
+            self.assertEqual(rules.evaluate(inputs), expected.evaluate(inputs))
+
+    def testSameAsRuleBase(self):
+        for algorithm in LOGIC_ALGORITHMS:
+            with self.subTest(algorithm=algorithm):
+                logic = FuzzyLogic(algorithm)
+                self.assertSameRules(logic.loadRuleBase(_RULES), newHvacRuleBase(logic, newHvacSets(logic)))
+
+    def testCache(self):
+        logic = FuzzyLogic()
+        expected = logic.loadRuleBase(_RULES)
+        self.assertSameRules(logic.loadRuleBase(_RULES, self.cache), expected)
+        self.assertEqual(len(os.listdir(self.cache)), 1)
+        # a hit neither parses nor compiles the rules
+        with mock.patch.object(FuzzyRuleBase, "compile", side_effect=AssertionError("compiled")):
+            cached = logic.loadRuleBase(_RULES, self.cache)
+        self.assertSameRules(cached, expected)
+        # the cache is keyed by the algorithms
+        hyperbolic = FuzzyLogic(FuzzyLogicAlgorithm.HYPERBOLIC)
+        self.assertEqual(hyperbolic.loadRuleBase(_RULES, self.cache).algorithm, FuzzyLogicAlgorithm.HYPERBOLIC)
+        self.assertEqual(len(os.listdir(self.cache)), 2)
+
+    def testInvalidCache(self):
+        logic = FuzzyLogic()
+        expected = logic.loadRuleBase(_RULES)
+        logic.loadRuleBase(_RULES, self.cache)
+        cachePath = os.path.join(self.cache, os.listdir(self.cache)[0])
+        for content in [b"", b"not a pickle", b"\x80\x05K*.", b"\x80\x05}\x94."]:
+            with self.subTest(content=content):
+                with open(cachePath, "wb") as f:
+                    f.write(content)
+                self.assertSameRules(logic.loadRuleBase(_RULES, self.cache), expected)
+
+    def testToml(self):
+        path = os.path.join(self.directory, "rules.toml")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('algorithm = "hyperbolic"\n'
+                    '[[sets]]\nname = "A"\nextremeValue = 0\nreferenceValue = 10\n'
+                    '[[inputs]]\nname = "x"\n'
+                    '[[outputs]]\nname = "y"\n'
+                    '[[rules]]\nif = ["IS", "x", "A", "very"]\nthen = ["y", "A"]\n')
+        rules = FuzzyLogic().loadRuleBase(path)
+        self.assertEqual(rules.algorithm, FuzzyLogicAlgorithm.HYPERBOLIC)
+        self.assertEqual(list(rules.evaluate({"x": 3}).keys()), ["y"])
+
+    def testErrors(self):
+        invalid = [
+            ("rules", [{"if": ["IS", "temp", "Hot"], "then": ["hvacPower", "Heat"]}]),
+            ("rules", [{"if": ["AND", ["IS", "temperature", "Hot"]], "then": ["hvacPower", "Heat"]}]),
+            ("rules", [{"if": ["IS", "temperature", "Hot", "Veryy"], "then": ["hvacPower", "Heat"]}]),
+            ("rules", [{"if": ["IS", "temperature", "Hot"], "then": ["x", "Heat"]}]),
+            ("sets", [{"name": "A", "extremeValue": "1", "referenceValue": 2}]),
+            ("sets", [{"name": "A", "extremeValue": 1, "referenceValue": 2, "shapeIn": "round"}]),
+            ("algorithm", "fast")
+        ]
+        for key, value in invalid:
+            with self.subTest(key=key, value=value):
+                document = copy.deepcopy(self.document)
+                document[key] = value
+                with self.assertRaises(ValueError):
+                    parseRuleBase(document)
+
+
+if __name__ == "__main__":
+    unittest.main()
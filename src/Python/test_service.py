@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from dufuzzylogic import *
+
+_RULES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hvac.json")
+
+
+class ServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rules = FuzzyLogic().loadRuleBase(_RULES)
+        self.rows = [{"temperature": t, "humidity": h} for t, h in
+                     [(5, 10), (15, 50), (22, 90), (30, 10), (18, 40), (25, 70), (12, 30)]]
+
+    def infer(self, service, rows):
+        async def run():
+            return await asyncio.gather(*[service.infer(row) for row in rows], return_exceptions=True)
+        return asyncio.run(run())
+
+    def checkBadRow(self, service):
+        rows = self.rows[:3] + [{"temperature": "hot"}] + self.rows[3:]
+        self.assertEqual(service.maxBatchSize, len(rows))
+        results = self.infer(service, rows)
+        for i in range(0, len(rows)):
+            if i == 3:
+                self.assertIsInstance(results[i], Exception)
+            else:
+                self.assertEqual(results[i], self.rules.evaluate(rows[i]))
+
+    def testResults(self):
+        service = self.rules.newService(maxBatchSize=3)
+        self.assertEqual(self.infer(service, self.rows), [self.rules.evaluate(row) for row in self.rows])
+
+    def testBadRowInline(self):
+        self.checkBadRow(self.rules.newService(maxBatchSize=8))
+
+    def testBadRowExecutor(self):
+        with ThreadPoolExecutor(2) as executor:
+            self.checkBadRow(self.rules.newService(maxBatchSize=8, executor=executor))
+
+    def testSingleBadRow(self):
+        service = self.rules.newService(maxBatchSize=1)
+        results = self.infer(service, [{"temperature": "hot"}, self.rows[0]])
+        self.assertIsInstance(results[0], Exception)
+        self.assertEqual(results[1], self.rules.evaluate(self.rows[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+import os
+import pickle
+import random
+import shutil
+import tempfile
+import unittest
+
+from dufuzzylogic import *
+from test_rulebase import GRID, newHvacRuleBase, newHvacSets
+
+_ATTRIBUTES = ["name", "minimum", "maximum", "plateauMin", "plateauMax", "shapeIn", "shapeOut", "algorithm", "tableError"]
+
+
+class SetTableTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "sets.fzs")
+        self.logic = FuzzyLogic()
+        self.sets = newHvacSets(self.logic)
+        for fuzzySet in self.sets.values():
+            fuzzySet.tabulate(512)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testSameAsSets(self):
+        self.logic.saveSets(self.sets.values(), self.path)
+        loaded = self.logic.loadSets(self.path)
+        generator = random.Random(1)
+        for fuzzySet in self.sets.values():
+            mapped = loaded[fuzzySet.name]
+            self.assertIsInstance(mapped.table, memoryview)
+            self.assertTrue(mapped.table.readonly)
+            for attribute in _ATTRIBUTES:
+                self.assertEqual(getattr(mapped, attribute), getattr(fuzzySet, attribute))
+            for i in range(0, 200):
+                value = generator.uniform(-50, 150)
+                self.assertEqual(mapped.contains(value).veracity, fuzzySet.contains(value).veracity)
+
+    def testUntabulated(self):
+        fuzzySet = self.logic.newSet("Untabulated", 0, 10)
+        self.logic.saveSets([fuzzySet], self.path)
+        loaded = self.logic.loadSets(self.path)["Untabulated"]
+        self.assertIsNone(loaded.table)
+        self.assertEqual(loaded.contains(3).veracity, fuzzySet.contains(3).veracity)
+
+    def testPickle(self):
+        self.logic.saveSets(self.sets.values(), self.path)
+        mapped = self.logic.loadSets(self.path)["Hot"]
+        # only the path of the file is pickled, not the table
+        self.assertLess(len(pickle.dumps(mapped)), 400)
+        copy = pickle.loads(pickle.dumps(mapped))
+        self.assertEqual(copy.contains(33).veracity, self.sets["hot"].contains(33).veracity)
+
+    def testRewritten(self):
+        self.logic.saveSets(self.sets.values(), self.path)
+        state = pickle.dumps(self.logic.loadSets(self.path)["Hot"])
+        # the same sets, written again
+        self.logic.saveSets(self.sets.values(), self.path)
+        self.assertEqual(pickle.loads(state).contains(33).veracity, self.sets["hot"].contains(33).veracity)
+        # other tables
+        self.sets["hot"].tabulate(64)
+        self.logic.saveSets(self.sets.values(), self.path)
+        with self.assertRaises(ValueError):
+            pickle.loads(state).contains(33)
+
+    def testNotSetTables(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a set table file")
+        with self.assertRaises(ValueError):
+            self.logic.loadSets(self.path)
+
+    def testWorkers(self):
+        self.logic.saveSets(self.sets.values(), self.path)
+        loaded = self.logic.loadSets(self.path)
+        mapped = {key: loaded[fuzzySet.name] for key, fuzzySet in self.sets.items()}
+        rules = newHvacRuleBase(self.logic, self.sets)
+        rows = [{"temperature": t, "humidity": h} for t, h in GRID]
+        results = newHvacRuleBase(self.logic, mapped).map(rows, workers=2, chunksize=20)
+        self.assertEqual(list(results), [rules.evaluate(row) for row in rows])
+
+
+if __name__ == "__main__":
+    unittest.main()
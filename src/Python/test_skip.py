@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+import math
+import random
+import unittest
+
+from dufuzzylogic import *
+from test_rulebase import LOGIC_ALGORITHMS, OPERATORS
+
+
+def newTree(generator, depth):
+    """
+    A random antecedent, as nested tuples, to be built both as a FuzzyExpression and as a FuzzyVeracity
+    """
+    if depth == 0 or generator.random() < 0.3:
+        return ("IS", generator.randrange(2), generator.randrange(6))
+    operator = generator.choice(OPERATORS + ["AND", "AND", "NEGATE", "WEIGHTED"])
+    if operator == "NEGATE":
+        return (operator, newTree(generator, depth - 1))
+    return (operator, newTree(generator, depth - 1), newTree(generator, depth - 1), round(generator.random(), 2))
+
+
+def build(tree, operands, sets):
+    """
+    Builds the tree with the operands, either FuzzyInputs or FuzzyValues
+    """
+    if tree[0] == "IS":
+        return operands[tree[1]].IS(sets[tree[2]])
+    if tree[0] == "NEGATE":
+        return build(tree[1], operands, sets).NEGATE()
+    if tree[0] == "WEIGHTED":
+        return build(tree[1], operands, sets).WEIGHTED(build(tree[2], operands, sets), tree[3])
+    return getattr(build(tree[1], operands, sets), tree[0])(build(tree[2], operands, sets))
+
+
+class SkipTest(unittest.TestCase):
+
+    def testSameAsIfThen(self):
+        generator = random.Random(5)
+        skipped = 0
+        for algorithm in LOGIC_ALGORITHMS:
+            logic = FuzzyLogic(algorithm)
+            # narrow sets: most of the tests are false
+            sets = [logic.newSet("S" + str(i), i * 10, i * 10 + 8) for i in range(0, 6)]
+            power = logic.newSet("Power", 0, 100)
+            for i in range(0, 20):
+                trees = [newTree(generator, 4) for k in range(0, 10)]
+                rules = logic.newRuleBase()
+                inputs = [rules.newInput("x"), rules.newInput("y")]
+                for k in range(0, len(trees)):
+                    rules.addRule(build(trees[k], inputs, sets), rules.newOutput("o" + str(k)), power)
+                for n in range(0, 20):
+                    x = generator.uniform(-5, 65)
+                    y = generator.uniform(-5, 65)
+                    results = rules.evaluate({"x": x, "y": y})
+                    for k in range(0, len(trees)):
+                        veracity = build(trees[k], [logic.newValue(x, ""), logic.newValue(y, "")], sets)
+                        value = logic.newValue(0, "")
+                        value.SET(power, FuzzyQuantifier.NONE, veracity)
+                        expected = value.crispify()
+                        self.assertTrue(math.isclose(results["o" + str(k)], expected, rel_tol=1e-9, abs_tol=1e-9),
+                                        (algorithm, trees[k], x, y))
+                skipped += rules.statistics()["skippedOperations"]
+        # the test is only useful if some operations were skipped
+        self.assertGreater(skipped, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
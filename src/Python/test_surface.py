@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+import pickle
+import random
+import unittest
+
+from dufuzzylogic import *
+from test_rulebase import newHvacRuleBase, newHvacSets
+
+_GRID = {"temperature": (-5, 45, 101), "humidity": (0, 100, 51)}
+
+
+class SurfaceTest(unittest.TestCase):
+
+    def setUp(self):
+        logic = FuzzyLogic()
+        self.sets = newHvacSets(logic)
+        self.rules = newHvacRuleBase(logic, self.sets)
+        self.surface = self.rules.bake(_GRID, 200)
+
+    def testNodes(self):
+        # the surface is exact on the points of the grid
+        for temperature in [-5, 0, 20, 45]:
+            for humidity in [0, 50, 100]:
+                inputs = {"temperature": temperature, "humidity": humidity}
+                self.assertAlmostEqual(self.surface.evaluate(inputs)["hvacPower"], self.rules.evaluate(inputs)["hvacPower"], 9)
+
+    def testError(self):
+        # the error is the maximum deviation on the random points of the validation
+        error = self.surface.validate(500, 3)
+        generator = random.Random(3)
+        function = self.surface.function("hvacPower")
+        expected = 0
+        for i in range(0, 500):
+            temperature = generator.uniform(-5, 45)
+            humidity = generator.uniform(0, 100)
+            exact = self.rules.evaluate({"temperature": temperature, "humidity": humidity})["hvacPower"]
+            expected = max(expected, abs(function(temperature, humidity) - exact))
+        self.assertAlmostEqual(error, expected, 9)
+        self.assertEqual(self.surface.errors, {"hvacPower": error})
+        self.assertEqual(self.surface.error, error)
+
+    def testOutOfGrid(self):
+        for inputs in [{"temperature": 60, "humidity": 50}, {"temperature": 20, "humidity": -10}]:
+            self.assertEqual(self.surface.evaluate(inputs), self.rules.evaluate(inputs))
+
+    def testDefaults(self):
+        surface = self.rules.bake({"temperature": (-5, 45, 201)}, 100)
+        self.assertEqual(surface.inputs, ["temperature"])
+        self.assertAlmostEqual(surface.evaluate({"temperature": 45})["hvacPower"], self.rules.evaluate({"temperature": 45})["hvacPower"], 9)
+
+    def testDimensions(self):
+        # the generic interpolation, with a third input which the rules don't use, matches the one of two inputs
+        rules = newHvacRuleBase(FuzzyLogic(), self.sets)
+        rules.newInput("dummy")
+        surface = rules.bake(dict(_GRID, dummy=(0, 1, 2)), 100)
+        function = self.surface.function("hvacPower")
+        generic = surface.function("hvacPower")
+        generator = random.Random(2)
+        for i in range(0, 200):
+            temperature = generator.uniform(-5, 45)
+            humidity = generator.uniform(0, 100)
+            self.assertAlmostEqual(generic(temperature, humidity, generator.random()), function(temperature, humidity), 9)
+
+    def testPickle(self):
+        copy = pickle.loads(pickle.dumps(self.surface))
+        inputs = {"temperature": 3.3, "humidity": 4.4}
+        self.assertEqual(copy.evaluate(inputs), self.surface.evaluate(inputs))
+
+    def testErrors(self):
+        for grid in [{}, {"unknown": (0, 1, 3)}, {"temperature": (1, 1, 3)}, {"temperature": (0, 1, 1)}]:
+            with self.subTest(grid=grid):
+                with self.assertRaises((KeyError, ValueError)):
+                    self.rules.bake(grid)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import pickle
+import random
+import unittest
+
+from dufuzzylogic import *
+
+_SHAPES = [FuzzyShape.CONSTANT, FuzzyShape.SQUARE, FuzzyShape.LINEAR, FuzzyShape.SIGMOID, FuzzyShape.GAUSSIAN,
+           FuzzyShape.REVERSED_GAUSSIAN]
+
+
+def scan(sets, value, threshold):
+    """
+    The sets containing the value above the threshold, computed without the index
+    """
+    result = []
+    for fuzzySet in sets:
+        try:
+            veracity = fuzzySet.membershipFunction()(value)
+        except OverflowError:
+            veracity = 0
+        if veracity > threshold:
+            result.append((fuzzySet, veracity))
+    return result
+
+
+class VariableTest(unittest.TestCase):
+
+    def newSets(self, logic, generator, count):
+        sets = []
+        for i in range(0, count):
+            center = generator.uniform(0, 1000)
+            width = generator.uniform(0.5, 30)
+            shapeIn = generator.choice(_SHAPES[1:] if generator.random() < 0.9 else _SHAPES)
+            shapeOut = generator.choice(_SHAPES[1:] if generator.random() < 0.9 else _SHAPES)
+            if shapeIn == shapeOut == FuzzyShape.CONSTANT:
+                shapeOut = FuzzyShape.LINEAR
+            fuzzySet = logic.newSet("S" + str(i), center - width, center, shapeIn, shapeOut)
+            if generator.random() < 0.2:
+                fuzzySet.tabulate(64)
+            sets.append(fuzzySet)
+        return sets
+
+    def testSameAsScan(self):
+        logic = FuzzyLogic()
+        generator = random.Random(3)
+        for threshold in [0, 1e-9, 0.01, 0.3]:
+            with self.subTest(threshold=threshold):
+                sets = self.newSets(logic, generator, 200)
+                variable = logic.newVariable("x", sets, threshold)
+                bounds = [s.minimum for s in sets] + [s.maximum for s in sets]
+                for i in range(0, 1000):
+                    value = generator.uniform(-200, 1200) if i % 10 else generator.choice(bounds)
+                    self.assertEqual(variable.fuzzify(value), scan(sets, value, threshold), value)
+
+    def testAddSet(self):
+        logic = FuzzyLogic()
+        variable = logic.newVariable("x", [logic.newSet("A", 10, 0)])
+        self.assertEqual([s.name for s, v in variable.fuzzify(15)], [])
+        variable.addSet(logic.newSet("B", 10, 20))
+        self.assertEqual([s.name for s, v in variable.fuzzify(15)], ["B"])
+
+    def testPickle(self):
+        logic = FuzzyLogic()
+        sets = self.newSets(logic, random.Random(4), 50)
+        variable = logic.newVariable("x", sets)
+        copy = pickle.loads(pickle.dumps(variable))
+        for value in range(-50, 1050, 7):
+            self.assertEqual([(s.name, v) for s, v in copy.fuzzify(value)],
+                             [(s.name, v) for s, v in variable.fuzzify(value)])
+
+
+if __name__ == "__main__":
+    unittest.main()